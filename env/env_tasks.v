@@ -1,7 +1,16 @@
 reg  dumping;
+reg [8*256-1:0] dumpfile_name;
 
 initial
-  dumping = 0;
+  begin
+    dumping = 0;
+    if (!$value$plusargs ("DUMPFILE_NAME=%s", dumpfile_name))
+`ifdef DUMPFILE_NAME
+      dumpfile_name = `DUMPFILE_NAME;
+`else
+      dumpfile_name = "dump.vcd";
+`endif
+  end
   
 task test_pass;
     begin
@@ -23,7 +32,7 @@ task dumpon;
     begin
       if (!dumping)
 	begin
-	  $dumpfile (`DUMPFILE_NAME);
+	  $dumpfile (dumpfile_name);
 	  $dumpvars;
 	  dumping = 1;
 	end
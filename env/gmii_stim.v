@@ -0,0 +1,147 @@
+// GMII receive stimulus.  The stimulus memory holds one word per
+// rx_clk cycle, {6'b0, rx_er, rx_dv, rx_data}, as written by
+// scripts/gmii_gen.py.  The file is given at run time with
+// +GMII_RX_FILE=<file>; without it the module stays disabled.  With
+// +GMII_RX_START=<n> playback starts n cycles after reset.  The
+// stream is played once, after which rx_dv and rx_er stay low and
+// done is set.
+//
+// The memory is depth words deep.  Verilog sizes it at elaboration,
+// so it cannot follow a plusarg; compile with
+// +define+GMII_STIM_DEPTH=<n> to make it smaller (less memory for runs
+// that do not use the stimulus) or larger (longer streams, see
+// gmii_gen.py -m).  A file longer than the memory is reported as an
+// ERROR when it is loaded and again where playback is cut short.
+
+module gmii_stim (/*AUTOARG*/
+  // Outputs
+  enable, done, rx_data, rx_dv, rx_er, 
+  // Inputs
+  rx_clk, reset
+  );
+
+`ifdef GMII_STIM_DEPTH
+  parameter depth = `GMII_STIM_DEPTH;
+`else
+  parameter depth = 1048576;
+`endif
+
+  input        rx_clk;
+  input        reset;
+  output       enable;
+  output       done;
+  output [7:0] rx_data;
+  output       rx_dv;
+  output       rx_er;
+
+  reg [15:0]   mem [0:depth-1];
+  reg [8*256-1:0] stim_file;
+  reg          enable, done;
+  reg [7:0]    rx_data;
+  reg          rx_dv, rx_er;
+  integer      ptr, start, fh, file_words;
+
+  initial
+    begin
+      ptr = 0;
+      start = 0;
+      file_words = 0;
+      done = 0;
+      rx_data = 0;
+      rx_dv = 0;
+      rx_er = 0;
+      enable = $value$plusargs ("GMII_RX_FILE=%s", stim_file);
+      if ($value$plusargs ("GMII_RX_START=%d", start))
+        $display ("%t: INFO    : GMII stimulus starts %0d cycles after reset", $time, start);
+      if (enable)
+        begin
+          $readmemh (stim_file, mem);
+          $display ("%t: INFO    : GMII stimulus from %0s", $time, stim_file);
+          // gmii_gen.py writes 5 bytes per word ("xxxx\n")
+          fh = $fopen (stim_file, "r");
+          if (fh != 0)
+            begin
+              if ($fseek (fh, 0, 2) == 0)
+                file_words = $ftell (fh) / 5;
+              $fclose (fh);
+            end
+          if (file_words > depth)
+            $display ("%t: ERROR   : GMII stimulus has %0d cycles, only %0d fit in memory",
+                      $time, file_words, depth);
+        end
+    end
+
+  always @(posedge rx_clk)
+    begin
+      if (reset | !enable | done)
+        begin
+          rx_dv <= #1 0;
+          rx_er <= #1 0;
+        end
+      else if (start > 0)
+        start = start - 1;
+      else if ((ptr == depth) || (^mem[ptr] === 1'bx))
+        begin
+          done  <= #1 1;
+          rx_dv <= #1 0;
+          rx_er <= #1 0;
+          if ((ptr == depth) && (file_words > depth))
+            $display ("%t: ERROR   : GMII stimulus truncated after %0d of %0d cycles",
+                      $time, ptr, file_words);
+          else
+            $display ("%t: INFO    : GMII stimulus done, %0d cycles", $time, ptr);
+        end
+      else
+        begin
+          {rx_er, rx_dv, rx_data} <= #1 mem[ptr][9:0];
+          ptr = ptr + 1;
+        end
+    end
+
+endmodule // gmii_stim
+
+// GMII transmit capture.  With +GMII_TX_FILE=<file>, every tx_clk
+// cycle with tx_dv or tx_er high is written to the file as a word in
+// the stimulus format, and a 0000 word marks the end of each frame.
+// scripts/gmii_check.py reads the file back into frames.
+
+module gmii_capture (/*AUTOARG*/
+  // Inputs
+  tx_clk, tx_data, tx_dv, tx_er
+  );
+
+  input        tx_clk;
+  input [7:0]  tx_data;
+  input        tx_dv;
+  input        tx_er;
+
+  reg [8*256-1:0] cap_file;
+  integer      fh;
+  reg          active;
+
+  initial
+    begin
+      fh = 0;
+      active = 0;
+      if ($value$plusargs ("GMII_TX_FILE=%s", cap_file))
+        fh = $fopen (cap_file);
+    end
+
+  always @(posedge tx_clk)
+    begin
+      if (fh != 0)
+        begin
+          if (tx_dv | tx_er)
+            begin
+              $fdisplay (fh, "%h", {6'b0, tx_er, tx_dv, tx_data});
+              active = 1;
+            end
+          else if (active)
+            begin
+              $fdisplay (fh, "0000");
+              active = 0;
+            end
+        end
+    end
+
+endmodule // gmii_capture
@@ -1,6 +1,8 @@
 /*
  * Z80 instruction decoder
  * Author: Guy Hutchison
+ *
+ * Generated from env/z80_opcodes.txt by scripts/gen_op_decode.py; do not edit.
  */
 
 module op_decode;
@@ -10,11 +12,11 @@ task decode0;
   inout [7:0] state;
   begin
   case (opcode)
-    8'h00 : $display ("%t: OPCODE  : NOP   ", $time);
+    8'h00 : $display ("%t: OPCODE  : NOP", $time);
     8'h01 : 
       begin
         $display ("%t: OPCODE  : LD    BC,word", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h02 : $display ("%t: OPCODE  : LD    (BC),A", $time);
     8'h03 : $display ("%t: OPCODE  : INC   BC", $time);
@@ -23,9 +25,9 @@ task decode0;
     8'h06 : 
       begin
         $display ("%t: OPCODE  : LD    B,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h07 : $display ("%t: OPCODE  : RLCA  ", $time);
+    8'h07 : $display ("%t: OPCODE  : RLCA", $time);
     8'h08 : $display ("%t: OPCODE  : EX    AF,AF'", $time);
     8'h09 : $display ("%t: OPCODE  : ADD   HL,BC", $time);
     8'h0a : $display ("%t: OPCODE  : LD    A,(BC)", $time);
@@ -35,18 +37,18 @@ task decode0;
     8'h0e : 
       begin
         $display ("%t: OPCODE  : LD    C,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h0f : $display ("%t: OPCODE  : RRCA  ", $time);
+    8'h0f : $display ("%t: OPCODE  : RRCA", $time);
     8'h10 : 
       begin
         $display ("%t: OPCODE  : DJNZ  index", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'h11 : 
       begin
         $display ("%t: OPCODE  : LD    DE,word", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h12 : $display ("%t: OPCODE  : LD    (DE),A", $time);
     8'h13 : $display ("%t: OPCODE  : INC   DE", $time);
@@ -55,13 +57,13 @@ task decode0;
     8'h16 : 
       begin
         $display ("%t: OPCODE  : LD    D,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h17 : $display ("%t: OPCODE  : RLA   ", $time);
+    8'h17 : $display ("%t: OPCODE  : RLA", $time);
     8'h18 : 
       begin
         $display ("%t: OPCODE  : JR    index", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'h19 : $display ("%t: OPCODE  : ADD   HL,DE", $time);
     8'h1a : $display ("%t: OPCODE  : LD    A,(DE)", $time);
@@ -71,23 +73,23 @@ task decode0;
     8'h1e : 
       begin
         $display ("%t: OPCODE  : LD    E,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h1f : $display ("%t: OPCODE  : RRA   ", $time);
+    8'h1f : $display ("%t: OPCODE  : RRA", $time);
     8'h20 : 
       begin
         $display ("%t: OPCODE  : JR    NZ,index", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'h21 : 
       begin
         $display ("%t: OPCODE  : LD    HL,word", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h22 : 
       begin
         $display ("%t: OPCODE  : LD    (word),HL", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h23 : $display ("%t: OPCODE  : INC   HL", $time);
     8'h24 : $display ("%t: OPCODE  : INC   H", $time);
@@ -95,19 +97,19 @@ task decode0;
     8'h26 : 
       begin
         $display ("%t: OPCODE  : LD    H,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h27 : $display ("%t: OPCODE  : DAA   ", $time);
+    8'h27 : $display ("%t: OPCODE  : DAA", $time);
     8'h28 : 
       begin
         $display ("%t: OPCODE  : JR    Z,index", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'h29 : $display ("%t: OPCODE  : ADD   HL,HL", $time);
     8'h2a : 
       begin
         $display ("%t: OPCODE  : LD    HL,(word)", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h2b : $display ("%t: OPCODE  : DEC   HL", $time);
     8'h2c : $display ("%t: OPCODE  : INC   L", $time);
@@ -115,23 +117,23 @@ task decode0;
     8'h2e : 
       begin
         $display ("%t: OPCODE  : LD    L,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h2f : $display ("%t: OPCODE  : CPL   ", $time);
+    8'h2f : $display ("%t: OPCODE  : CPL", $time);
     8'h30 : 
       begin
         $display ("%t: OPCODE  : JR    NC,index", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'h31 : 
       begin
         $display ("%t: OPCODE  : LD    SP,word", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h32 : 
       begin
         $display ("%t: OPCODE  : LD    (word),A", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h33 : $display ("%t: OPCODE  : INC   SP", $time);
     8'h34 : $display ("%t: OPCODE  : INC   (HL)", $time);
@@ -139,19 +141,19 @@ task decode0;
     8'h36 : 
       begin
         $display ("%t: OPCODE  : LD    (HL),byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h37 : $display ("%t: OPCODE  : SCF   ", $time);
+    8'h37 : $display ("%t: OPCODE  : SCF", $time);
     8'h38 : 
       begin
         $display ("%t: OPCODE  : JR    C,index", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'h39 : $display ("%t: OPCODE  : ADD   HL,SP", $time);
     8'h3a : 
       begin
         $display ("%t: OPCODE  : LD    A,(word)", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'h3b : $display ("%t: OPCODE  : DEC   SP", $time);
     8'h3c : $display ("%t: OPCODE  : INC   A", $time);
@@ -159,9 +161,9 @@ task decode0;
     8'h3e : 
       begin
         $display ("%t: OPCODE  : LD    A,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'h3f : $display ("%t: OPCODE  : CCF   ", $time);
+    8'h3f : $display ("%t: OPCODE  : CCF", $time);
     8'h40 : $display ("%t: OPCODE  : LD    B,B", $time);
     8'h41 : $display ("%t: OPCODE  : LD    B,C", $time);
     8'h42 : $display ("%t: OPCODE  : LD    B,D", $time);
@@ -216,7 +218,7 @@ task decode0;
     8'h73 : $display ("%t: OPCODE  : LD    (HL),E", $time);
     8'h74 : $display ("%t: OPCODE  : LD    (HL),H", $time);
     8'h75 : $display ("%t: OPCODE  : LD    (HL),L", $time);
-    8'h76 : $display ("%t: OPCODE  : HLT   ", $time);
+    8'h76 : $display ("%t: OPCODE  : HALT", $time);
     8'h77 : $display ("%t: OPCODE  : LD    (HL),A", $time);
     8'h78 : $display ("%t: OPCODE  : LD    A,B", $time);
     8'h79 : $display ("%t: OPCODE  : LD    A,C", $time);
@@ -250,14 +252,14 @@ task decode0;
     8'h95 : $display ("%t: OPCODE  : SUB   L", $time);
     8'h96 : $display ("%t: OPCODE  : SUB   (HL)", $time);
     8'h97 : $display ("%t: OPCODE  : SUB   A", $time);
-    8'h98 : $display ("%t: OPCODE  : SBC   B", $time);
-    8'h99 : $display ("%t: OPCODE  : SBC   C", $time);
-    8'h9a : $display ("%t: OPCODE  : SBC   D", $time);
-    8'h9b : $display ("%t: OPCODE  : SBC   E", $time);
-    8'h9c : $display ("%t: OPCODE  : SBC   H", $time);
-    8'h9d : $display ("%t: OPCODE  : SBC   L", $time);
-    8'h9e : $display ("%t: OPCODE  : SBC   (HL)", $time);
-    8'h9f : $display ("%t: OPCODE  : SBC   A", $time);
+    8'h98 : $display ("%t: OPCODE  : SBC   A,B", $time);
+    8'h99 : $display ("%t: OPCODE  : SBC   A,C", $time);
+    8'h9a : $display ("%t: OPCODE  : SBC   A,D", $time);
+    8'h9b : $display ("%t: OPCODE  : SBC   A,E", $time);
+    8'h9c : $display ("%t: OPCODE  : SBC   A,H", $time);
+    8'h9d : $display ("%t: OPCODE  : SBC   A,L", $time);
+    8'h9e : $display ("%t: OPCODE  : SBC   A,(HL)", $time);
+    8'h9f : $display ("%t: OPCODE  : SBC   A,A", $time);
     8'ha0 : $display ("%t: OPCODE  : AND   B", $time);
     8'ha1 : $display ("%t: OPCODE  : AND   C", $time);
     8'ha2 : $display ("%t: OPCODE  : AND   D", $time);
@@ -295,100 +297,95 @@ task decode0;
     8'hc2 : 
       begin
         $display ("%t: OPCODE  : JP    NZ,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hc3 : 
       begin
         $display ("%t: OPCODE  : JP    address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hc4 : 
       begin
         $display ("%t: OPCODE  : CALL  NZ,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hc5 : $display ("%t: OPCODE  : PUSH  BC", $time);
     8'hc6 : 
       begin
         $display ("%t: OPCODE  : ADD   A,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'hc7 : $display ("%t: OPCODE  : RST   0", $time);
+    8'hc7 : $display ("%t: OPCODE  : RST   00H", $time);
     8'hc8 : $display ("%t: OPCODE  : RET   Z", $time);
-    8'hc9 : $display ("%t: OPCODE  : RET   ", $time);
+    8'hc9 : $display ("%t: OPCODE  : RET", $time);
     8'hca : 
       begin
         $display ("%t: OPCODE  : JP    Z,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hcb : state = 8'hcb;
     8'hcc : 
       begin
         $display ("%t: OPCODE  : CALL  Z,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hcd : 
       begin
         $display ("%t: OPCODE  : CALL  address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hce : 
       begin
         $display ("%t: OPCODE  : ADC   A,byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
-    8'hcf : $display ("%t: OPCODE  : RST   8", $time);
+    8'hcf : $display ("%t: OPCODE  : RST   08H", $time);
     8'hd0 : $display ("%t: OPCODE  : RET   NC", $time);
     8'hd1 : $display ("%t: OPCODE  : POP   DE", $time);
     8'hd2 : 
       begin
         $display ("%t: OPCODE  : JP    NC,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
-    8'hd3 :
+    8'hd3 : 
       begin
         $display ("%t: OPCODE  : OUT   (byte),A", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'hd4 : 
       begin
         $display ("%t: OPCODE  : CALL  NC,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hd5 : $display ("%t: OPCODE  : PUSH  DE", $time);
     8'hd6 : 
       begin
         $display ("%t: OPCODE  : SUB   byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'hd7 : $display ("%t: OPCODE  : RST   10H", $time);
     8'hd8 : $display ("%t: OPCODE  : RET   C", $time);
-    8'hd9 : $display ("%t: OPCODE  : EXX   ", $time);
+    8'hd9 : $display ("%t: OPCODE  : EXX", $time);
     8'hda : 
       begin
         $display ("%t: OPCODE  : JP    C,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hdb : 
       begin
         $display ("%t: OPCODE  : IN    A,(byte)", $time);
-        state = {4'd1, 4'd1};
-      end
-    8'hd3 : 
-      begin
-        $display ("%t: OPCODE  : OUT   (byte),A", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'hdc : 
       begin
         $display ("%t: OPCODE  : CALL  C,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hdd : state = 8'hdd;
     8'hde : 
       begin
-        $display ("%t: OPCODE  : SBC   byte", $time);
-        state = {4'd1, 4'd1};
+        $display ("%t: OPCODE  : SBC   A,byte", $time);
+        state = { 4'd1, 4'd1 };
       end
     8'hdf : $display ("%t: OPCODE  : RST   18H", $time);
     8'he0 : $display ("%t: OPCODE  : RET   PO", $time);
@@ -396,19 +393,19 @@ task decode0;
     8'he2 : 
       begin
         $display ("%t: OPCODE  : JP    PO,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'he3 : $display ("%t: OPCODE  : EX    (SP),HL", $time);
     8'he4 : 
       begin
         $display ("%t: OPCODE  : CALL  PO,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'he5 : $display ("%t: OPCODE  : PUSH  HL", $time);
     8'he6 : 
       begin
         $display ("%t: OPCODE  : AND   byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'he7 : $display ("%t: OPCODE  : RST   20H", $time);
     8'he8 : $display ("%t: OPCODE  : RET   PE", $time);
@@ -416,19 +413,19 @@ task decode0;
     8'hea : 
       begin
         $display ("%t: OPCODE  : JP    PE,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'heb : $display ("%t: OPCODE  : EX    DE,HL", $time);
     8'hec : 
       begin
         $display ("%t: OPCODE  : CALL  PE,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hed : state = 8'hed;
     8'hee : 
       begin
         $display ("%t: OPCODE  : XOR   byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'hef : $display ("%t: OPCODE  : RST   28H", $time);
     8'hf0 : $display ("%t: OPCODE  : RET   P", $time);
@@ -436,39 +433,39 @@ task decode0;
     8'hf2 : 
       begin
         $display ("%t: OPCODE  : JP    P,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
-    8'hf3 : $display ("%t: OPCODE  : DI    ", $time);
+    8'hf3 : $display ("%t: OPCODE  : DI", $time);
     8'hf4 : 
       begin
         $display ("%t: OPCODE  : CALL  P,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hf5 : $display ("%t: OPCODE  : PUSH  AF", $time);
     8'hf6 : 
       begin
         $display ("%t: OPCODE  : OR    byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'hf7 : $display ("%t: OPCODE  : RST   30H", $time);
     8'hf8 : $display ("%t: OPCODE  : RET   M", $time);
     8'hf9 : $display ("%t: OPCODE  : LD    SP,HL", $time);
     8'hfa : 
       begin
-        $display ("%t: OPCODE  : JM    M,address", $time);
-        state = {4'd1, 4'd2};
+        $display ("%t: OPCODE  : JP    M,address", $time);
+        state = { 4'd1, 4'd2 };
       end
-    8'hfb : $display ("%t: OPCODE  : EI    ", $time);
+    8'hfb : $display ("%t: OPCODE  : EI", $time);
     8'hfc : 
       begin
         $display ("%t: OPCODE  : CALL  M,address", $time);
-        state = {4'd1, 4'd2};
+        state = { 4'd1, 4'd2 };
       end
     8'hfd : state = 8'hfd;
     8'hfe : 
       begin
         $display ("%t: OPCODE  : CP    byte", $time);
-        state = {4'd1, 4'd1};
+        state = { 4'd1, 4'd1 };
       end
     8'hff : $display ("%t: OPCODE  : RST   38H", $time);
   endcase
@@ -482,11 +479,6 @@ task decode1;
     8'hcb : 
       begin
         case (opcode)
-          8'h07 : 
-            begin
-              $display ("%t: OPCODE  : RLC   A", $time);
-              state = { 4'd0, 4'd0 };
-            end
           8'h00 : 
             begin
               $display ("%t: OPCODE  : RLC   B", $time);
@@ -522,9 +514,49 @@ task decode1;
               $display ("%t: OPCODE  : RLC   (HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h17 : 
+          8'h07 : 
             begin
-              $display ("%t: OPCODE  : RL    A", $time);
+              $display ("%t: OPCODE  : RLC   A", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h08 : 
+            begin
+              $display ("%t: OPCODE  : RRC   B", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h09 : 
+            begin
+              $display ("%t: OPCODE  : RRC   C", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h0a : 
+            begin
+              $display ("%t: OPCODE  : RRC   D", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h0b : 
+            begin
+              $display ("%t: OPCODE  : RRC   E", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h0c : 
+            begin
+              $display ("%t: OPCODE  : RRC   H", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h0d : 
+            begin
+              $display ("%t: OPCODE  : RRC   L", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h0e : 
+            begin
+              $display ("%t: OPCODE  : RRC   (HL)", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h0f : 
+            begin
+              $display ("%t: OPCODE  : RRC   A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h10 : 
@@ -562,89 +594,209 @@ task decode1;
               $display ("%t: OPCODE  : RL    (HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h0f : 
+          8'h17 : 
             begin
-              $display ("%t: OPCODE  : RRC   A", $time);
+              $display ("%t: OPCODE  : RL    A", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h08 : 
+          8'h18 : 
             begin
-              $display ("%t: OPCODE  : RRC   B", $time);
+              $display ("%t: OPCODE  : RR    B", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h09 : 
+          8'h19 : 
             begin
-              $display ("%t: OPCODE  : RRC   C", $time);
+              $display ("%t: OPCODE  : RR    C", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h0a : 
+          8'h1a : 
             begin
-              $display ("%t: OPCODE  : RRC   D", $time);
+              $display ("%t: OPCODE  : RR    D", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h0b : 
+          8'h1b : 
             begin
-              $display ("%t: OPCODE  : RRC   E", $time);
+              $display ("%t: OPCODE  : RR    E", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h0c : 
+          8'h1c : 
             begin
-              $display ("%t: OPCODE  : RRC   H", $time);
+              $display ("%t: OPCODE  : RR    H", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h0d : 
+          8'h1d : 
             begin
-              $display ("%t: OPCODE  : RRC   L", $time);
+              $display ("%t: OPCODE  : RR    L", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h0e : 
+          8'h1e : 
             begin
-              $display ("%t: OPCODE  : RRC   (HL)", $time);
+              $display ("%t: OPCODE  : RR    (HL)", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h1f : 
             begin
-              $display ("%t: OPCODE  : RL    A", $time);
+              $display ("%t: OPCODE  : RR    A", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h18 : 
+          8'h20 : 
             begin
-              $display ("%t: OPCODE  : RL    B", $time);
+              $display ("%t: OPCODE  : SLA   B", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h19 : 
+          8'h21 : 
             begin
-              $display ("%t: OPCODE  : RL    C", $time);
+              $display ("%t: OPCODE  : SLA   C", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h1a : 
+          8'h22 : 
             begin
-              $display ("%t: OPCODE  : RL    D", $time);
+              $display ("%t: OPCODE  : SLA   D", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h1b : 
+          8'h23 : 
             begin
-              $display ("%t: OPCODE  : RL    E", $time);
+              $display ("%t: OPCODE  : SLA   E", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h1c : 
+          8'h24 : 
             begin
-              $display ("%t: OPCODE  : RL    H", $time);
+              $display ("%t: OPCODE  : SLA   H", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h1d : 
+          8'h25 : 
             begin
-              $display ("%t: OPCODE  : RL    L", $time);
+              $display ("%t: OPCODE  : SLA   L", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h1e : 
+          8'h26 : 
             begin
-              $display ("%t: OPCODE  : RL    (HL)", $time);
+              $display ("%t: OPCODE  : SLA   (HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h47 : 
+          8'h27 : 
             begin
-              $display ("%t: OPCODE  : BIT   0,A", $time);
+              $display ("%t: OPCODE  : SLA   A", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h28 : 
+            begin
+              $display ("%t: OPCODE  : SRA   B", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h29 : 
+            begin
+              $display ("%t: OPCODE  : SRA   C", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h2a : 
+            begin
+              $display ("%t: OPCODE  : SRA   D", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h2b : 
+            begin
+              $display ("%t: OPCODE  : SRA   E", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h2c : 
+            begin
+              $display ("%t: OPCODE  : SRA   H", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h2d : 
+            begin
+              $display ("%t: OPCODE  : SRA   L", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h2e : 
+            begin
+              $display ("%t: OPCODE  : SRA   (HL)", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h2f : 
+            begin
+              $display ("%t: OPCODE  : SRA   A", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h30 : 
+            begin
+              $display ("%t: OPCODE  : SLL   B", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h31 : 
+            begin
+              $display ("%t: OPCODE  : SLL   C", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h32 : 
+            begin
+              $display ("%t: OPCODE  : SLL   D", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h33 : 
+            begin
+              $display ("%t: OPCODE  : SLL   E", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h34 : 
+            begin
+              $display ("%t: OPCODE  : SLL   H", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h35 : 
+            begin
+              $display ("%t: OPCODE  : SLL   L", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h36 : 
+            begin
+              $display ("%t: OPCODE  : SLL   (HL)", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h37 : 
+            begin
+              $display ("%t: OPCODE  : SLL   A", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h38 : 
+            begin
+              $display ("%t: OPCODE  : SRL   B", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h39 : 
+            begin
+              $display ("%t: OPCODE  : SRL   C", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h3a : 
+            begin
+              $display ("%t: OPCODE  : SRL   D", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h3b : 
+            begin
+              $display ("%t: OPCODE  : SRL   E", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h3c : 
+            begin
+              $display ("%t: OPCODE  : SRL   H", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h3d : 
+            begin
+              $display ("%t: OPCODE  : SRL   L", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h3e : 
+            begin
+              $display ("%t: OPCODE  : SRL   (HL)", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h3f : 
+            begin
+              $display ("%t: OPCODE  : SRL   A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h40 : 
@@ -682,9 +834,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   0,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h4f : 
+          8'h47 : 
             begin
-              $display ("%t: OPCODE  : BIT   1,A", $time);
+              $display ("%t: OPCODE  : BIT   0,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h48 : 
@@ -722,9 +874,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   1,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h57 : 
+          8'h4f : 
             begin
-              $display ("%t: OPCODE  : BIT   2,A", $time);
+              $display ("%t: OPCODE  : BIT   1,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h50 : 
@@ -762,9 +914,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   2,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h5f : 
+          8'h57 : 
             begin
-              $display ("%t: OPCODE  : BIT   3,A", $time);
+              $display ("%t: OPCODE  : BIT   2,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h58 : 
@@ -802,9 +954,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   3,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h67 : 
+          8'h5f : 
             begin
-              $display ("%t: OPCODE  : BIT   4,A", $time);
+              $display ("%t: OPCODE  : BIT   3,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h60 : 
@@ -842,9 +994,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   4,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h6f : 
+          8'h67 : 
             begin
-              $display ("%t: OPCODE  : BIT   5,A", $time);
+              $display ("%t: OPCODE  : BIT   4,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h68 : 
@@ -882,9 +1034,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   5,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h77 : 
+          8'h6f : 
             begin
-              $display ("%t: OPCODE  : BIT   6,A", $time);
+              $display ("%t: OPCODE  : BIT   5,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h70 : 
@@ -922,9 +1074,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   6,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h7f : 
+          8'h77 : 
             begin
-              $display ("%t: OPCODE  : BIT   7,A", $time);
+              $display ("%t: OPCODE  : BIT   6,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h78 : 
@@ -962,9 +1114,9 @@ task decode1;
               $display ("%t: OPCODE  : BIT   7,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h87 : 
+          8'h7f : 
             begin
-              $display ("%t: OPCODE  : RES   0,A", $time);
+              $display ("%t: OPCODE  : BIT   7,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h80 : 
@@ -1002,9 +1154,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   0,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h8f : 
+          8'h87 : 
             begin
-              $display ("%t: OPCODE  : RES   1,A", $time);
+              $display ("%t: OPCODE  : RES   0,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h88 : 
@@ -1042,9 +1194,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   1,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h97 : 
+          8'h8f : 
             begin
-              $display ("%t: OPCODE  : RES   2,A", $time);
+              $display ("%t: OPCODE  : RES   1,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h90 : 
@@ -1082,9 +1234,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   2,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h9f : 
+          8'h97 : 
             begin
-              $display ("%t: OPCODE  : RES   3,A", $time);
+              $display ("%t: OPCODE  : RES   2,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h98 : 
@@ -1122,9 +1274,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   3,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'ha7 : 
+          8'h9f : 
             begin
-              $display ("%t: OPCODE  : RES   4,A", $time);
+              $display ("%t: OPCODE  : RES   3,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'ha0 : 
@@ -1162,9 +1314,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   4,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'haf : 
+          8'ha7 : 
             begin
-              $display ("%t: OPCODE  : RES   5,A", $time);
+              $display ("%t: OPCODE  : RES   4,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'ha8 : 
@@ -1202,9 +1354,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   5,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hb7 : 
+          8'haf : 
             begin
-              $display ("%t: OPCODE  : RES   6,A", $time);
+              $display ("%t: OPCODE  : RES   5,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hb0 : 
@@ -1242,9 +1394,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   6,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hbf : 
+          8'hb7 : 
             begin
-              $display ("%t: OPCODE  : RES   7,A", $time);
+              $display ("%t: OPCODE  : RES   6,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hb8 : 
@@ -1282,9 +1434,9 @@ task decode1;
               $display ("%t: OPCODE  : RES   7,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hc7 : 
+          8'hbf : 
             begin
-              $display ("%t: OPCODE  : SET   0,A", $time);
+              $display ("%t: OPCODE  : RES   7,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hc0 : 
@@ -1322,9 +1474,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   0,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hcf : 
+          8'hc7 : 
             begin
-              $display ("%t: OPCODE  : SET   1,A", $time);
+              $display ("%t: OPCODE  : SET   0,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hc8 : 
@@ -1362,9 +1514,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   1,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hd7 : 
+          8'hcf : 
             begin
-              $display ("%t: OPCODE  : SET   2,A", $time);
+              $display ("%t: OPCODE  : SET   1,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hd0 : 
@@ -1402,9 +1554,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   2,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hdf : 
+          8'hd7 : 
             begin
-              $display ("%t: OPCODE  : SET   3,A", $time);
+              $display ("%t: OPCODE  : SET   2,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hd8 : 
@@ -1442,9 +1594,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   3,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he7 : 
+          8'hdf : 
             begin
-              $display ("%t: OPCODE  : SET   4,A", $time);
+              $display ("%t: OPCODE  : SET   3,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'he0 : 
@@ -1482,9 +1634,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   4,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hef : 
+          8'he7 : 
             begin
-              $display ("%t: OPCODE  : SET   5,A", $time);
+              $display ("%t: OPCODE  : SET   4,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'he8 : 
@@ -1522,9 +1674,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   5,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hf7 : 
+          8'hef : 
             begin
-              $display ("%t: OPCODE  : SET   6,A", $time);
+              $display ("%t: OPCODE  : SET   5,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hf0 : 
@@ -1562,9 +1714,9 @@ task decode1;
               $display ("%t: OPCODE  : SET   6,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hff : 
+          8'hf7 : 
             begin
-              $display ("%t: OPCODE  : SET   7,A", $time);
+              $display ("%t: OPCODE  : SET   6,A", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hf8 : 
@@ -1602,170 +1754,246 @@ task decode1;
               $display ("%t: OPCODE  : SET   7,(HL)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h27 : 
+          8'hff : 
             begin
-              $display ("%t: OPCODE  : SLA   A", $time);
+              $display ("%t: OPCODE  : SET   7,A", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h20 : 
+        endcase
+      end // case: 8'hcb
+
+    8'hdd : 
+      begin
+        case (opcode)
+          8'h09 : 
             begin
-              $display ("%t: OPCODE  : SLA   B", $time);
+              $display ("%t: OPCODE  : ADD   IX,BC", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h21 : 
+          8'h19 : 
             begin
-              $display ("%t: OPCODE  : SLA   C", $time);
+              $display ("%t: OPCODE  : ADD   IX,DE", $time);
               state = { 4'd0, 4'd0 };
             end
+          8'h21 : 
+            begin
+              $display ("%t: OPCODE  : LD    IX,word", $time);
+              state = { 4'd1, 4'd2 };
+            end
           8'h22 : 
             begin
-              $display ("%t: OPCODE  : SLA   D", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    (word),IX", $time);
+              state = { 4'd1, 4'd2 };
             end
           8'h23 : 
             begin
-              $display ("%t: OPCODE  : SLA   E", $time);
+              $display ("%t: OPCODE  : INC   IX", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h24 : 
             begin
-              $display ("%t: OPCODE  : SLA   H", $time);
+              $display ("%t: OPCODE  : INC   IXH", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h25 : 
             begin
-              $display ("%t: OPCODE  : SLA   L", $time);
+              $display ("%t: OPCODE  : DEC   IXH", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h26 : 
             begin
-              $display ("%t: OPCODE  : SLA   (HL)", $time);
-              state = { 4'd0, 4'd0 };
-            end
-          8'h2f : 
-            begin
-              $display ("%t: OPCODE  : SRA   A", $time);
-              state = { 4'd0, 4'd0 };
-            end
-          8'h28 : 
-            begin
-              $display ("%t: OPCODE  : SRA   B", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IXH,byte", $time);
+              state = { 4'd1, 4'd1 };
             end
           8'h29 : 
             begin
-              $display ("%t: OPCODE  : SRA   C", $time);
+              $display ("%t: OPCODE  : ADD   IX,IX", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h2a : 
             begin
-              $display ("%t: OPCODE  : SRA   D", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IX,(word)", $time);
+              state = { 4'd1, 4'd2 };
             end
           8'h2b : 
             begin
-              $display ("%t: OPCODE  : SRA   E", $time);
+              $display ("%t: OPCODE  : DEC   IX", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h2c : 
             begin
-              $display ("%t: OPCODE  : SRA   H", $time);
+              $display ("%t: OPCODE  : INC   IXL", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h2d : 
             begin
-              $display ("%t: OPCODE  : SRA   L", $time);
+              $display ("%t: OPCODE  : DEC   IXL", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h2e : 
             begin
-              $display ("%t: OPCODE  : SRA   (HL)", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IXL,byte", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'h3f : 
+          8'h34 : 
             begin
-              $display ("%t: OPCODE  : SRL   A", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : INC   (IX+index)", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'h38 : 
+          8'h35 : 
             begin
-              $display ("%t: OPCODE  : SRL   B", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : DEC   (IX+index)", $time);
+              state = { 4'd1, 4'd1 };
+            end
+          8'h36 : 
+            begin
+              $display ("%t: OPCODE  : LD    (IX+index),byte", $time);
+              state = { 4'd1, 4'd2 };
             end
           8'h39 : 
             begin
-              $display ("%t: OPCODE  : SRL   C", $time);
+              $display ("%t: OPCODE  : ADD   IX,SP", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h3a : 
+          8'h44 : 
             begin
-              $display ("%t: OPCODE  : SRL   D", $time);
+              $display ("%t: OPCODE  : LD    B,IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h3b : 
+          8'h45 : 
             begin
-              $display ("%t: OPCODE  : SRL   E", $time);
+              $display ("%t: OPCODE  : LD    B,IXL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h3c : 
+          8'h46 : 
             begin
-              $display ("%t: OPCODE  : SRL   H", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    B,(IX+index)", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'h3d : 
+          8'h4c : 
             begin
-              $display ("%t: OPCODE  : SRL   L", $time);
+              $display ("%t: OPCODE  : LD    C,IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h3e : 
+          8'h4d : 
             begin
-              $display ("%t: OPCODE  : SRL   (HL)", $time);
+              $display ("%t: OPCODE  : LD    C,IXL", $time);
               state = { 4'd0, 4'd0 };
             end
-        endcase
-      end
-    8'hdd : 
-      begin
-        case (opcode)
-          8'h7e : 
+          8'h4e : 
             begin
-              $display ("%t: OPCODE  : LD    A,(IX+index)", $time);
+              $display ("%t: OPCODE  : LD    C,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h46 : 
+          8'h54 : 
             begin
-              $display ("%t: OPCODE  : LD    B,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    D,IXH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h4e : 
+          8'h55 : 
             begin
-              $display ("%t: OPCODE  : LD    C,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    D,IXL", $time);
+              state = { 4'd0, 4'd0 };
             end
           8'h56 : 
             begin
               $display ("%t: OPCODE  : LD    D,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
+          8'h5c : 
+            begin
+              $display ("%t: OPCODE  : LD    E,IXH", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h5d : 
+            begin
+              $display ("%t: OPCODE  : LD    E,IXL", $time);
+              state = { 4'd0, 4'd0 };
+            end
           8'h5e : 
             begin
               $display ("%t: OPCODE  : LD    E,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
+          8'h60 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,B", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h61 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,C", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h62 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,D", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h63 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,E", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h64 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,IXH", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h65 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,IXL", $time);
+              state = { 4'd0, 4'd0 };
+            end
           8'h66 : 
             begin
               $display ("%t: OPCODE  : LD    H,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
+          8'h67 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXH,A", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h68 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXL,B", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h69 : 
+            begin
+              $display ("%t: OPCODE  : LD    IXL,C", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h6a : 
+            begin
+              $display ("%t: OPCODE  : LD    IXL,D", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h6b : 
+            begin
+              $display ("%t: OPCODE  : LD    IXL,E", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h6c : 
+            begin
+              $display ("%t: OPCODE  : LD    IXL,IXH", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h6d : 
+            begin
+              $display ("%t: OPCODE  : LD    IXL,IXL", $time);
+              state = { 4'd0, 4'd0 };
+            end
           8'h6e : 
             begin
               $display ("%t: OPCODE  : LD    L,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h77 : 
+          8'h6f : 
             begin
-              $display ("%t: OPCODE  : LD    (IX+index),A", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    IXL,A", $time);
+              state = { 4'd0, 4'd0 };
             end
           8'h70 : 
             begin
@@ -1797,44 +2025,34 @@ task decode1;
               $display ("%t: OPCODE  : LD    (IX+index),L", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h76 : 
+          8'h77 : 
             begin
-              $display ("%t: OPCODE  : LD    (IX+index),byte", $time);
+              $display ("%t: OPCODE  : LD    (IX+index),A", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h36 : 
+          8'h7c : 
             begin
-              $display ("%t: OPCODE  : LD    (IX+index),byte", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    A,IXH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h21 : 
+          8'h7d : 
             begin
-              $display ("%t: OPCODE  : LD    IX,word", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : LD    A,IXL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h2a : 
+          8'h7e : 
             begin
-              $display ("%t: OPCODE  : LD    IX,(word)", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : LD    A,(IX+index)", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'h22 : 
+          8'h84 : 
             begin
-              $display ("%t: OPCODE  : LD    (word),IX", $time);
-              state = { 4'd1, 4'd2 };
-            end
-          8'h22 : 
-            begin
-              $display ("%t: OPCODE  : LD    (word),IY", $time);
-              state = { 4'd1, 4'd2 };
-            end
-          8'hf9 : 
-            begin
-              $display ("%t: OPCODE  : LD    SP,IX", $time);
+              $display ("%t: OPCODE  : ADD   A,IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he3 : 
+          8'h85 : 
             begin
-              $display ("%t: OPCODE  : EX    (SP),IX", $time);
+              $display ("%t: OPCODE  : ADD   A,IXL", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h86 : 
@@ -1842,309 +2060,310 @@ task decode1;
               $display ("%t: OPCODE  : ADD   A,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h8e : 
+          8'h8c : 
             begin
-              $display ("%t: OPCODE  : ADC   A,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : ADC   A,IXH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h96 : 
+          8'h8d : 
             begin
-              $display ("%t: OPCODE  : SUB   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : ADC   A,IXL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h9e : 
+          8'h8e : 
             begin
-              $display ("%t: OPCODE  : SBC   (IX+index)", $time);
+              $display ("%t: OPCODE  : ADC   A,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h09 : 
+          8'h94 : 
             begin
-              $display ("%t: OPCODE  : ADD   IX,BC", $time);
+              $display ("%t: OPCODE  : SUB   IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h19 : 
+          8'h95 : 
             begin
-              $display ("%t: OPCODE  : ADD   IX,DE", $time);
+              $display ("%t: OPCODE  : SUB   IXL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h29 : 
+          8'h96 : 
             begin
-              $display ("%t: OPCODE  : ADD   IX,IX", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : SUB   (IX+index)", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'h39 : 
+          8'h9c : 
             begin
-              $display ("%t: OPCODE  : ADD   IX,SP", $time);
+              $display ("%t: OPCODE  : SBC   A,IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h34 : 
+          8'h9d : 
             begin
-              $display ("%t: OPCODE  : INC   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SBC   A,IXL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h35 : 
+          8'h9e : 
             begin
-              $display ("%t: OPCODE  : DEC   (IX+index)", $time);
+              $display ("%t: OPCODE  : SBC   A,(IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h23 : 
+          8'ha4 : 
             begin
-              $display ("%t: OPCODE  : INC   IX", $time);
+              $display ("%t: OPCODE  : AND   IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h2b : 
+          8'ha5 : 
             begin
-              $display ("%t: OPCODE  : DEC   IX", $time);
+              $display ("%t: OPCODE  : AND   IXL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'ha6 : 
             begin
-              $display ("%t: OPCODE  : RLC   (IX+index)", $time);
+              $display ("%t: OPCODE  : AND   (IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'hac : 
             begin
-              $display ("%t: OPCODE  : RL    (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : XOR   IXH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'had : 
             begin
-              $display ("%t: OPCODE  : RRC   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : XOR   IXL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hae : 
             begin
-              $display ("%t: OPCODE  : RL    (IX+index)", $time);
+              $display ("%t: OPCODE  : XOR   (IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'ha6 : 
+          8'hb4 : 
             begin
-              $display ("%t: OPCODE  : AND   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OR    IXH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hae : 
+          8'hb5 : 
             begin
-              $display ("%t: OPCODE  : XOR   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OR    IXL", $time);
+              state = { 4'd0, 4'd0 };
             end
           8'hb6 : 
             begin
               $display ("%t: OPCODE  : OR    (IX+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hbe : 
-            begin
-              $display ("%t: OPCODE  : CP    (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
-            end
-          8'he9 : 
+          8'hbc : 
             begin
-              $display ("%t: OPCODE  : JP    (IX)", $time);
+              $display ("%t: OPCODE  : CP    IXH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he5 : 
+          8'hbd : 
             begin
-              $display ("%t: OPCODE  : PUSH  IX", $time);
+              $display ("%t: OPCODE  : CP    IXL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he1 : 
+          8'hbe : 
             begin
-              $display ("%t: OPCODE  : POP   IX", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : CP    (IX+index)", $time);
+              state = { 4'd1, 4'd1 };
             end
           8'hcb : 
             begin
-              $display ("%t: OPCODE  : BIT   0,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : CB    (IX+index)", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'hcb : 
+          8'he1 : 
             begin
-              $display ("%t: OPCODE  : BIT   1,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : POP   IX", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'he3 : 
             begin
-              $display ("%t: OPCODE  : BIT   2,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : EX    (SP),IX", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'he5 : 
             begin
-              $display ("%t: OPCODE  : BIT   3,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : PUSH  IX", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'he9 : 
             begin
-              $display ("%t: OPCODE  : BIT   4,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : JP    (IX)", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hf9 : 
             begin
-              $display ("%t: OPCODE  : BIT   5,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    SP,IX", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+        endcase
+      end // case: 8'hdd
+
+    8'hed : 
+      begin
+        case (opcode)
+          8'h40 : 
             begin
-              $display ("%t: OPCODE  : BIT   6,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : IN    B,(C)", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h41 : 
             begin
-              $display ("%t: OPCODE  : BIT   7,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OUT   (C),B", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h42 : 
             begin
-              $display ("%t: OPCODE  : RES   0,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SBC   HL,BC", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h43 : 
             begin
-              $display ("%t: OPCODE  : RES   1,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    (word),BC", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'hcb : 
+          8'h44 : 
             begin
-              $display ("%t: OPCODE  : RES   2,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : NEG", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h45 : 
             begin
-              $display ("%t: OPCODE  : RES   3,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : RETN", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h46 : 
             begin
-              $display ("%t: OPCODE  : RES   4,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : IM    0", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h47 : 
             begin
-              $display ("%t: OPCODE  : RES   5,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    I,A", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h48 : 
             begin
-              $display ("%t: OPCODE  : RES   6,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : IN    C,(C)", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h49 : 
             begin
-              $display ("%t: OPCODE  : RES   7,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OUT   (C),C", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h4a : 
             begin
-              $display ("%t: OPCODE  : SET   0,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : ADC   HL,BC", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h4b : 
             begin
-              $display ("%t: OPCODE  : SET   1,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    BC,(word)", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'hcb : 
+          8'h4d : 
             begin
-              $display ("%t: OPCODE  : SET   2,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : RETI", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h4f : 
             begin
-              $display ("%t: OPCODE  : SET   3,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    R,A", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h50 : 
             begin
-              $display ("%t: OPCODE  : SET   4,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : IN    D,(C)", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h51 : 
             begin
-              $display ("%t: OPCODE  : SET   5,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OUT   (C),D", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h52 : 
             begin
-              $display ("%t: OPCODE  : SET   6,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SBC   HL,DE", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h53 : 
             begin
-              $display ("%t: OPCODE  : SET   7,(IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    (word),DE", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'hcb : 
+          8'h56 : 
             begin
-              $display ("%t: OPCODE  : SLA   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : IM    1", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h57 : 
             begin
-              $display ("%t: OPCODE  : SRA   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    A,I", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h58 : 
             begin
-              $display ("%t: OPCODE  : SRL   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : IN    E,(C)", $time);
+              state = { 4'd0, 4'd0 };
             end
-        endcase
-      end
-    8'hed : 
-      begin
-        case (opcode)
-          8'h57 : 
+          8'h59 : 
             begin
-              $display ("%t: OPCODE  : LD    A,I", $time);
+              $display ("%t: OPCODE  : OUT   (C),E", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h4b : 
+          8'h5a : 
             begin
-              $display ("%t: OPCODE  : LD    BC,(word)", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : ADC   HL,DE", $time);
+              state = { 4'd0, 4'd0 };
             end
           8'h5b : 
             begin
               $display ("%t: OPCODE  : LD    DE,(word)", $time);
               state = { 4'd1, 4'd2 };
             end
-          8'h6b : 
+          8'h5e : 
             begin
-              $display ("%t: OPCODE  : LD    HL,(word)", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : IM    2", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h7b : 
+          8'h5f : 
             begin
-              $display ("%t: OPCODE  : LD    SP,(word)", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : LD    A,R", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h43 : 
+          8'h60 : 
             begin
-              $display ("%t: OPCODE  : LD    (word),BC", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : IN    H,(C)", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h53 : 
+          8'h61 : 
             begin
-              $display ("%t: OPCODE  : LD    (word),DE", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : OUT   (C),H", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h6b : 
+          8'h62 : 
+            begin
+              $display ("%t: OPCODE  : SBC   HL,HL", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'h63 : 
             begin
               $display ("%t: OPCODE  : LD    (word),HL", $time);
               state = { 4'd1, 4'd2 };
             end
-          8'h73 : 
+          8'h67 : 
             begin
-              $display ("%t: OPCODE  : LD    (word),SP", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : RRD", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h4a : 
+          8'h68 : 
             begin
-              $display ("%t: OPCODE  : ADC   HL,BC", $time);
+              $display ("%t: OPCODE  : IN    L,(C)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h5a : 
+          8'h69 : 
             begin
-              $display ("%t: OPCODE  : ADC   HL,DE", $time);
+              $display ("%t: OPCODE  : OUT   (C),L", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h6a : 
@@ -2152,24 +2371,24 @@ task decode1;
               $display ("%t: OPCODE  : ADC   HL,HL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h7a : 
+          8'h6b : 
             begin
-              $display ("%t: OPCODE  : ADC   HL,SP", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    HL,(word)", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'h42 : 
+          8'h6f : 
             begin
-              $display ("%t: OPCODE  : SBC   HL,BC", $time);
+              $display ("%t: OPCODE  : RLD", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h52 : 
+          8'h70 : 
             begin
-              $display ("%t: OPCODE  : SBC   HL,DE", $time);
+              $display ("%t: OPCODE  : IN    F,(C)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h62 : 
+          8'h71 : 
             begin
-              $display ("%t: OPCODE  : SBC   HL,HL", $time);
+              $display ("%t: OPCODE  : OUT   (C),0", $time);
               state = { 4'd0, 4'd0 };
             end
           8'h72 : 
@@ -2177,555 +2396,546 @@ task decode1;
               $display ("%t: OPCODE  : SBC   HL,SP", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h46 : 
-            begin
-              $display ("%t: OPCODE  : IM    0", $time);
-              state = { 4'd0, 4'd0 };
-            end
-          8'h56 : 
+          8'h73 : 
             begin
-              $display ("%t: OPCODE  : IM    1", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    (word),SP", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'h5e : 
+          8'h78 : 
             begin
-              $display ("%t: OPCODE  : IM    2", $time);
+              $display ("%t: OPCODE  : IN    A,(C)", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h47 : 
+          8'h79 : 
             begin
-              $display ("%t: OPCODE  : LD    I,A", $time);
+              $display ("%t: OPCODE  : OUT   (C),A", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h44 : 
+          8'h7a : 
             begin
-              $display ("%t: OPCODE  : NEG   ", $time);
+              $display ("%t: OPCODE  : ADC   HL,SP", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h6f : 
+          8'h7b : 
             begin
-              $display ("%t: OPCODE  : RLD   ", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    SP,(word)", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'h67 : 
+          8'ha0 : 
             begin
-              $display ("%t: OPCODE  : RRD   ", $time);
+              $display ("%t: OPCODE  : LDI", $time);
               state = { 4'd0, 4'd0 };
             end
           8'ha1 : 
             begin
-              $display ("%t: OPCODE  : CPI   ", $time);
+              $display ("%t: OPCODE  : CPI", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hb1 : 
-            begin
-              $display ("%t: OPCODE  : CPIR  ", $time);
-              state = { 4'd0, 4'd0 };
-            end
-          8'ha9 : 
-            begin
-              $display ("%t: OPCODE  : CPD   ", $time);
-              state = { 4'd0, 4'd0 };
-            end
-          8'hb9 : 
+          8'ha2 : 
             begin
-              $display ("%t: OPCODE  : CPDR  ", $time);
+              $display ("%t: OPCODE  : INI", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h4d : 
+          8'ha3 : 
             begin
-              $display ("%t: OPCODE  : RETI  ", $time);
+              $display ("%t: OPCODE  : OUTI", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h45 : 
+          8'ha8 : 
             begin
-              $display ("%t: OPCODE  : RETN  ", $time);
+              $display ("%t: OPCODE  : LDD", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h78 : 
+          8'ha9 : 
             begin
-              $display ("%t: OPCODE  : IN    A,(C)", $time);
+              $display ("%t: OPCODE  : CPD", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h40 : 
+          8'haa : 
             begin
-              $display ("%t: OPCODE  : IN    B,(C)", $time);
+              $display ("%t: OPCODE  : IND", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h48 : 
-            begin
-              $display ("%t: OPCODE  : IN    C,(C)", $time);
-              state = { 4'd0, 4'd0 };
-            end
-          8'h50 : 
+          8'hab : 
             begin
-              $display ("%t: OPCODE  : IN    D,(C)", $time);
+              $display ("%t: OPCODE  : OUTD", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h58 : 
+          8'hb0 : 
             begin
-              $display ("%t: OPCODE  : IN    E,(C)", $time);
+              $display ("%t: OPCODE  : LDIR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h60 : 
+          8'hb1 : 
             begin
-              $display ("%t: OPCODE  : IN    H,(C)", $time);
+              $display ("%t: OPCODE  : CPIR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h68 : 
+          8'hb2 : 
             begin
-              $display ("%t: OPCODE  : IN    L,(C)", $time);
+              $display ("%t: OPCODE  : INIR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'ha2 : 
+          8'hb3 : 
             begin
-              $display ("%t: OPCODE  : INI   ", $time);
+              $display ("%t: OPCODE  : OTIR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hb2 : 
+          8'hb8 : 
             begin
-              $display ("%t: OPCODE  : INIR  ", $time);
+              $display ("%t: OPCODE  : LDDR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'haa : 
+          8'hb9 : 
             begin
-              $display ("%t: OPCODE  : IND   ", $time);
+              $display ("%t: OPCODE  : CPDR", $time);
               state = { 4'd0, 4'd0 };
             end
           8'hba : 
             begin
-              $display ("%t: OPCODE  : INDR  ", $time);
+              $display ("%t: OPCODE  : INDR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h79 : 
+          8'hbb : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),A", $time);
+              $display ("%t: OPCODE  : OTDR", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h41 : 
+        endcase
+      end // case: 8'hed
+
+    8'hfd : 
+      begin
+        case (opcode)
+          8'h09 : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),B", $time);
+              $display ("%t: OPCODE  : ADD   IY,BC", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h49 : 
+          8'h19 : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),C", $time);
+              $display ("%t: OPCODE  : ADD   IY,DE", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h51 : 
+          8'h21 : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),D", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IY,word", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'h59 : 
+          8'h22 : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),E", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    (word),IY", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'h61 : 
+          8'h23 : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),H", $time);
+              $display ("%t: OPCODE  : INC   IY", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h69 : 
+          8'h24 : 
             begin
-              $display ("%t: OPCODE  : OUT   (C),L", $time);
+              $display ("%t: OPCODE  : INC   IYH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'ha3 : 
+          8'h25 : 
             begin
-              $display ("%t: OPCODE  : OUTI  ", $time);
+              $display ("%t: OPCODE  : DEC   IYH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hb3 : 
+          8'h26 : 
             begin
-              $display ("%t: OPCODE  : OTIR  ", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IYH,byte", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'hab : 
+          8'h29 : 
             begin
-              $display ("%t: OPCODE  : OUTD  ", $time);
+              $display ("%t: OPCODE  : ADD   IY,IY", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hbb : 
+          8'h2a : 
             begin
-              $display ("%t: OPCODE  : OTDR  ", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IY,(word)", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'ha0 : 
+          8'h2b : 
             begin
-              $display ("%t: OPCODE  : LDI   ", $time);
+              $display ("%t: OPCODE  : DEC   IY", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hb0 : 
+          8'h2c : 
             begin
-              $display ("%t: OPCODE  : LDIR  ", $time);
+              $display ("%t: OPCODE  : INC   IYL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'ha8 : 
+          8'h2d : 
             begin
-              $display ("%t: OPCODE  : LDD   ", $time);
+              $display ("%t: OPCODE  : DEC   IYL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hb8 : 
+          8'h2e : 
             begin
-              $display ("%t: OPCODE  : LDDR  ", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    IYL,byte", $time);
+              state = { 4'd1, 4'd1 };
             end
-        endcase
-      end
-    8'hfd : 
-      begin
-        case (opcode)
-          8'h7e : 
+          8'h34 : 
             begin
-              $display ("%t: OPCODE  : LD    A,(IY+index)", $time);
+              $display ("%t: OPCODE  : INC   (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h46 : 
+          8'h35 : 
             begin
-              $display ("%t: OPCODE  : LD    B,(IY+index)", $time);
+              $display ("%t: OPCODE  : DEC   (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h4e : 
+          8'h36 : 
             begin
-              $display ("%t: OPCODE  : LD    C,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    (IY+index),byte", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'h56 : 
+          8'h39 : 
             begin
-              $display ("%t: OPCODE  : LD    D,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : ADD   IY,SP", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h5e : 
+          8'h44 : 
             begin
-              $display ("%t: OPCODE  : LD    E,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    B,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h66 : 
+          8'h45 : 
             begin
-              $display ("%t: OPCODE  : LD    H,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    B,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h6e : 
+          8'h46 : 
             begin
-              $display ("%t: OPCODE  : LD    L,(IY+index)", $time);
+              $display ("%t: OPCODE  : LD    B,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h77 : 
+          8'h4c : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),A", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    C,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h70 : 
+          8'h4d : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),B", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    C,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h71 : 
+          8'h4e : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),C", $time);
+              $display ("%t: OPCODE  : LD    C,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h72 : 
+          8'h54 : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),D", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    D,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h73 : 
+          8'h55 : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),E", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    D,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h74 : 
+          8'h56 : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),H", $time);
+              $display ("%t: OPCODE  : LD    D,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h75 : 
+          8'h5c : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),L", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    E,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h76 : 
+          8'h5d : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),byte", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    E,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h36 : 
+          8'h5e : 
             begin
-              $display ("%t: OPCODE  : LD    (IY+index),byte", $time);
+              $display ("%t: OPCODE  : LD    E,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h21 : 
+          8'h60 : 
             begin
-              $display ("%t: OPCODE  : LD    IY,word", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : LD    IYH,B", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h2a : 
+          8'h61 : 
             begin
-              $display ("%t: OPCODE  : LD    IY,(word)", $time);
-              state = { 4'd1, 4'd2 };
+              $display ("%t: OPCODE  : LD    IYH,C", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hf9 : 
+          8'h62 : 
             begin
-              $display ("%t: OPCODE  : LD    SP,IY", $time);
+              $display ("%t: OPCODE  : LD    IYH,D", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he3 : 
+          8'h63 : 
             begin
-              $display ("%t: OPCODE  : EX    (SP),IY", $time);
+              $display ("%t: OPCODE  : LD    IYH,E", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h86 : 
+          8'h64 : 
             begin
-              $display ("%t: OPCODE  : ADD   A,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    IYH,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h8e : 
+          8'h65 : 
             begin
-              $display ("%t: OPCODE  : ADC   A,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    IYH,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h96 : 
+          8'h66 : 
             begin
-              $display ("%t: OPCODE  : SUB   (IX+index)", $time);
+              $display ("%t: OPCODE  : LD    H,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'h9e : 
+          8'h67 : 
             begin
-              $display ("%t: OPCODE  : SBC   (IX+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    IYH,A", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h09 : 
+          8'h68 : 
             begin
-              $display ("%t: OPCODE  : ADD   IY,BC", $time);
+              $display ("%t: OPCODE  : LD    IYL,B", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h19 : 
+          8'h69 : 
             begin
-              $display ("%t: OPCODE  : ADD   IY,DE", $time);
+              $display ("%t: OPCODE  : LD    IYL,C", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h29 : 
+          8'h6a : 
             begin
-              $display ("%t: OPCODE  : ADD   IY,IY", $time);
+              $display ("%t: OPCODE  : LD    IYL,D", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h39 : 
+          8'h6b : 
             begin
-              $display ("%t: OPCODE  : ADD   IY,SP", $time);
+              $display ("%t: OPCODE  : LD    IYL,E", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'h34 : 
+          8'h6c : 
             begin
-              $display ("%t: OPCODE  : INC   (IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    IYL,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h35 : 
+          8'h6d : 
             begin
-              $display ("%t: OPCODE  : DEC   (IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    IYL,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'h23 : 
+          8'h6e : 
             begin
-              $display ("%t: OPCODE  : INC   IY", $time);
-              state = { 4'd0, 4'd0 };
+              $display ("%t: OPCODE  : LD    L,(IY+index)", $time);
+              state = { 4'd1, 4'd1 };
             end
-          8'h2b : 
+          8'h6f : 
             begin
-              $display ("%t: OPCODE  : DEC   IY", $time);
+              $display ("%t: OPCODE  : LD    IYL,A", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h70 : 
             begin
-              $display ("%t: OPCODE  : RLC   (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),B", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'h71 : 
             begin
-              $display ("%t: OPCODE  : RL    (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),C", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'h72 : 
             begin
-              $display ("%t: OPCODE  : RRC   (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),D", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'h73 : 
             begin
-              $display ("%t: OPCODE  : RL    (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),E", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'ha6 : 
+          8'h74 : 
             begin
-              $display ("%t: OPCODE  : AND   (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),H", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hae : 
+          8'h75 : 
             begin
-              $display ("%t: OPCODE  : XOR   (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),L", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hb6 : 
+          8'h77 : 
             begin
-              $display ("%t: OPCODE  : OR    (IY+index)", $time);
+              $display ("%t: OPCODE  : LD    (IY+index),A", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hbe : 
+          8'h7c : 
             begin
-              $display ("%t: OPCODE  : CP    (IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : LD    A,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'he9 : 
+          8'h7d : 
             begin
-              $display ("%t: OPCODE  : JP    (IY)", $time);
+              $display ("%t: OPCODE  : LD    A,IYL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he5 : 
+          8'h7e : 
             begin
-              $display ("%t: OPCODE  : PUSH  IY", $time);
+              $display ("%t: OPCODE  : LD    A,(IY+index)", $time);
+              state = { 4'd1, 4'd1 };
+            end
+          8'h84 : 
+            begin
+              $display ("%t: OPCODE  : ADD   A,IYH", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'he1 : 
+          8'h85 : 
             begin
-              $display ("%t: OPCODE  : POP   IY", $time);
+              $display ("%t: OPCODE  : ADD   A,IYL", $time);
               state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h86 : 
             begin
-              $display ("%t: OPCODE  : BIT   0,(IY+index)", $time);
+              $display ("%t: OPCODE  : ADD   A,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'h8c : 
             begin
-              $display ("%t: OPCODE  : BIT   1,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : ADC   A,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h8d : 
             begin
-              $display ("%t: OPCODE  : BIT   2,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : ADC   A,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h8e : 
             begin
-              $display ("%t: OPCODE  : BIT   3,(IY+index)", $time);
+              $display ("%t: OPCODE  : ADC   A,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'h94 : 
             begin
-              $display ("%t: OPCODE  : BIT   4,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SUB   IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h95 : 
             begin
-              $display ("%t: OPCODE  : BIT   5,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SUB   IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h96 : 
             begin
-              $display ("%t: OPCODE  : BIT   6,(IY+index)", $time);
+              $display ("%t: OPCODE  : SUB   (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'h9c : 
             begin
-              $display ("%t: OPCODE  : BIT   7,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SBC   A,IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h9d : 
             begin
-              $display ("%t: OPCODE  : RES   0,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : SBC   A,IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'h9e : 
             begin
-              $display ("%t: OPCODE  : RES   1,(IY+index)", $time);
+              $display ("%t: OPCODE  : SBC   A,(IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'ha4 : 
             begin
-              $display ("%t: OPCODE  : RES   2,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : AND   IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'ha5 : 
             begin
-              $display ("%t: OPCODE  : RES   3,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : AND   IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'ha6 : 
             begin
-              $display ("%t: OPCODE  : RES   4,(IY+index)", $time);
+              $display ("%t: OPCODE  : AND   (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'hac : 
             begin
-              $display ("%t: OPCODE  : RES   5,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : XOR   IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'had : 
             begin
-              $display ("%t: OPCODE  : RES   6,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : XOR   IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hae : 
             begin
-              $display ("%t: OPCODE  : RES   7,(IY+index)", $time);
+              $display ("%t: OPCODE  : XOR   (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'hb4 : 
             begin
-              $display ("%t: OPCODE  : SET   0,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OR    IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hb5 : 
             begin
-              $display ("%t: OPCODE  : SET   1,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : OR    IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hb6 : 
             begin
-              $display ("%t: OPCODE  : SET   2,(IY+index)", $time);
+              $display ("%t: OPCODE  : OR    (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
-          8'hcb : 
+          8'hbc : 
             begin
-              $display ("%t: OPCODE  : SET   3,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : CP    IYH", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hbd : 
             begin
-              $display ("%t: OPCODE  : SET   4,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : CP    IYL", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'hbe : 
             begin
-              $display ("%t: OPCODE  : SET   5,(IY+index)", $time);
+              $display ("%t: OPCODE  : CP    (IY+index)", $time);
               state = { 4'd1, 4'd1 };
             end
           8'hcb : 
             begin
-              $display ("%t: OPCODE  : SET   6,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : CB    (IY+index)", $time);
+              state = { 4'd1, 4'd2 };
             end
-          8'hcb : 
+          8'he1 : 
             begin
-              $display ("%t: OPCODE  : SET   7,(IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : POP   IY", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'he3 : 
             begin
-              $display ("%t: OPCODE  : SLA   (IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : EX    (SP),IY", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'he5 : 
             begin
-              $display ("%t: OPCODE  : SRA   (IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : PUSH  IY", $time);
+              state = { 4'd0, 4'd0 };
             end
-          8'hcb : 
+          8'he9 : 
             begin
-              $display ("%t: OPCODE  : SRL   (IY+index)", $time);
-              state = { 4'd1, 4'd1 };
+              $display ("%t: OPCODE  : JP    (IY)", $time);
+              state = { 4'd0, 4'd0 };
+            end
+          8'hf9 : 
+            begin
+              $display ("%t: OPCODE  : LD    SP,IY", $time);
+              state = { 4'd0, 4'd0 };
             end
         endcase
       end // case: 8'hfd
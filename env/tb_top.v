@@ -159,12 +159,36 @@ module tb_top;
   wire [7:0] nw_data_out;
   wire       nwintf_oe;
   
-  // loopback config
-  assign     rx_data = tx_data;
-  assign     rx_dv = tx_dv;
-  assign     rx_er = tx_er;
+  wire [7:0] stim_data;
+  wire       stim_dv, stim_er, stim_en, stim_done;
+
+  // loopback config, unless a stimulus file is given with
+  // +GMII_RX_FILE (see env/gmii_stim.v)
+  assign     rx_data = (stim_en) ? stim_data : tx_data;
+  assign     rx_dv = (stim_en) ? stim_dv : tx_dv;
+  assign     rx_er = (stim_en) ? stim_er : tx_er;
   assign     rx_clk = tx_clk;
 
+  gmii_stim nw_stim
+    (.rx_clk  (rx_clk),
+     .reset   (!reset_n),
+     .enable  (stim_en),
+     .done    (stim_done),
+     .rx_data (stim_data),
+     .rx_dv   (stim_dv),
+     .rx_er   (stim_er));
+
+  gmii_capture nw_capture
+    (.tx_clk  (tx_clk),
+     .tx_data (tx_data),
+     .tx_dv   (tx_dv),
+     .tx_er   (tx_er));
+
+  // instruction decode trace tasks, called from inst_decode below.  An
+  // instance rather than a separate root module, so that backends
+  // which elaborate only tb_top still bind the calls.
+  op_decode op_decode ();
+
   assign     di = (nwintf_oe) ? nw_data_out : 8'bz;
 
   simple_gmii_top nwintf
@@ -196,6 +220,14 @@ module tb_top;
   // Global Initialization
   //----------------------------------------------------------------------
   
+  // Program images, dump settings and tracing can be given either as
+  // compile-time defines or as run-time plusargs (+PROGRAM_FILE=...,
+  // +ROM_FILE=..., +RAM_FILE=..., +DUMP_START=..., +TRACE), so that a
+  // compiled testbench can be reused for every test.
+  reg [8*256-1:0] image_file;
+  integer         dump_start;
+  reg             trace_enable;
+  
    initial
     begin
       clear_ram;
@@ -204,19 +236,45 @@ module tb_top;
       int_n  = 1;
       nmi_n  = 1;
       busrq_n = 1;
-      $readmemh (`PROGRAM_FILE,  tb_top.rom.mem);
+      if ($value$plusargs ("PROGRAM_FILE=%s", image_file))
+        $readmemh (image_file,  tb_top.rom.mem);
+`ifdef PROGRAM_FILE
+      else
+        $readmemh (`PROGRAM_FILE,  tb_top.rom.mem);
+`endif
+      if ($value$plusargs ("ROM_FILE=%s", image_file))
+        $readmemh (image_file,  tb_top.rom.mem);
+`ifdef ROM_FILE
+      else
+        $readmemh (`ROM_FILE,  tb_top.rom.mem);
+`endif
+      if ($value$plusargs ("RAM_FILE=%s", image_file))
+        $readmemh (image_file,  tb_top.ram.mem);
+`ifdef RAM_FILE
+      else
+        $readmemh (`RAM_FILE,  tb_top.ram.mem);
+`endif
       repeat (20) @(negedge clk);
       reset_n = 1;
     end // initial begin
 
-`ifdef DUMP_START
-  always
+  initial
     begin
-      if ($time > `DUMP_START)
-	dumpon;
-      #100;
-    end
+`ifdef DUMP_START
+      dump_start = `DUMP_START;
+`else
+      dump_start = -1;
 `endif
+      if ($value$plusargs ("DUMP_START=%d", dump_start))
+        $display ("%t: INFO    : dumping from time %0d", $time, dump_start);
+      if (dump_start >= 0)
+        forever
+          begin
+            if ($time > dump_start)
+	      dumpon;
+            #100;
+          end
+    end
   
   
 /*
@@ -230,14 +288,22 @@ module tb_top;
     end
   */
       
-`ifdef TV80_INSTRUCTION_DECODE
   reg [7:0] state;
   initial
-    state = 0;
+    begin
+      state = 0;
+`ifdef TV80_INSTRUCTION_DECODE
+      trace_enable = 1;
+`else
+      trace_enable = $test$plusargs ("TRACE");
+`endif
+    end
      
   always @(posedge clk)
     begin : inst_decode
-      if ((`TV80_CORE_PATH.mcycle[6:0] == 1) && 
+      if (!trace_enable)
+        state = 0;
+      else if ((`TV80_CORE_PATH.mcycle[6:0] == 1) && 
           (`TV80_CORE_PATH.tstate[6:0] == 8))
         begin
           op_decode.decode (`TV80_CORE_PATH.IR[7:0], state);
@@ -245,7 +311,6 @@ module tb_top;
       else if (`TV80_CORE_PATH.mcycle[6:0] != 1)
         state = 0;
     end
-`endif
   
 `include "env_tasks.v"
   
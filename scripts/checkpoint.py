@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Checkpoint fast-forward.
+#
+# The z80sim ISS runs a test program up to a chosen PC (an address or
+# a symbol, optionally on its nth visit) or instruction count.  The
+# memory at that point is written as ROM and RAM vmem images for
+# tb_top, through mem_image.  A restore stub is added in unused ROM
+# and the reset vector at 0000 jumps to it.  The stub restores the
+# environment ports, the alternate and main registers, IX, IY, I, R,
+# SP, the interrupt mode and enable, the pending interrupt countdown
+# or interrupt line, and a partly printed message, and then jumps to
+# the checkpoint PC.  Run the images with scripts/run -c <prefix>, which passes them
+# as +PROGRAM_FILE and +RAM_FILE.
+#
+# The three bytes at 0000 are replaced by the jump to the stub, so a
+# program that returns to 0000 after the checkpoint restarts the stub.
+# The timeout counter restarts from zero, and IFF2 is restored as
+# equal to IFF1.
+
+import sys, os, getopt
+import mem_image, z80sim, z80prof
+from z80sim import A, F, B, C, D, E, H, L
+
+# Run until pc has been reached hits times, or instructions have been
+# executed.  Returns 1 at the checkpoint, 0 if the test ended (or
+# max_cycles passed) first.
+def run_to (cpu, env, pc=None, hits=1, instructions=None, max_cycles=10000000):
+    env.clock (20)
+    while (env.status == None) and (cpu.cycles < max_cycles):
+        if (pc != None) and (cpu.pc == pc) and not cpu.halted:
+            hits -= 1
+            if (hits == 0): return 1
+        if (instructions != None) and (cpu.instructions >= instructions):
+            return 1
+        z80sim.tick (cpu, env)
+    return 0
+
+def word (v):
+    return [v & 0xff, (v >> 8) & 0xff]
+
+# clocks of out (n),a and of the stub code after it: pop af, ld sp,nn,
+# ei and jp nn
+def int_delay (cpu):
+    return 11 + 30 + (cpu.iff1 and 4)
+
+# Value for port 90 that raises the interrupt line as many clocks after
+# the checkpoint PC as in the original run.  Countdowns longer than the
+# port allows are cut to 255 (the interrupt comes early).
+def int_countdown (cpu, env):
+    if env.int_countdown:
+        return min (env.int_countdown + int_delay (cpu), 255)
+    if env.int_line:
+        return 1
+    return 0
+
+# Z80 code restoring the state of cpu and env, assembled at addr
+def restore_stub (cpu, env, addr):
+    r = cpu.r
+    alt = cpu.alt
+    code = []
+    # partly printed message, sent before the timeout counter restarts
+    for c in env.msg:
+        code.extend ([0x3e, ord (c), 0xd3, 0x81])
+    for (port, val) in ((0x83, env.max_timeout & 0xff), (0x84, env.max_timeout >> 8),
+                        (0x91, env.checksum), (0x93, env.ior_value),
+                        (0x82, env.timeout_ctl | 2), (0x82, env.timeout_ctl)):
+        code.extend ([0x3e, val, 0xd3, port])          # ld a,n; out (n),a
+    patch = len (code) + 1
+    code.extend ([0x31, 0, 0])                          # ld sp,data
+    code.append (0xf1)                                  # pop af
+    code.extend ([0x01, alt[C], alt[B]])                # ld bc,nn
+    code.extend ([0x11, alt[E], alt[D]])                # ld de,nn
+    code.extend ([0x21, alt[L], alt[H]])                # ld hl,nn
+    code.extend ([0x08, 0xd9])                          # ex af,af'; exx
+    code.extend ([0xdd, 0x21] + word (cpu.ix))          # ld ix,nn
+    code.extend ([0xfd, 0x21] + word (cpu.iy))          # ld iy,nn
+    code.extend ([0x3e, cpu.i, 0xed, 0x47])             # ld a,n; ld i,a
+    code.extend ([0xed, [0x46, 0x56, 0x5e][cpu.im]])    # im n
+    countdown = int_countdown (cpu, env)
+    # R counts the M1 cycles of the instructions after ld r,a
+    m1 = 6 + (cpu.iff1 and 1) + (countdown and 2)
+    rr = (cpu.rr & 0x80) | ((cpu.rr - m1) & 0x7f)
+    code.extend ([0x3e, rr, 0xed, 0x4f])                # ld a,n; ld r,a
+    code.extend ([0x01, r[C], r[B]])
+    code.extend ([0x11, r[E], r[D]])
+    code.extend ([0x21, r[L], r[H]])
+    # the countdown starts as late as possible, see int_delay
+    if countdown:
+        code.extend ([0x3e, countdown, 0xd3, 0x90])
+    code.append (0xf1)                                  # pop af
+    code.extend ([0x31] + word (cpu.sp))                # ld sp,nn
+    if cpu.iff1:
+        code.append (0xfb)                              # ei
+    pc = cpu.pc
+    if cpu.halted:
+        pc = (pc - 1) & 0xffff                          # back onto the halt
+    code.extend ([0xc3] + word (pc))                    # jp nn
+    code[patch:patch+2] = word (addr + len (code))
+    code.extend ([alt[F], alt[A], r[F], r[A]])          # pop af data
+    return bytearray (code)
+
+# highest unused block of size bytes in start..stop of image
+def free_space (image, size, start=0x0100, stop=0x7fff):
+    end = stop + 1
+    for (s, e) in reversed (image.extents (start, stop)):
+        if (end - e >= size):
+            return end - size
+        end = s
+    if (end - start >= size):
+        return end - size
+    return None
+
+def load_image (filename):
+    image = mem_image.mem_image()
+    if filename.endswith (".ihx") or filename.endswith (".hex"):
+        image.load_ihex (filename)
+    else:
+        image.load_vmem (filename)
+    return image
+
+# Write the checkpoint as <prefix>_rom.vmem and <prefix>_ram.vmem.
+# Returns the address of the restore stub.
+def save (cpu, env, rom_image, prefix, stub_addr=None):
+    if (cpu.pc < 3):
+        raise ValueError, "checkpoint at %04x overlaps the reset vector" % cpu.pc
+    if (stub_addr == None):
+        stub_addr = free_space (rom_image, len (restore_stub (cpu, env, 0)))
+        if (stub_addr == None):
+            raise ValueError, "no room in ROM for the restore stub"
+    image = mem_image.mem_image()
+    for (addr, chunk) in rom_image.chunks (0, 0x7fff):
+        image.write (addr, chunk)
+    image.write (stub_addr, restore_stub (cpu, env, stub_addr))
+    image.write (0, bytearray ([0xc3] + word (stub_addr)))
+    image.write (0x8000, cpu.mem[0x8000:])
+    regions = dict ([(r[0], r) for r in mem_image.default_regions])
+    image.save_regions ([(regions['rom'][1], regions['rom'][2], prefix + "_rom.vmem"),
+                         (regions['ram'][1], regions['ram'][2], prefix + "_ram.vmem")],
+                        format='dense')
+    return stub_addr
+
+def describe (cpu, env, symbols=None):
+    r = cpu.r
+    alt = cpu.alt
+    pc = "%04x" % cpu.pc
+    if symbols: pc = "%s (%s)" % (pc, symbols.label (cpu.pc))
+    return "\n".join (["pc %s after %d instructions, %d cycles" % (pc, cpu.instructions, cpu.cycles),
+                       "AF=%02x%02x BC=%02x%02x DE=%02x%02x HL=%02x%02x" % (r[A], r[F], r[B], r[C], r[D], r[E], r[H], r[L]),
+                       "AF'=%02x%02x BC'=%02x%02x DE'=%02x%02x HL'=%02x%02x" % (alt[A], alt[F], alt[B], alt[C], alt[D], alt[E], alt[H], alt[L]),
+                       "IX=%04x IY=%04x SP=%04x I=%02x R=%02x IM %d IFF %d%s" %
+                       (cpu.ix, cpu.iy, cpu.sp, cpu.i, cpu.rr, cpu.im, cpu.iff1, cpu.halted and " halted" or "")]) + "\n"
+
+def print_help ():
+    print "Usage: checkpoint.py (-p pc [-n hits] | -i count) [-o prefix] [-s addr] [-v] <image>"
+    print "  -p : checkpoint at this PC (hex address or symbol)"
+    print "  -n : on the nth time the PC is reached (default 1)"
+    print "  -i : checkpoint after this many instructions"
+    print "  -o : output prefix (default <image>_ckpt)"
+    print "  -s : restore stub address (default: highest free ROM)"
+    print "  -c : give up after this many clocks (default 10000000)"
+    print "  -v : run the checkpoint in the ISS to completion as a check"
+    print "  -h : option help (this list)"
+    print "Writes <prefix>_rom.vmem and <prefix>_ram.vmem."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hp:n:i:o:s:c:v")
+    pc = None
+    hits = 1
+    instructions = None
+    prefix = None
+    stub_addr = None
+    max_cycles = 10000000
+    verify = 0
+    for option in options:
+        if option[0] == "-p":
+            pc = option[1]
+        elif option[0] == "-n":
+            hits = int (option[1])
+        elif option[0] == "-i":
+            instructions = int (option[1])
+        elif option[0] == "-o":
+            prefix = option[1]
+        elif option[0] == "-s":
+            stub_addr = int (option[1], 16)
+        elif option[0] == "-c":
+            max_cycles = int (option[1])
+        elif option[0] == "-v":
+            verify = 1
+        else:
+            print_help()
+    if (len(args) != 1) or ((pc == None) and (instructions == None)):
+        print_help()
+    if (prefix == None):
+        prefix = os.path.splitext (args[0])[0] + "_ckpt"
+
+    symbols = None
+    symfile = z80prof.find_symbols (args[0])
+    if symfile:
+        symbols = z80prof.symbol_table().load (symfile)
+    if (pc != None):
+        addr = symbols and symbols.address (pc)
+        if (addr == None):
+            try:
+                addr = int (pc, 16)
+            except ValueError:
+                print "ERROR: unknown symbol %s" % pc
+                sys.exit (1)
+        pc = addr
+
+    (cpu, env) = z80sim.load_system (args[0])
+    if not run_to (cpu, env, pc, hits, instructions, max_cycles):
+        print "ERROR: test ended (%s) before the checkpoint" % env.status
+        sys.exit (1)
+    stub_addr = save (cpu, env, load_image (args[0]), prefix, stub_addr)
+    sys.stdout.write (describe (cpu, env, symbols))
+    print "restore stub at %04x" % stub_addr
+    if (env.int_countdown + int_delay (cpu) > 255):
+        print "WARNING : interrupt countdown %d cut to 255, the interrupt comes %d clocks early" % \
+              (env.int_countdown, env.int_countdown + int_delay (cpu) - 255)
+    print "wrote %s_rom.vmem %s_ram.vmem" % (prefix, prefix)
+    print "run with: scripts/run -c %s <testname>" % prefix
+
+    if verify:
+        (cpu, env) = z80sim.load_system (prefix + "_rom.vmem", prefix + "_ram.vmem")
+        status = z80sim.run (cpu, env, max_cycles)
+        print "checkpoint run: %s after %d instructions" % (status, cpu.instructions)
+        if (status != "passed"):
+            sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Generate env/op_decode.v, the instruction decode trace of tb_top,
+# from the opcode table.
+
+import sys, getopt
+import op_table
+
+header = """/*
+ * Z80 instruction decoder
+ * Author: Guy Hutchison
+ *
+ * Generated from %s by scripts/gen_op_decode.py; do not edit.
+ */
+
+module op_decode;
+"""
+
+footer = """  task decode;
+    input [7:0] byte;
+    inout [7:0] state;
+    begin
+      if (state == 0)
+        decode0 (byte, state);
+      else if (state[7:4] == 1)
+        begin
+          state[3:0] = state[3:0] - 1;
+          if (state[3:0] == 0)
+            state[7:0] = 0;
+        end
+      else
+        begin
+          decode1 (byte, state);
+        end
+    end
+  endtask // decode
+  
+endmodule // op_decode
+"""
+
+def display (text, indent):
+    return "%s$display (\"%%t: OPCODE  : %s\", $time);" % (indent, text)
+
+# case items for one page; prefixed pages always set the state so the
+# prefix does not carry over to the next opcode
+def case_items (table, page, indent):
+    out = []
+    for code in range (256):
+        if (table.get (page, code) == None):
+            continue
+        (text, state) = table.lookup (page, code)
+        item = "%s8'h%02x : " % (indent, code)
+        if (text == None):
+            out.append ("%sstate = 8'h%02x;" % (item, state))
+        elif (state == 0) and (page == 0):
+            out.append (item + display (text, ""))
+        else:
+            out.append (item)
+            out.append (indent + "  begin")
+            out.append (display (text, indent + "    "))
+            out.append ("%s    state = { 4'd%d, 4'd%d };" % (indent, state >> 4, state & 15))
+            out.append (indent + "  end")
+    return out
+
+def generate (table, source=op_table.table_file):
+    lines = [header % source]
+    lines.append ("task decode0;")
+    lines.append ("  input [7:0] opcode;")
+    lines.append ("  inout [7:0] state;")
+    lines.append ("  begin")
+    lines.append ("  case (opcode)")
+    lines.extend (case_items (table, 0, "    "))
+    lines.append ("  endcase")
+    lines.append ("  end")
+    lines.append ("endtask")
+    lines.append ("task decode1;")
+    lines.append ("  input [7:0] opcode;")
+    lines.append ("  inout [7:0] state;")
+    lines.append ("  begin")
+    lines.append ("  casex (state)")
+    for page in (0xcb, 0xdd, 0xed, 0xfd):
+        lines.append ("    8'h%02x : " % page)
+        lines.append ("      begin")
+        lines.append ("        case (opcode)")
+        lines.extend (case_items (table, page, "          "))
+        lines.append ("        endcase")
+        lines.append ("      end // case: 8'h%02x" % page)
+        lines.append ("")
+    lines.append ("    default :")
+    lines.append ("      begin")
+    lines.append ("        $display (\"%t: OPCODE  : Unknown opcode %x\", $time, opcode);")
+    lines.append ("      end")
+    lines.append ("  endcase")
+    lines.append ("  end")
+    lines.append ("endtask")
+    lines.append ("")
+    return "\n".join (lines) + "\n" + footer
+
+def print_help ():
+    print "Usage: gen_op_decode.py [-h] [-f table] [-o file]"
+    print "  -f : opcode table (default %s)" % op_table.table_file
+    print "  -o : output file (default env/op_decode.v)"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hf:o:")
+    table_file = op_table.table_file
+    outfile = "env/op_decode.v"
+    for option in options:
+        if option[0] == "-f":
+            table_file = option[1]
+        elif option[0] == "-o":
+            outfile = option[1]
+        else:
+            print_help()
+    if len(args) != 0:
+        print_help()
+
+    table = op_table.load (table_file)
+    open (outfile, "w").write (generate (table, table_file))
+
+if __name__ == '__main__':
+    cmdline()
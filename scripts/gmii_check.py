@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# GMII transmit checker for simple_gmii.
+#
+# Reads the words captured by gmii_capture in env/gmii_stim.v (or a
+# stimulus file written by gmii_gen.py) and splits them back into
+# frames: each run of cycles with tx_dv or tx_er high is one frame.
+# The preamble and SFD are stripped and the FCS is checked.  Frames
+# with an error cycle, a bad FCS, a missing SFD or a length outside
+# 64..1518 bytes are counted.  Given the expected frames (a pcap file
+# or a stimulus file), the received frames are compared in order.
+#
+# The capture is read in large blocks, and the words of a block are
+# unpacked and split into frames with string operations, so the cost
+# per cycle stays in C code.
+
+import sys, re, zlib, struct, binascii, getopt, itertools
+import gmii_gen
+
+read_size = 1 << 22
+run_re = re.compile ('[^\x00]+')
+strip_chars = ' \t\r\n'
+
+# (flags, data) byte strings for the words of a file, one block at a
+# time.  Comments and address lines are not expected and are skipped.
+def read_blocks (filename):
+    fh = open (filename, "rb")
+    rest = ''
+    while 1:
+        buf = fh.read (read_size)
+        if not buf:
+            break
+        buf = rest + buf
+        cut = buf.rfind ('\n') + 1
+        if (cut == 0):
+            rest = buf
+            continue
+        (buf, rest) = (buf[:cut], buf[cut:])
+        if ('@' in buf) or ('/' in buf):
+            buf = '\n'.join ([l for l in buf.split ('\n') if l[:1] not in ('@', '/')])
+        hex = buf.translate (None, strip_chars)
+        raw = binascii.unhexlify (hex)
+        yield (raw[0::2], raw[1::2])
+    fh.close()
+    if rest.strip():
+        raw = binascii.unhexlify (rest.translate (None, strip_chars))
+        yield (raw[0::2], raw[1::2])
+
+# (data, error) for each frame on the wire, preamble included.  A
+# frame is in error when any of its cycles has tx_er set.  A frame
+# running to the end of a block is joined with the start of the next.
+def wire_frames (filename):
+    pending = None
+    for (flags, data) in read_blocks (filename):
+        if pending and (flags[:1] in ('', '\x00')):
+            yield pending
+            pending = None
+        for m in run_re.finditer (flags):
+            (s, e) = m.span()
+            frame = (data[s:e], m.group().replace ('\x01', '') != '')
+            if pending:
+                frame = (pending[0] + frame[0], pending[1] or frame[1])
+                pending = None
+            if (e == len (flags)):
+                pending = frame
+            else:
+                yield frame
+    if pending:
+        yield pending
+
+class frame_stats:
+    def __init__ (self):
+        self.frames = 0
+        self.good = 0
+        self.bytes = 0
+        self.rx_errors = 0
+        self.sfd_errors = 0
+        self.fcs_errors = 0
+        self.runts = 0
+        self.giants = 0
+
+    def report (self, fh=sys.stdout):
+        for name in ("frames", "good", "bytes", "rx_errors", "sfd_errors",
+                     "fcs_errors", "runts", "giants"):
+            fh.write ("%-12s %d\n" % (name, getattr (self, name)))
+
+# Decode the frames of a capture.  Yields each frame without preamble
+# and FCS, with a status string that is 'ok' for a good frame.
+def frames (filename, use_preamble=1, check_fcs=1, stats=None):
+    stats = stats or frame_stats()
+    for (data, error) in wire_frames (filename):
+        stats.frames += 1
+        status = 'ok'
+        if use_preamble:
+            body = data.lstrip ('\x55')
+            if (body[:1] != '\xd5'):
+                status = 'sfd'
+                stats.sfd_errors += 1
+            data = body[1:]
+        stats.bytes += len (data)
+        if error:
+            status = 'rx_er'
+            stats.rx_errors += 1
+        if check_fcs:
+            if (len (data) < 4) or (gmii_gen.fcs (data[:-4]) != data[-4:]):
+                if (status == 'ok'): status = 'fcs'
+                stats.fcs_errors += 1
+            frame = data[:-4]
+        else:
+            frame = data
+        if (len (data) < gmii_gen.min_frame):
+            stats.runts += 1
+            if (status == 'ok'): status = 'runt'
+        elif (len (data) > gmii_gen.max_frame):
+            stats.giants += 1
+            if (status == 'ok'): status = 'giant'
+        if (status == 'ok'):
+            stats.good += 1
+        yield (frame, status)
+
+# the sequence number gmii_gen.py puts in generated frames, or None
+def sequence (frame):
+    if (frame[:len (gmii_gen.header)] != gmii_gen.header) or (len (frame) < gmii_gen.header_size):
+        return None
+    return struct.unpack (">I", frame[len (gmii_gen.header):gmii_gen.header_size])[0]
+
+def expected_frames (filename, use_preamble=1):
+    if filename.endswith (".pcap"):
+        return gmii_gen.read_pcap (filename)
+    return (f for (f, status) in frames (filename, use_preamble))
+
+# Compare received frames with the expected ones, in order.  Returns
+# (matched, mismatched, missing, extra) and writes up to max_report
+# differences to fh.
+def compare (received, expected, fh=sys.stdout, max_report=10):
+    counts = [0, 0, 0, 0]
+    for (n, (got, exp)) in enumerate (itertools.izip_longest (received, expected)):
+        if (got == None):
+            kind = 2
+        elif (exp == None):
+            kind = 3
+        elif (got[0] == exp):
+            kind = 0
+        else:
+            kind = 1
+        counts[kind] += 1
+        if kind and (sum (counts[1:]) <= max_report):
+            desc = ["", "mismatch", "missing", "extra"][kind]
+            if got: seq = sequence (got[0])
+            else: seq = sequence (exp)
+            fh.write ("frame %d: %s (sequence %s)\n" % (n, desc, seq))
+    return tuple (counts)
+
+def print_help ():
+    print "Usage: gmii_check.py [-n] [-f] [-e expected] [-k pcap] <capture>"
+    print "  -e : compare with expected frames (pcap, or a gmii_gen.py stimulus file)"
+    print "  -n : frames are sent without preamble and SFD"
+    print "  -f : frames carry no FCS"
+    print "  -k : write the received frames to a pcap file"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hnfe:k:")
+    use_preamble = 1
+    check_fcs = 1
+    expected = None
+    pcap_out = None
+    for option in options:
+        if option[0] == "-n":
+            use_preamble = 0
+        elif option[0] == "-f":
+            check_fcs = 0
+        elif option[0] == "-e":
+            expected = option[1]
+        elif option[0] == "-k":
+            pcap_out = option[1]
+        else:
+            print_help()
+    if len(args) != 1:
+        print_help()
+
+    stats = frame_stats()
+    received = frames (args[0], use_preamble, check_fcs, stats)
+    if pcap_out:
+        pcap = gmii_gen.pcap_writer (pcap_out)
+        received = pcap_tee (received, pcap)
+    failed = 0
+    if expected:
+        (matched, mismatched, missing, extra) = \
+            compare (received, expected_frames (expected, use_preamble))
+        print "matched %d, mismatched %d, missing %d, extra %d" % (matched, mismatched, missing, extra)
+        failed = mismatched or missing or extra
+    else:
+        for f in received:
+            pass
+    if pcap_out:
+        pcap.close()
+    stats.report()
+    if failed or (stats.good != stats.frames):
+        sys.exit (1)
+
+def pcap_tee (received, pcap):
+    for batch in gmii_gen.batches (received):
+        pcap.write ([f for (f, status) in batch])
+        for item in batch:
+            yield item
+
+if __name__ == '__main__':
+    cmdline()
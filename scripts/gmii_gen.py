@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# GMII packet stimulus for simple_gmii.
+#
+# Frames come from a pcap file, or from the random and size sweep
+# generators, and are encoded into the word stream played by
+# env/gmii_stim.v: one 16 bit word per rx_clk cycle holding
+# {6'b0, rx_er, rx_dv, rx_data}.  Each frame is sent as preamble, SFD,
+# the frame and its FCS with rx_dv high, then ifg idle cycles.
+#
+# Frames are handled in batches.  A batch is encoded with string
+# joins and extended slice assignments on bytearrays, and the FCS is
+# computed by zlib, so no Python code runs per byte or per word and
+# runs of a million frames are practical.  Output is written batch by
+# batch, so memory use does not grow with the number of frames.
+#
+# Generated frames carry a sequence number after the Ethernet header,
+# which gmii_check.py uses to report lost and reordered frames.
+
+import os, sys, struct, zlib, random, binascii, getopt, time
+
+preamble = '\x55' * 7 + '\xd5'
+min_frame = 64
+max_frame = 1518
+header = '\x02\x00\x00\x00\x00\x01' + '\x02\x00\x00\x00\x00\x02' + '\x88\xb5'
+header_size = len (header) + 4
+batch_size = 1024
+# words in the gmii_stim memory (its depth parameter)
+stim_depth = 1048576
+
+flag_dv = 1
+flag_er = 2
+
+def fcs (frame):
+    return struct.pack ("<I", zlib.crc32 (frame) & 0xffffffff)
+
+# group an iterable of frames into lists of batch_size
+def batches (frames, size=batch_size):
+    batch = []
+    for f in frames:
+        batch.append (f)
+        if (len (batch) == size):
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+#------------------------------------------------------------------
+# pcap files
+
+pcap_magic = 0xa1b2c3d4
+pcap_magic_ns = 0xa1b23c4d
+
+# frames of a pcap file, without their FCS
+def read_pcap (filename):
+    fh = open (filename, "rb")
+    head = fh.read (24)
+    for order in ("<", ">"):
+        (magic,) = struct.unpack (order + "I", head[:4])
+        if magic in (pcap_magic, pcap_magic_ns):
+            break
+    else:
+        raise IOError, "%s: not a pcap file" % filename
+    rec_fmt = order + "IIII"
+    while 1:
+        rec = fh.read (16)
+        if (len (rec) < 16):
+            break
+        (sec, frac, incl_len, orig_len) = struct.unpack (rec_fmt, rec)
+        yield fh.read (incl_len)
+    fh.close()
+
+class pcap_writer:
+    def __init__ (self, filename):
+        self.fh = open (filename, "wb")
+        self.fh.write (struct.pack ("<IHHiIII", pcap_magic, 2, 4, 0, 0, 65535, 1))
+        self.count = 0
+
+    def write (self, frames):
+        parts = []
+        for f in frames:
+            parts.append (struct.pack ("<IIII", self.count / 1000000, self.count % 1000000,
+                                       len (f), len (f)))
+            parts.append (f)
+            self.count += 1
+        self.fh.write (''.join (parts))
+
+    def close (self):
+        self.fh.close()
+
+#------------------------------------------------------------------
+# frame generators; sizes include the 4 byte FCS
+
+def make_frames (seq, sizes, rng):
+    total = sum (sizes) - len (sizes) * (header_size + 4)
+    if (total > 0):
+        payload = binascii.unhexlify ("%0*x" % (total * 2, rng.getrandbits (total * 8)))
+    else:
+        payload = ''
+    frames = []
+    pos = 0
+    for size in sizes:
+        n = size - header_size - 4
+        frames.append (header + struct.pack (">I", seq) + payload[pos:pos+n])
+        pos += n
+        seq += 1
+    return frames
+
+# count frames of random size between min_size and max_size
+def random_frames (count, min_size=min_frame, max_size=max_frame, seed=1):
+    rng = random.Random (seed)
+    min_size = max (min_size, header_size + 4)
+    seq = 0
+    while (seq < count):
+        n = min (batch_size, count - seq)
+        sizes = [rng.randint (min_size, max_size) for i in xrange (n)]
+        for f in make_frames (seq, sizes, rng):
+            yield f
+        seq += n
+
+# count frames of each size from min_size to max_size in steps of step
+def sweep_frames (min_size=min_frame, max_size=max_frame, step=1, count=1, seed=1):
+    rng = random.Random (seed)
+    min_size = max (min_size, header_size + 4)
+    sizes = []
+    for size in xrange (min_size, max_size + 1, step):
+        sizes.extend ([size] * count)
+    for start in xrange (0, len (sizes), batch_size):
+        for f in make_frames (start, sizes[start:start+batch_size], rng):
+            yield f
+
+#------------------------------------------------------------------
+# GMII encoding
+
+# Encode a batch of frames (without FCS) into per-cycle data and flag
+# bytes.  A fraction er_rate of the frames has rx_er raised on one
+# cycle.
+def encode (frames, ifg=12, use_preamble=1, er_rate=0.0, rng=None):
+    pre = use_preamble and preamble or ''
+    gap = '\0' * ifg
+    data = []
+    flags = []
+    for f in frames:
+        n = len (pre) + len (f) + 4
+        data.extend ((pre, f, fcs (f), gap))
+        flags.append ('\x01' * n + gap)
+    data = bytearray (''.join (data))
+    flags = bytearray (''.join (flags))
+    if (er_rate > 0):
+        rng = rng or random.Random()
+        pos = 0
+        for f in frames:
+            n = len (pre) + len (f) + 4
+            if (rng.random() < er_rate):
+                flags[pos + rng.randrange (n)] |= flag_er
+            pos += n + ifg
+    return (data, flags)
+
+# one hex word per line: flags byte then data byte
+def words (data, flags):
+    n = len (data)
+    fhex = binascii.hexlify (flags)
+    dhex = binascii.hexlify (data)
+    out = bytearray ('\n') * (n * 5)
+    out[0::5] = fhex[0::2]
+    out[1::5] = fhex[1::2]
+    out[2::5] = dhex[0::2]
+    out[3::5] = dhex[1::2]
+    return out
+
+# Raised when the stream no longer fits in depth words; gmii_stim
+# would play only the first depth cycles of it.
+class depth_error (Exception):
+    pass
+
+class stream_writer:
+    def __init__ (self, filename, ifg=12, use_preamble=1, er_rate=0.0, seed=1,
+                  depth=stim_depth):
+        self.filename = filename
+        if (filename == '-'): self.fh = sys.stdout
+        else: self.fh = open (filename, "wb")
+        self.ifg = ifg
+        self.use_preamble = use_preamble
+        self.er_rate = er_rate
+        self.rng = random.Random (seed)
+        self.frames = 0
+        self.bytes = 0
+        self.cycles = 0
+        self.depth = depth
+
+    def write (self, frames):
+        (data, flags) = encode (frames, self.ifg, self.use_preamble, self.er_rate, self.rng)
+        if (self.depth and self.cycles + len (data) > self.depth):
+            raise depth_error, "stream exceeds the stimulus depth of %d cycles" % self.depth
+        self.fh.write (words (data, flags))
+        self.frames += len (frames)
+        self.bytes += sum ([len (f) + 4 for f in frames])
+        self.cycles += len (data)
+
+    def close (self):
+        if (self.fh != sys.stdout):
+            self.fh.close()
+
+    # drop a partly written file
+    def discard (self):
+        self.close()
+        if (self.fh != sys.stdout):
+            os.remove (self.filename)
+
+def parse_range (arg, fields):
+    values = [int (v) for v in arg.split (":")]
+    return values + [None] * (fields - len (values))
+
+def print_help ():
+    print "Usage: gmii_gen.py [-p pcap | -r count | -w min:max[:step]] [options] -o <vmem>"
+    print "  -p : frames from a pcap file (an FCS is added to each)"
+    print "  -r : count random frames"
+    print "  -w : size sweep from min to max bytes"
+    print "  -c : frames of each size in a sweep (default 1)"
+    print "  -s : min:max size of random frames (default %d:%d)" % (min_frame, max_frame)
+    print "  -i : inter-frame gap in cycles (default 12)"
+    print "  -n : no preamble or SFD"
+    print "  -e : fraction of frames sent with rx_er raised"
+    print "  -x : random seed (default 1)"
+    print "  -k : also write the frames to a pcap file"
+    print "  -m : depth of the gmii_stim memory in cycles (default %d, 0 for no limit)" % stim_depth
+    print "  -o : stimulus file for env/gmii_stim.v ('-' for stdout)"
+    print "  -h : option help (this list)"
+    print "Sizes include the 4 byte FCS."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hp:r:w:c:s:i:ne:x:k:m:o:")
+    frames = None
+    count = 1
+    sizes = (min_frame, max_frame)
+    sweep = None
+    ifg = 12
+    use_preamble = 1
+    er_rate = 0.0
+    seed = 1
+    pcap_out = None
+    outfile = None
+    depth = stim_depth
+    for option in options:
+        if option[0] == "-p":
+            frames = read_pcap (option[1])
+        elif option[0] == "-r":
+            frames = int (option[1])
+        elif option[0] == "-w":
+            sweep = parse_range (option[1], 3)
+        elif option[0] == "-c":
+            count = int (option[1])
+        elif option[0] == "-s":
+            sizes = parse_range (option[1], 2)
+        elif option[0] == "-i":
+            ifg = int (option[1])
+        elif option[0] == "-n":
+            use_preamble = 0
+        elif option[0] == "-e":
+            er_rate = float (option[1])
+        elif option[0] == "-x":
+            seed = int (option[1])
+        elif option[0] == "-k":
+            pcap_out = option[1]
+        elif option[0] == "-m":
+            depth = int (option[1])
+        elif option[0] == "-o":
+            outfile = option[1]
+        else:
+            print_help()
+    if (outfile == None):
+        print_help()
+    if sweep:
+        frames = sweep_frames (sweep[0], sweep[1], sweep[2] or 1, count, seed)
+    elif isinstance (frames, int):
+        frames = random_frames (frames, sizes[0], sizes[1] or sizes[0], seed)
+    elif (frames == None):
+        print_help()
+
+    start = time.time()
+    writer = stream_writer (outfile, ifg, use_preamble, er_rate, seed, depth)
+    pcap = pcap_out and pcap_writer (pcap_out)
+    try:
+        for batch in batches (frames):
+            writer.write (batch)
+            if pcap: pcap.write (batch)
+    except depth_error, msg:
+        writer.discard()
+        if pcap:
+            pcap.close()
+            os.remove (pcap_out)
+        print "ERROR: %s after %d frames; use fewer frames, or a larger -m" % (msg, writer.frames)
+        print "       together with +define+GMII_STIM_DEPTH=<n> (see env/gmii_stim.v)"
+        sys.exit(1)
+    writer.close()
+    if pcap: pcap.close()
+    secs = max (time.time() - start, 1e-6)
+    sys.stderr.write ("%d frames, %d bytes, %d cycles in %.2fs (%.0f frames/s)\n" %
+                      (writer.frames, writer.bytes, writer.cycles, secs, writer.frames / secs))
+
+if __name__ == '__main__':
+    cmdline()
@@ -22,44 +22,8 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-class mem_image:
-    def __init__ (self):
-        self.min = 100000
-        self.max = -1
-        self.map = {}
-        self.bcount = 0
-
-    def load_ihex (self, infile):
-        ifh = open (infile, 'r')
-    
-        line = ifh.readline()
-        while (line != ''):
-            if (line[0] == ':'):
-                rlen = int(line[1:3], 16)
-                addr = int(line[3:7], 16)
-                rtyp = int(line[7:9], 16)
-                ptr = 9
-                for i in range (0, rlen):
-                    laddr = addr + i
-                    val = int(line[9+i*2:9+i*2+2], 16)
-                    self.map[laddr] = val
-                    self.bcount += 1
-                    if (laddr > self.max): self.max = laddr
-                    if (laddr < self.min): self.min = laddr
-    
-            line = ifh.readline()
-            
-        ifh.close()
-
-    def save_vmem (self, outfile, start=-1, stop=-1):
-        if (start == -1): start = self.min
-        if (stop == -1): stop = self.max
-
-        ofh = open (outfile, 'w')
-        for addr in range(start, stop+1):
-            if self.map.has_key (addr):
-                ofh.write ("@%02x %02x\n" % (addr, self.map[addr]))
-        ofh.close()
+from mem_image import mem_image, ihex_error, default_limit
+import sys, getopt
 
 def ihex2mem (infile, outfile):
     ifh = open (infile, 'r')
@@ -85,18 +49,54 @@ def ihex2mem (infile, outfile):
 
     return bcount
 
+def print_help ():
+    print "Usage: ihex2mem.py [-hdb] [-w width] [-l limit] <ihx file> <output file>"
+    print "  -d : dense vmem, one address directive per contiguous block"
+    print "  -w : dense vmem packed into 16, 32 or 64 bit words"
+    print "  -b : raw binary output"
+    print "  -l : reject data at or above this address, in hex (default %x)" % default_limit
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
 def cmdline ():
-    import sys
+    (options, args) = getopt.getopt (sys.argv[1:], "hdbw:l:")
+    if len(args) != 2:
+        print_help()
     
-    infile = sys.argv[1]
-    outfile = sys.argv[2]
+    infile = args[0]
+    outfile = args[1]
+    format = 'byte'
+    width = 8
+    limit = default_limit
+
+    for option in options:
+        if option[0] == "-d":
+            format = 'dense'
+        elif option[0] == "-w":
+            format = 'dense'
+            width = int(option[1])
+            if width not in (8, 16, 32, 64):
+                print "ERROR: unsupported word width", width
+                sys.exit(1)
+        elif option[0] == "-b":
+            format = 'bin'
+        elif option[0] == "-l":
+            limit = int(option[1], 16)
+        else:
+            print_help()
 
     #bc = ihex2mem (infile, outfile)
-    conv = mem_image()
-    conv.load_ihex(infile)
-    conv.save_vmem(outfile)
+    conv = mem_image(limit=limit)
+    try:
+        conv.load_ihex(infile)
+    except ihex_error, msg:
+        print "ERROR:", msg
+        sys.exit(1)
+    if (format == 'bin'):
+        conv.save_bin(outfile, 0)
+    else:
+        conv.save_vmem(outfile, 0, -1, format, width)
     print "Converted %d bytes from %s to %s" % (conv.bcount, infile, outfile)
     
 if __name__ == '__main__':
     cmdline()
-
@@ -19,42 +19,347 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import bisect, binascii
+
+class ihex_error (Exception):
+    pass
+
+# Default region layout of the test environment (see doc/env_io_map.txt)
+default_regions = [('rom', 0x0000, 0x7fff),
+                   ('ram', 0x8000, 0xffff)]
+
+# Read a region map file.  Each non-comment line holds a region name
+# and its inclusive start and stop addresses in hex, e.g.
+#   rom  0000 7fff
+def load_regions (filename):
+    regions = []
+    fh = open (filename, 'r')
+    for line in fh:
+        line = line.split('#')[0].split()
+        if (len(line) == 0): continue
+        regions.append ((line[0], int(line[1], 16), int(line[2], 16)))
+    fh.close()
+    return regions
+
+# Parse a region given on the command line as name:start:stop (hex)
+def parse_region (str):
+    (name, start, stop) = str.split (':')
+    return (name, int(start, 16), int(stop, 16))
+
+# one Intel Hex record, with its checksum and line end
+def ihex_record (addr, rtyp, data):
+    rec = bytearray ([len(data), addr >> 8, addr & 0xff, rtyp]) + data
+    rec.append (-sum (rec) & 0xff)
+    return ':' + binascii.hexlify (rec).upper() + '\n'
+
+# Highest address (exclusive) an image accepts by default: the 64K
+# address space of the Z80
+default_limit = 0x10000
+
+# Memory image of a sparse address space.  Data is held in a flat
+# bytearray; the populated address ranges are kept as a sorted list
+# of non-overlapping [start, end) extents, so loading, iterating and
+# saving cost time proportional to the data present rather than to
+# the size of the address space.  Writes that end beyond limit
+# (default the larger of size and default_limit) raise ihex_error, so
+# a bad extended address record cannot grow the array without bound.
 class mem_image:
-    def __init__ (self):
-        self.min = 100000
+    def __init__ (self, size=0x10000, limit=None):
+        if (limit == None): limit = max (size, default_limit)
+        self.limit = limit
+        self.min = limit
         self.max = -1
-        self.map = {}
         self.bcount = 0
+        self.entry = None
+        self.data = bytearray (size)
+        self.starts = []
+        self.ends = []
+
+    # write a block of bytes starting at addr
+    def write (self, addr, buf):
+        end = addr + len(buf)
+        if (end == addr): return
+        if (end > self.limit):
+            raise ihex_error, "address %x beyond the image limit %x" % (end - 1, self.limit)
+        if (end > len(self.data)):
+            self.data.extend (bytearray (end - len(self.data)))
+        self.data[addr:end] = buf
+        self.bcount += end - addr
+        if (addr < self.min): self.min = addr
+        if (end - 1 > self.max): self.max = end - 1
+        self.add_extent (addr, end)
+
+    # merge [start, end) into the extent list, joining any extents
+    # that overlap or touch it
+    def add_extent (self, start, end):
+        i = bisect.bisect_left (self.ends, start)
+        j = bisect.bisect_right (self.starts, end)
+        if (i < j):
+            start = min (start, self.starts[i])
+            end = max (end, self.ends[j-1])
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+    def has (self, addr):
+        i = bisect.bisect_right (self.starts, addr) - 1
+        return (i >= 0) and (addr < self.ends[i])
+
+    def __getitem__ (self, addr):
+        if not self.has (addr):
+            raise KeyError, addr
+        return self.data[addr]
 
+    def __setitem__ (self, addr, val):
+        self.write (addr, bytearray ([val]))
+
+    # return the populated (start, end) extents clipped to the
+    # inclusive address range start..stop
+    def extents (self, start=0, stop=-1):
+        if (stop == -1): stop = self.max
+        result = []
+        i = max (bisect.bisect_right (self.starts, start) - 1, 0)
+        while (i < len(self.starts)) and (self.starts[i] <= stop):
+            s = max (self.starts[i], start)
+            e = min (self.ends[i], stop + 1)
+            if (s < e): result.append ((s, e))
+            i += 1
+        return result
+
+    # iterate over (addr, data) chunks of populated memory within
+    # the inclusive range start..stop
+    def chunks (self, start=0, stop=-1):
+        for (s, e) in self.extents (start, stop):
+            yield (s, self.data[s:e])
+
+    # return length bytes starting at addr; unpopulated bytes read
+    # as fill
+    def read (self, addr, length, fill=0):
+        result = bytearray ([fill]) * length
+        for (s, e) in self.extents (addr, addr + length - 1):
+            result[s-addr:e-addr] = self.data[s:e]
+        return result
+
+    # number of populated bytes in the inclusive range start..stop
+    def count (self, start=0, stop=-1):
+        return sum ([e - s for (s, e) in self.extents (start, stop)])
+
+    # Load an Intel Hex file.  Each record is decoded with a single
+    # fromhex call and checksummed before its payload is written.
+    # Extended segment (02) and extended linear (04) address records
+    # set the base for following data records; start address records
+    # (03, 05) set self.entry.  Loading stops at the EOF (01) record.
     def load_ihex (self, infile):
         ifh = open (infile, 'r')
-    
-        line = ifh.readline()
-        while (line != ''):
-            if (line[0] == ':'):
-                rlen = int(line[1:3], 16)
-                addr = int(line[3:7], 16)
-                rtyp = int(line[7:9], 16)
-                ptr = 9
-                for i in range (0, rlen):
-                    laddr = addr + i
-                    val = int(line[9+i*2:9+i*2+2], 16)
-                    self.map[laddr] = val
-                    self.bcount += 1
-                    if (laddr > self.max): self.max = laddr
-                    if (laddr < self.min): self.min = laddr
-    
-            line = ifh.readline()
-            
+        base = 0
+        lnum = 0
+
+        for line in ifh:
+            lnum += 1
+            line = line.strip()
+            if (line == '') or (line[0] != ':'): continue
+
+            try:
+                rec = bytearray.fromhex (line[1:])
+            except ValueError:
+                ifh.close()
+                raise ihex_error, "%s:%d: invalid hex digits" % (infile, lnum)
+            if (len(rec) < 5) or (len(rec) != rec[0] + 5):
+                ifh.close()
+                raise ihex_error, "%s:%d: bad record length" % (infile, lnum)
+            if (sum (rec) & 0xff):
+                ifh.close()
+                raise ihex_error, "%s:%d: checksum error" % (infile, lnum)
+
+            rtyp = rec[3]
+            if (rtyp == 0):
+                try:
+                    self.write (base + (rec[1] << 8 | rec[2]), rec[4:-1])
+                except ihex_error, msg:
+                    ifh.close()
+                    raise ihex_error, "%s:%d: %s" % (infile, lnum, msg)
+            elif (rtyp == 1):
+                break
+            elif (rtyp == 2) and (rec[0] == 2):
+                base = (rec[4] << 8 | rec[5]) << 4
+            elif (rtyp == 4) and (rec[0] == 2):
+                base = (rec[4] << 8 | rec[5]) << 16
+            elif (rtyp == 3) and (rec[0] == 4):
+                self.entry = ((rec[4] << 8 | rec[5]) << 4) + (rec[6] << 8 | rec[7])
+            elif (rtyp == 5) and (rec[0] == 4):
+                self.entry = rec[4] << 24 | rec[5] << 16 | rec[6] << 8 | rec[7]
+            else:
+                ifh.close()
+                raise ihex_error, "%s:%d: bad record type %02x" % (infile, lnum, rtyp)
+
         ifh.close()
 
-    def save_vmem (self, outfile, start=-1, stop=-1):
+    # Save start..stop as an Intel Hex file, record_size data bytes to
+    # a record.  Extended linear address (04) records are written for
+    # data above 64K, and a start address (05) record when self.entry
+    # is set.
+    def save_ihex (self, outfile, start=-1, stop=-1, record_size=16):
         if (start == -1): start = self.min
         if (stop == -1): stop = self.max
 
+        lines = []
+        upper = 0
+        for (addr, chunk) in self.chunks (start, stop):
+            for i in range (0, len(chunk), record_size):
+                a = addr + i
+                if ((a >> 16) != upper):
+                    upper = a >> 16
+                    lines.append (ihex_record (0, 4, bytearray ([upper >> 8, upper & 0xff])))
+                # a record may not cross a 64K boundary
+                n = min (record_size, len(chunk) - i, 0x10000 - (a & 0xffff))
+                lines.append (ihex_record (a & 0xffff, 0, chunk[i:i+n]))
+                if (n < min (record_size, len(chunk) - i)):
+                    upper = (a + n) >> 16
+                    lines.append (ihex_record (0, 4, bytearray ([upper >> 8, upper & 0xff])))
+                    lines.append (ihex_record (0, 0, chunk[i+n:i+min (record_size, len(chunk) - i)]))
+        if (self.entry != None):
+            e = self.entry
+            lines.append (ihex_record (0, 5, bytearray ([e >> 24 & 0xff, e >> 16 & 0xff, e >> 8 & 0xff, e & 0xff])))
+        lines.append (ihex_record (0, 1, bytearray()))
         ofh = open (outfile, 'w')
-        for addr in range(start, stop+1):
-            if self.map.has_key (addr):
-                ofh.write ("@%02x %02x\n" % (addr-start, self.map[addr]))
+        ofh.write (''.join (lines))
         ofh.close()
 
+    # Load a vmem file as written by save_vmem, in any of its formats.
+    # Addresses in the file are word addresses relative to base; words
+    # wider than 8 bits are unpacked little-endian.
+    def load_vmem (self, infile, base=0, width=8):
+        wbytes = width / 8
+        ifh = open (infile, 'r')
+        addr = 0
+        words = []
+        for line in ifh:
+            for tok in line.split ('//')[0].split():
+                if (tok[0] == '@'):
+                    self.write_words (base + addr * wbytes, words, wbytes)
+                    addr = int (tok[1:], 16)
+                    words = []
+                else:
+                    words.append (tok)
+                    if (len(words) == 4096):
+                        self.write_words (base + addr * wbytes, words, wbytes)
+                        addr += len(words)
+                        words = []
+        self.write_words (base + addr * wbytes, words, wbytes)
+        ifh.close()
+
+    def write_words (self, addr, words, wbytes):
+        if (wbytes == 1):
+            self.write (addr, bytearray.fromhex (''.join ([w.zfill(2) for w in words])))
+        else:
+            # reverse the whole run so each word comes out least
+            # significant byte first, then restore the word order
+            buf = bytearray.fromhex (''.join ([w.zfill(wbytes*2) for w in reversed (words)]))
+            buf.reverse()
+            self.write (addr, buf)
+
+    # Populated memory of start..stop widened to whole words of wbytes
+    # bytes, counted from base.  Extents that share or touch a word are
+    # merged into one chunk, and padding bytes that are unpopulated or
+    # outside start..stop read as 0.
+    def word_chunks (self, start, stop, base, wbytes):
+        ranges = []
+        for (s, e) in self.extents (start, stop):
+            s -= (s - base) % wbytes
+            e += -(e - base) % wbytes
+            if ranges and (s <= ranges[-1][1]):
+                ranges[-1][1] = e
+            else:
+                ranges.append ([s, e])
+        for (s, e) in ranges:
+            buf = bytearray (e - s)
+            for (cs, ce) in self.extents (max (s, start), min (e - 1, stop)):
+                buf[cs-s:ce-s] = self.data[cs:ce]
+            yield (s, buf)
+
+    # Write one chunk of memory in vmem format.  The 'byte' format
+    # writes an address directive for every byte.  The 'dense' format
+    # writes one directive per chunk followed by the data; when width
+    # is wider than 8 bits the bytes are packed little-endian into
+    # words and the addresses are word addresses, so the chunk must
+    # hold whole words (see word_chunks).
+    def write_vmem (self, ofh, addr, chunk, base, format='byte', width=8):
+        if (format == 'byte'):
+            hex = binascii.hexlify (chunk)
+            ofh.write (''.join (["@%02x %s\n" % (addr-base+i, hex[i*2:i*2+2])
+                                 for i in range (len(chunk))]))
+            return
+
+        wbytes = width / 8
+        if (wbytes > 1):
+            # hexlify the chunk back to front so that each word comes
+            # out most significant byte first; the word order is
+            # restored afterwards
+            hex = binascii.hexlify (chunk[::-1])
+            words = [hex[i:i+wbytes*2] for i in range (0, len(hex), wbytes*2)]
+            words.reverse()
+        else:
+            hex = binascii.hexlify (chunk)
+            words = [hex[i:i+2] for i in range (0, len(hex), 2)]
+
+        per_line = max (16 / wbytes, 1)
+        lines = ["@%02x" % ((addr - base) / wbytes)]
+        lines.extend ([' '.join (words[i:i+per_line])
+                       for i in range (0, len(words), per_line)])
+        lines.append ('')
+        ofh.write ('\n'.join (lines))
+
+    def save_vmem (self, outfile, start=-1, stop=-1, format='byte', width=8):
+        if (start == -1): start = self.min
+        if (stop == -1): stop = self.max
+
+        if (format == 'dense') and (width > 8):
+            chunks = self.word_chunks (start, stop, start, width / 8)
+        else:
+            chunks = self.chunks (start, stop)
+        ofh = open (outfile, 'w')
+        for (addr, chunk) in chunks:
+            self.write_vmem (ofh, addr, chunk, start, format, width)
+        ofh.close()
+
+    # Save start..stop as a raw binary file, with unpopulated bytes
+    # set to fill
+    def save_bin (self, outfile, start=-1, stop=-1, fill=0):
+        if (start == -1): start = self.min
+        if (stop == -1): stop = self.max
+
+        ofh = open (outfile, 'wb')
+        ofh.write (self.read (start, stop - start + 1, fill))
+        ofh.close()
+
+    # Save several regions in a single pass over the populated extents.
+    # regions is a list of (start, stop, outfile) tuples with inclusive
+    # stop addresses; each file is addressed relative to its region
+    # start, as with save_vmem.  Wide dense files are written region
+    # by region, since their chunks are widened to whole words.
+    def save_regions (self, regions, format='byte', width=8):
+        regions = sorted (regions)
+        files = [open (r[2], 'w') for r in regions]
+        first = 0
+
+        if (format == 'dense') and (width > 8):
+            for i in range (len(regions)):
+                (rstart, rstop, outfile) = regions[i]
+                for (addr, chunk) in self.word_chunks (rstart, rstop, rstart, width / 8):
+                    self.write_vmem (files[i], addr, chunk, rstart, format, width)
+            for fh in files: fh.close()
+            return
+
+        for (s, e) in self.extents():
+            while (first < len(regions)) and (regions[first][1] < s):
+                first += 1
+            i = first
+            while (i < len(regions)) and (regions[i][0] < e):
+                (rstart, rstop, outfile) = regions[i]
+                cs = max (s, rstart)
+                ce = min (e, rstop + 1)
+                if (cs < ce):
+                    self.write_vmem (files[i], cs, self.data[cs:ce], rstart,
+                                     format, width)
+                i += 1
+
+        for fh in files: fh.close()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Z80 opcode tables.  env/z80_opcodes.txt is loaded into one 256-entry
+# list per opcode page, shared by the ISS trace, trace packing, opcode
+# coverage, the disassembler and the generator of env/op_decode.v.
+
+table_file = "env/z80_opcodes.txt"
+
+page_codes = { "base" : 0x00, "cb" : 0xcb, "ed" : 0xed, "dd" : 0xdd,
+               "fd" : 0xfd, "ddcb" : 0xddcb, "fdcb" : 0xfdcb }
+
+class table_error (Exception):
+    pass
+
+class opcode:
+    def __init__ (self, page, code, length, tstates, mnemonic, operands):
+        self.page = page
+        self.code = code
+        self.length = length
+        self.tstates = tstates
+        self.mnemonic = mnemonic
+        self.operands = operands
+        if (mnemonic == "PREFIX"):
+            self.prefix = page_codes[operands]
+            self.text = None
+        else:
+            self.prefix = None
+            self.text = ("%-6s%s" % (mnemonic, operands)).rstrip()
+
+    # operand kinds, in the order their bytes follow the opcode
+    def kinds (self):
+        out = []
+        ops = self.operands
+        if ("+index)" in ops):
+            out.append ("disp")
+        elif ("index" in ops):
+            out.append ("rel")
+        if ("byte" in ops):
+            out.append ("byte")
+        if ("word" in ops) or ("address" in ops):
+            out.append ("word")
+        return out
+
+    # bytes of operand that follow the opcode in an M1 decode: all of
+    # them, less the prefix bytes
+    def operand_bytes (self):
+        if (self.page == 0):
+            return self.length - 1
+        return self.length - 2
+
+class op_table:
+    def __init__ (self):
+        self.pages = {}
+        for code in page_codes.values():
+            self.pages[code] = [None] * 256
+
+    def load (self, filename=table_file):
+        lineno = 0
+        for line in open (filename):
+            lineno += 1
+            line = line.split ("#")[0].strip()
+            if not line:
+                continue
+            fields = line.split()
+            try:
+                (page, code, length, tstates, mnemonic) = fields[:5]
+                if (len (fields) > 6): raise ValueError
+                operands = (len (fields) == 6) and fields[5] or "-"
+                if (operands == "-"): operands = ""
+                if (tstates == "-"): tstates = ()
+                else: tstates = tuple ([int (t) for t in tstates.split ("/")])
+                op = opcode (page_codes[page], int (code, 16), int (length), tstates, mnemonic, operands)
+            except (ValueError, KeyError):
+                raise table_error, "%s:%d: bad opcode entry" % (filename, lineno)
+            if (self.pages[op.page][op.code] != None):
+                raise table_error, "%s:%d: duplicate opcode %s %02x" % (filename, lineno, page, op.code)
+            self.pages[op.page][op.code] = op
+        return self
+
+    def get (self, page, code):
+        return self.pages[page][code]
+
+    # Mnemonic the decode trace prints for an opcode, and the state
+    # the decode task moves to: a prefix byte for prefixes, {1,n} when
+    # n operand bytes follow, 0 otherwise.  DDCB and FDCB cannot be
+    # followed by the trace, because their last two bytes are not read
+    # in M1 cycles; they print as CB with the index operand.
+    def lookup (self, page, code):
+        op = self.pages[page][code]
+        if (op == None):
+            return (None, page)
+        if (op.prefix != None):
+            if (op.prefix > 0xff):
+                return ("%-6s(I%s+index)" % ("CB", "XY"[page == 0xfd]), 0x12)
+            return (None, op.prefix)
+        n = op.operand_bytes()
+        if n:
+            return (op.text, 0x10 | n)
+        return (op.text, 0)
+
+    # Decode the M1 opcode bytes of one instruction the way the decode
+    # task in tb_top does, and return the mnemonics it would print.
+    # Operand countdown states are dropped, because the memory cycles
+    # that fetch the operands reset the state in tb_top.
+    def decode (self, opcodes):
+        state = 0
+        out = []
+        for op in opcodes:
+            if (state == 0):
+                (text, state) = self.lookup (0, op)
+            elif state in (0xcb, 0xdd, 0xed, 0xfd):
+                (text, state) = self.lookup (state, op)
+            else:
+                text = "Unknown opcode %02x" % op
+            if (text != None):
+                out.append (text)
+            if ((state >> 4) == 1):
+                state = 0
+        return out
+
+def load (filename=table_file):
+    return op_table().load (filename)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Opcode coverage of the regression.
+#
+# Each test's instruction stream is reduced to a histogram per opcode
+# page (unprefixed, CB, DD, ED, FD), 256 counts each.  The stream can
+# come from the OPCODE lines of a run -t log, a packed .trc trace, or
+# the z80sim ISS running the test image.  A coverage file holds one
+# named histogram per test, so files from parallel runs merge by
+# concatenation, and the report can still tell which tests add
+# coverage and which are redundant.  Holes are listed against the
+# opcode table env/z80_opcodes.txt.
+
+import sys, os, struct, getopt
+from array import array
+import op_table, trace_file
+
+magic = "TV80COV1"
+prefixes = trace_file.prefixes
+page_names = ["base", "cb", "dd", "ed", "fd"]
+slots = len (prefixes) * 256
+
+class coverage:
+    def __init__ (self, name):
+        self.name = name
+        self.counts = array ('L', [0]) * slots
+
+    def add (self, prefix, opcode, count=1):
+        if (prefix in prefixes):
+            self.counts[prefixes.index (prefix) * 256 + opcode] += count
+
+    def merge (self, other):
+        for i in xrange (slots):
+            self.counts[i] += other.counts[i]
+
+    def covered (self):
+        return set ([i for i in xrange (slots) if self.counts[i]])
+
+def write_file (filename, covs):
+    fh = open (filename, "wb")
+    fh.write (struct.pack ("<8sI", magic, len (covs)))
+    for cov in covs:
+        counts = array ('L', cov.counts)
+        if (counts.itemsize != 4):
+            counts = array ('I', counts)
+        if (sys.byteorder != "little"):
+            counts.byteswap()
+        fh.write (struct.pack ("<B", len (cov.name)) + cov.name)
+        fh.write (counts.tostring())
+    fh.close()
+
+def read_file (filename):
+    fh = open (filename, "rb")
+    (tag, n) = struct.unpack ("<8sI", fh.read (12))
+    if (tag != magic):
+        raise IOError, "%s: not a coverage file" % filename
+    covs = []
+    for i in range (n):
+        (length,) = struct.unpack ("<B", fh.read (1))
+        cov = coverage (fh.read (length))
+        counts = array ('I')
+        counts.fromstring (fh.read (slots * 4))
+        if (sys.byteorder != "little"):
+            counts.byteswap()
+        cov.counts = array ('L', counts)
+        covs.append (cov)
+    return covs
+
+def from_log (name, filename, table_file=op_table.table_file):
+    import trace_diff
+    ops = trace_file.opcode_map (table_file)
+    cov = coverage (name)
+    for (time, text) in trace_diff.log_stream (filename):
+        if ops.has_key (text):
+            cov.add (*ops[text])
+    return cov
+
+def from_trace (name, filename):
+    reader = trace_file.trace_reader (filename)
+    cov = coverage (name)
+    for n in range (len (reader.index)):
+        blk = reader.block (n)
+        for (prefix, opcode) in zip (blk.prefix, blk.opcode):
+            cov.add (prefix, opcode)
+    return cov
+
+def from_image (name, filename, max_cycles=10000000):
+    import z80sim
+    (cpu, env) = z80sim.load_system (filename, out=open (os.devnull, "w"))
+    cov = coverage (name)
+    def trace (cpu):
+        if cpu.halted:
+            cov.add (0, 0)
+            return
+        ops = z80sim.m1_opcodes (cpu.mem, cpu.pc)
+        if (len (ops) == 1):
+            cov.add (0, ops[0])
+        else:
+            cov.add (ops[-2], ops[-1])
+    cpu.trace = trace
+    z80sim.run (cpu, env, max_cycles)
+    return cov
+
+def collect (filename, table_file=op_table.table_file):
+    name = os.path.splitext (os.path.basename (filename))[0]
+    if filename.endswith (".trc"):
+        return from_trace (name, filename)
+    if filename.endswith (".log"):
+        return from_log (name, filename, table_file)
+    return from_image (name, filename)
+
+# slot -> mnemonic for every opcode the opcode table knows
+def instruction_table (table_file=op_table.table_file):
+    table = op_table.load (table_file)
+    slots = {}
+    for (p, prefix) in enumerate (prefixes):
+        for op in range (256):
+            (text, state) = table.lookup (prefix, op)
+            if (text != None):
+                slots[p * 256 + op] = text
+    return slots
+
+# Greedy cover: repeatedly take the test adding the most new opcodes.
+# Returns the tests in that order with the number each adds; tests
+# adding nothing are redundant.
+def rank_tests (covs):
+    sets = [(cov.name, cov.covered()) for cov in covs]
+    seen = set()
+    order = []
+    while sets:
+        best = max (sets, key=lambda s: len (s[1] - seen))
+        order.append ((best[0], len (best[1] - seen)))
+        seen |= best[1]
+        sets.remove (best)
+    return order
+
+def report (covs, table_file=op_table.table_file, fh=sys.stdout):
+    total = coverage ("total")
+    for cov in covs:
+        total.merge (cov)
+    known = instruction_table (table_file)
+    hit = total.covered()
+
+    fh.write ("%-6s %8s %8s %7s\n" % ("page", "covered", "opcodes", "%"))
+    for (p, name) in enumerate (page_names):
+        page = [s for s in known.keys() if (s >> 8) == p]
+        n = len ([s for s in page if s in hit])
+        fh.write ("%-6s %8d %8d %6.1f%%\n" % (name, n, len (page), 100.0 * n / max (len (page), 1)))
+
+    fh.write ("\nholes:\n")
+    for s in sorted (known.keys()):
+        if s not in hit:
+            prefix = prefixes[s >> 8]
+            if prefix: code = "%02x %02x" % (prefix, s & 0xff)
+            else: code = "   %02x" % (s & 0xff)
+            fh.write ("  %s  %s\n" % (code, known[s]))
+
+    fh.write ("\ntests by added coverage:\n")
+    for (name, added) in rank_tests (covs):
+        if added:
+            fh.write ("  %5d  %s\n" % (added, name))
+        else:
+            fh.write ("  %5d  %s (redundant)\n" % (added, name))
+
+def print_help ():
+    print "Usage: opcode_cov.py -o <cov> <log|trc|image>..."
+    print "       opcode_cov.py -m -o <cov> <cov>..."
+    print "       opcode_cov.py [-f table] <cov>..."
+    print "  -o : collect coverage of each input (or merge, with -m) into cov"
+    print "  -m : merge coverage files"
+    print "  -f : opcode table (default %s)" % op_table.table_file
+    print "  -h : option help (this list)"
+    print "Without -o the coverage files are reported."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hmo:f:")
+    outfile = None
+    merge = 0
+    table_file = op_table.table_file
+    for option in options:
+        if option[0] == "-o":
+            outfile = option[1]
+        elif option[0] == "-m":
+            merge = 1
+        elif option[0] == "-f":
+            table_file = option[1]
+        else:
+            print_help()
+    if len(args) == 0:
+        print_help()
+
+    if outfile and not merge:
+        write_file (outfile, [collect (f, table_file) for f in args])
+        return
+
+    covs = []
+    for f in args:
+        covs.extend (read_file (f))
+    if outfile:
+        write_file (outfile, covs)
+    else:
+        report (covs, table_file)
+
+if __name__ == '__main__':
+    cmdline()
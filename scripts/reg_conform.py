@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Conformance of the reglib Python models against the Verilog.
+#
+# Each tv_registers block of a spec is generated as Verilog and as a
+# Python model.  Random pin-level stimulus is run through the model,
+# which gives the expected value of every output on every clock.  A
+# testbench is then written that drives the same stimulus into the
+# Verilog and checks each output against the model before every
+# rising edge.  Outputs the model holds as x (None) are not checked.
+# The testbench prints TEST PASSED or TEST FAILED and is run under
+# simlib's supervisor.
+#
+# With -a every block is also checked with each combination of bus
+# frontend, decode and registered read, whatever its spec selects.
+
+import sys, os, random, getopt, subprocess
+import xml.etree.cElementTree as ElementTree
+import reglib, rgen, simlib
+
+# (suffix, bus, decode, read_reg) of the variants checked with -a
+variants = [("%s_%s%s" % (bus, decode, read_reg and "_reg" or ""), bus, decode, read_reg)
+            for bus in ('tv80', 'wishbone')
+            for decode in ('priority', 'parallel')
+            for read_reg in (0, 1)]
+
+def load_groups (filename, all_variants=0):
+    groups = []
+    for (event, elem) in ElementTree.iterparse (filename):
+        if (elem.tag != "tv_registers"):
+            continue
+        if not all_variants:
+            groups.append (rgen.create_verilog (elem))
+        for (suffix, bus, decode, read_reg) in (all_variants and variants or []):
+            rg = rgen.create_verilog (elem)
+            rg.name = "%s_%s" % (rg.name, suffix)
+            rg.bus = bus
+            rg.decode = decode
+            rg.read_reg = read_reg
+            groups.append (rg)
+        elem.clear()
+    return groups
+
+# bus pins for one clock of a read, write or idle cycle
+def bus_pins (rg, op, addr, data, rng):
+    if (rg.bus == 'wishbone'):
+        tag = rg.frontend.tag
+        if (rng.random() < 0.1): tag = rng.randrange (4)
+        return { 'adr_i' : addr, 'dat_i' : data, 'tga_i' : tag,
+                 'cyc_i' : int (op != 'idle'), 'stb_i' : int (op != 'idle'),
+                 'we_i' : int (op == 'write') }
+    return { 'addr' : addr, 'wr_data' : data, rg.req_pin : int (op == 'idle'),
+             'rd_n' : int (op != 'read'), 'wr_n' : int (op != 'write') }
+
+# Run random stimulus through the model.  Returns a list of (inputs,
+# expected outputs) dictionaries, one per clock.  Most accesses fall
+# inside the block; register inputs change on about one clock in five.
+# The bus is idle during reset, and nothing is checked before the
+# first edge, while the Verilog registers are still x.
+def stimulus (rg, cycles, seed=1):
+    rng = random.Random (seed)
+    model = rg.model()()
+    widths = dict ([(p.name, p.width) for p in rg.ports])
+    bus = bus_pins (rg, 'idle', 0, 0, rng).keys()
+    others = [n for n in model.inputs if n not in bus + ['reset', 'block_select']]
+    lw = rg.local_width
+    vectors = []
+    for cycle in range (cycles):
+        pins = { 'reset' : int (cycle < 2) }
+        op = rng.choice (['idle', 'idle', 'read', 'write'])
+        if pins['reset']: op = 'idle'
+        if (rng.random() < 0.8):
+            addr = rg.base_addr + rng.randrange (1 << lw)
+        else:
+            addr = rng.randrange (1 << rg.addr_size)
+        pins.update (bus_pins (rg, op, addr, rng.randrange (1 << rg.data_size), rng))
+        if rg.shared_select:
+            pins['block_select'] = int ((op != 'idle') and (addr >> lw) == (rg.base_addr >> lw))
+        for n in others:
+            if (cycle == 0) or (rng.random() < 0.2):
+                pins[n] = rng.randrange (1 << widths[n])
+        for (n, v) in pins.items():
+            setattr (model, n, v)
+        model.eval()
+        if (cycle == 0): expect = {}
+        else: expect = dict ([(n, getattr (model, n)) for n in model.outputs])
+        vectors.append ((pins, expect))
+        model.clock()
+    return vectors
+
+def write_testbench (rg, vectors, fh):
+    top = rg.name + "_conform"
+    out = ["module %s;\n" % top]
+    for p in rg.ports:
+        if (p.direction == 'input'): out.append (reglib.net ('reg', p.name, p.width).declaration() + '\n')
+        else: out.append (reglib.net ('wire', p.name, p.width).declaration() + '\n')
+    out.append ("integer errors, cycle;\n")
+    out.append ("%s dut (%s);\n" % (rg.name, ', '.join ([".%s(%s)" % (p.name, p.name) for p in rg.ports])))
+    out.append ("initial clk = 0;\n")
+    out.append ("always #5 clk = ~clk;\n")
+    out.append ("task check;\n")
+    out.append ("  input [255:0] name;\n  input [31:0] got, exp;\n")
+    reglib.emit_block (out, '', ['if (got !== exp)', '  begin',
+                                 '    $display ("ERROR: cycle %0d: %0s = %h, expected %h", cycle, name, got, exp);',
+                                 '    errors = errors + 1;', '  end'])
+    out.append ("endtask\n")
+
+    statements = ["errors = 0;"]
+    last = {}
+    for (cycle, (pins, expect)) in enumerate (vectors):
+        statements.append ("cycle = %d;" % cycle)
+        for n in sorted (pins.keys()):
+            if (last.get (n) != pins[n]):
+                statements.append ("%s = %d;" % (n, pins[n]))
+        last = pins
+        statements.append ("#1;")
+        for n in sorted (expect.keys()):
+            if (expect[n] != None):
+                statements.append ('check ("%s", %s, %d);' % (n, n, expect[n]))
+        statements.append ("@(negedge clk);")
+    statements.extend (['if (errors == 0) $display ("TEST PASSED");',
+                        'else $display ("TEST FAILED: %0d errors", errors);',
+                        '$finish;'])
+    reglib.emit_block (out, 'initial\n', statements)
+    out.append ("endmodule\n")
+    fh.writelines (out)
+    return top
+
+# commands to build and run top from files, the last one being the run
+def sim_commands (simulator, files, top, outdir):
+    if (simulator == "icarus"):
+        vvp = os.path.join (outdir, top + ".vvp")
+        return [["iverilog", "-o", vvp, "-s", top] + files, ["vvp", vvp]]
+    if (simulator == "verilator"):
+        mdir = os.path.join (outdir, top)
+        return [["verilator", "--binary", "--timing", "-Wno-fatal", "--top-module", top,
+                 "-Mdir", mdir, "-o", "V" + top] + files,
+                [os.path.join (mdir, "V" + top)]]
+    return [["cver"] + files]
+
+# Check one register group.  Returns the status of the run, or
+# "written" when no simulator is run.
+def check_group (rg, outdir, cycles, seed, simulator):
+    vectors = stimulus (rg, cycles, seed)
+    vfile = os.path.join (outdir, rg.name + ".v")
+    fh = open (vfile, "w")
+    rg.write (fh)
+    fh.close()
+    tbfile = os.path.join (outdir, rg.name + "_conform.v")
+    fh = open (tbfile, "w")
+    top = write_testbench (rg, vectors, fh)
+    fh.close()
+    if (simulator == None):
+        return "written"
+
+    commands = sim_commands (simulator, [tbfile, vfile], top, outdir)
+    for command in commands[:-1]:
+        if (subprocess.call (command) != 0):
+            return "compile failed"
+    logfile = os.path.join (outdir, rg.name + "_conform.log")
+    return simlib.supervise (commands[-1], logfile, wall_limit=300).status
+
+def print_help ():
+    print "Usage: reg_conform.py [-an] [-s sim] [-c cycles] [-r seed] [-o dir] <spec>..."
+    print "  -s : simulator (cver, icarus or verilator, default %s)" % simlib.simulator
+    print "  -n : write the testbenches without running them"
+    print "  -a : check every bus, decode and read register variant of each block"
+    print "  -c : clocks of random stimulus (default 1000)"
+    print "  -r : random seed (default 1)"
+    print "  -o : directory for generated files (default build/conform)"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hans:c:r:o:")
+    simulator = simlib.simulator
+    all_variants = 0
+    cycles = 1000
+    seed = 1
+    outdir = "build/conform"
+    for option in options:
+        if option[0] == "-s":
+            simulator = option[1]
+        elif option[0] == "-n":
+            simulator = None
+        elif option[0] == "-a":
+            all_variants = 1
+        elif option[0] == "-c":
+            cycles = int (option[1])
+        elif option[0] == "-r":
+            seed = int (option[1])
+        elif option[0] == "-o":
+            outdir = option[1]
+        else:
+            print_help()
+    if len(args) == 0:
+        print_help()
+
+    if not os.path.isdir (outdir):
+        os.makedirs (outdir)
+    failed = 0
+    for spec in args:
+        for rg in load_groups (spec, all_variants):
+            status = check_group (rg, outdir, cycles, seed, simulator)
+            print "%-40s %s" % (rg.name, status)
+            if status not in ("passed", "written"):
+                failed += 1
+    if failed:
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
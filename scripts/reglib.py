@@ -19,7 +19,7 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-import string, math, re
+import math, re
 
 def log2 (num):
     return math.ceil (math.log (num) / math.log (2))
@@ -41,21 +41,21 @@ def number (str):
         print "ERROR: number conversion of %s failed" % str
         return 0
 
-def comb_block (statements):
-    result = 'always @*\n'
-    result += '  begin\n'
+# Blocks are built as lists of lines and joined once; the emit_
+# versions append to an output list shared by the whole module.
+def emit_block (out, header, statements):
+    out.append (header)
+    out.append ('  begin\n')
     for s in statements:
-        result += '    ' + s + '\n'
-    result += '  end\n'
-    return result
+        out.append ('    ' + s + '\n')
+    out.append ('  end\n')
+    return out
+
+def comb_block (statements):
+    return ''.join (emit_block ([], 'always @*\n', statements))
 
 def seq_block (clock, statements):
-    result = 'always @(posedge ' + clock + ')\n'
-    result += '  begin\n'
-    for s in statements:
-        result += '    ' + s + '\n'
-    result += '  end\n'
-    return result
+    return ''.join (emit_block ([], 'always @(posedge ' + clock + ')\n', statements))
 
 class net:
     def __init__ (self, type, name, width=1):
@@ -81,6 +81,163 @@ class port:
         else:
             return "%s [%d:0] %s;" % (self.direction, self.width-1, self.name)
         
+# Bus frontends.  A frontend supplies the bus ports of a register
+# group and drives the internal interface the register logic is
+# written against: addr, wr_data, rd_n, wr_n and block_select in,
+# rd_data and doe out.  select_terms are ANDed with the address
+# compare to form block_select.
+
+# The TV80 interface: the core's own address, data and strobe pins,
+# with rd_data returned combinationally while doe is high.  The
+# address port is the full 16 bit TV80 address bus.
+class tv80_frontend:
+    registered_read = 0
+
+    def __init__ (self, group):
+        self.group = group
+
+    def ports (self):
+        g = self.group
+        return [port ('input', 'addr', 16),
+                port ('input', 'wr_data', g.data_size),
+                port ('output', 'rd_data', g.data_size),
+                port ('output', 'doe'),
+                port ('input','rd_n'),
+                port ('input', 'wr_n'),
+                port ('input', g.req_pin)]
+
+    def nets (self):
+        return [net ('reg','rd_data',self.group.data_size),
+                net ('reg','block_select'),
+                net ('reg','doe')]
+
+    def select_inputs (self):
+        return [port ('input', self.group.req_pin)]
+
+    def select_terms (self):
+        return ["!" + self.group.req_pin]
+
+    def emit_logic (self, out):
+        return out
+
+    # Python model hooks: idle input values, combinational assignments,
+    # state with its next value at the clock edge, select terms, and
+    # the pin assignments of a single clock bus access
+    read_pin = 'rd_data'
+
+    def py_idle (self):
+        return { 'rd_n' : 1, 'wr_n' : 1, self.group.req_pin : 1 }
+
+    def py_comb (self):
+        return []
+
+    def py_state (self):
+        return []
+
+    def py_next (self):
+        return []
+
+    def py_select_terms (self):
+        return ["not self." + self.group.req_pin]
+
+    def py_request (self, write):
+        if write:
+            return ["self.addr = addr", "self.wr_data = data",
+                    "self.%s = 0" % self.group.req_pin, "self.wr_n = 0"]
+        return ["self.addr = addr", "self.%s = 0" % self.group.req_pin, "self.rd_n = 0"]
+
+    def py_release (self):
+        return ["self.%s = 1" % self.group.req_pin, "self.rd_n = 1", "self.wr_n = 1"]
+
+# Wishbone B4 pipelined slave.  stall_o is tied low, so a request is
+# taken on every clock with cyc_i and stb_i high, and each is acked on
+# the following clock with dat_o registered alongside.  Back to back
+# requests (bursts) therefore run at one transfer per clock.  tga_i
+# carries the cycle type as driven by wb_tv80: 2'b00 for memory and
+# 2'b01 for I/O.
+class wishbone_frontend:
+    registered_read = 1
+
+    def __init__ (self, group):
+        self.group = group
+        if (group.mem_mapped): self.tag = 0
+        else: self.tag = 1
+
+    def ports (self):
+        g = self.group
+        return [port ('input', 'adr_i', 16),
+                port ('input', 'dat_i', g.data_size),
+                port ('output', 'dat_o', g.data_size),
+                port ('input', 'tga_i', 2),
+                port ('input', 'cyc_i'),
+                port ('input', 'stb_i'),
+                port ('input', 'we_i'),
+                port ('output', 'ack_o'),
+                port ('output', 'stall_o')]
+
+    def nets (self):
+        g = self.group
+        return [net ('wire', 'addr', 16),
+                net ('wire', 'wr_data', g.data_size),
+                net ('wire', 'rd_n'),
+                net ('wire', 'wr_n'),
+                net ('reg', 'dat_o', g.data_size),
+                net ('reg', 'ack_o'),
+                net ('reg','rd_data',g.data_size),
+                net ('reg','block_select'),
+                net ('reg','doe')]
+
+    def select_inputs (self):
+        return [port ('input', 'tga_i', 2), port ('input', 'cyc_i'),
+                port ('input', 'stb_i')]
+
+    def select_terms (self):
+        return ["cyc_i", "stb_i", "(tga_i == 2'b%d%d)" % (self.tag >> 1, self.tag & 1)]
+
+    def emit_logic (self, out):
+        out.append ('assign addr = adr_i;\n')
+        out.append ('assign wr_data = dat_i;\n')
+        out.append ('assign rd_n = we_i;\n')
+        out.append ('assign wr_n = !we_i;\n')
+        out.append ("assign stall_o = 1'b0;\n")
+        return emit_block (out, 'always @(posedge clk)\n',
+                           ["if (reset) ack_o <= 1'b0;",
+                            "else ack_o <= block_select;",
+                            "dat_o <= rd_data;"])
+
+    read_pin = 'dat_o'
+
+    def py_idle (self):
+        return {}
+
+    def py_comb (self):
+        return ["self.addr = self.adr_i", "self.wr_data = self.dat_i",
+                "self.rd_n = self.we_i", "self.wr_n = int (not self.we_i)",
+                "self.stall_o = 0"]
+
+    def py_state (self):
+        return [('ack_o', 0), ('dat_o', None)]
+
+    def py_next (self):
+        return [('ack_o', "0 if self.reset else self.block_select"),
+                ('dat_o', "self.rd_data")]
+
+    def py_select_terms (self):
+        return ["self.cyc_i", "self.stb_i", "self.tga_i == %d" % self.tag]
+
+    def py_request (self, write):
+        lines = ["self.adr_i = addr", "self.tga_i = %d" % self.tag,
+                 "self.cyc_i = 1", "self.stb_i = 1", "self.we_i = %d" % write]
+        if write:
+            lines.insert (1, "self.dat_i = data")
+        return lines
+
+    def py_release (self):
+        return ["self.cyc_i = 0", "self.stb_i = 0", "self.we_i = 0"]
+
+bus_frontends = { 'tv80' : tv80_frontend,
+                  'wishbone' : wishbone_frontend }
+
 class register_group:
     def __init__ (self, mem_mapped=0):
         self.base_addr = 0
@@ -89,32 +246,58 @@ class register_group:
         self.name = ''
         self.local_width = 1
         self.registers = []
+        self.laid_out = 0
         self.ports = [port ('input', 'clk'), port('input','reset')]
         self.nets  = []
         self.interrupts = 0
+        # read path options: decode is 'priority' (case chain) or
+        # 'parallel' (one-hot AND-OR mux); read_reg adds a register
+        # stage on rd_data; shared_select takes block_select as an
+        # input from a decoder shared by several groups
+        self.decode = 'priority'
+        self.read_reg = 0
+        self.shared_select = 0
+        # bus names the frontend (see bus_frontends) that connects the
+        # registers to the outside; mem_mapped selects memory rather
+        # than I/O cycles
+        self.bus = 'tv80'
+        self.mem_mapped = mem_mapped
+        self.frontend = None
         if (mem_mapped):
             self.req_pin = 'mreq_n'
         else:
             self.req_pin = 'iorq_n'
-        self.tv80_intf()
-
-    def tv80_intf (self):
-        self.ports.append (port ('input', 'addr', self.addr_size))
-        self.ports.append (port ('input', 'wr_data', self.data_size))
-        self.ports.append (port ('output', 'rd_data', self.data_size))
-        self.ports.append (port ('output', 'doe'))
-        self.ports.append (port ('input','rd_n'))
-        self.ports.append (port ('input', 'wr_n'))
-        self.ports.append (port ('input', self.req_pin))
-        self.nets.append (net('reg','rd_data',self.data_size))
-        self.nets.append (net('reg','block_select'))
-        self.nets.append (net('reg','doe'))
 
     # create a hook for post-processing to be done after all data has been
-    # added to the object.
+    # added to the object.  Register offsets and the local address width
+    # are assigned here, once, rather than on every add.  Calling post
+    # again does nothing.
     def post (self):
+        if self.laid_out:
+            return
+        for (rnum, r) in enumerate (self.registers):
+            r.offset = rnum
+        self.local_width = int(math.ceil (log2 (len (self.registers))))
+        if not bus_frontends.has_key (self.bus):
+            print "Unknown bus type",self.bus
+            self.bus = 'tv80'
+        self.frontend = bus_frontends[self.bus] (self)
+        self.ports[2:2] = self.frontend.ports()
+        self.nets[0:0] = self.frontend.nets()
         if (self.interrupts):
             self.int_ports()
+        if (self.decode not in ('priority', 'parallel')):
+            print "Unknown decode type",self.decode
+            self.decode = 'priority'
+        if (self.shared_select):
+            self.nets = [n for n in self.nets if n.name != 'block_select']
+            self.ports.append (port ('input', 'block_select'))
+        if (self.read_reg) and self.frontend.registered_read:
+            # the frontend already registers the read data
+            self.read_reg = 0
+        if (self.read_reg):
+            self.nets.append (net ('reg', 'rd_data_c', self.data_size))
+        self.laid_out = 1
         
     # create port for interrupt pin, as well as port for data output enable
     # when interrupt is asserted.
@@ -125,16 +308,26 @@ class register_group:
         self.nets.append (net ('reg','int_vec',self.data_size))
 
     def int_logic (self):
-        statements = []
-        int_nets = []
-        for r in self.registers:
-            if r.interrupt: int_nets.append (r.name + "_int")
-        statements.append ("int_n = ~(" + string.join (int_nets, ' | ') + ");")
-        return comb_block (statements)
+        return ''.join (self.emit_int_logic ([]))
+
+    def emit_int_logic (self, out):
+        int_nets = [r.name + "_int" for r in self.registers if r.interrupt]
+        return emit_block (out, 'always @*\n', ["int_n = ~(" + ' | '.join (int_nets) + ");"])
 
     def global_logic (self):
+        return ''.join (self.emit_global_logic ([]))
+
+    # block select expression, also used by select_decoder
+    def select_logic (self):
+        self.post()
+        addr = "(addr[%d:%d] == %d)" % (self.addr_size-1,self.local_width,self.base_addr >> self.local_width)
+        return ' & '.join ([addr] + self.frontend.select_terms())
+
+    def emit_global_logic (self, out):
         # create select pin for this block
-        statements = ["block_select = (addr[%d:%d] == %d) & !%s;" % (self.addr_size-1,self.local_width,self.base_addr >> self.local_width, self.req_pin)]
+        statements = []
+        if not self.shared_select:
+            statements.append ("block_select = %s;" % self.select_logic())
 
         # create read and write selects for each register
         for r in self.registers:
@@ -147,10 +340,12 @@ class register_group:
                 s = "%s_wr_sel = block_select & (addr[%d:%d] == %d) & !wr_n;" % (r.name,self.local_width-1,0,r.offset)
                 statements.append (s)
 
-        return comb_block (statements)
+        return emit_block (out, 'always @*\n', statements)
 
     def read_mux (self):
-        s = ''
+        return ''.join (self.emit_read_mux ([]))
+
+    def emit_read_mux (self, out):
         sments = []
         rd_sel_list = []
         # Old code for simple tri-state interface
@@ -167,46 +362,211 @@ class register_group:
             sments.append ("endcase")
 
         # create data-output mux
-        sments.append ("case (1'b1)")
+        if self.read_reg: rd_data = 'rd_data_c'
+        else: rd_data = 'rd_data'
         for r in self.registers:
-            sments.append ("  %s_rd_sel : rd_data = %s;" % (r.name, r.name))
             rd_sel_list.append (r.name + "_rd_sel")
-        if (self.interrupts):
-            sments.append ("  default : rd_data = int_vec;")
-        else: sments.append ("  default : rd_data = %d'bx;" % self.data_size)
-        sments.append ("endcase")
+        if (self.decode == 'parallel'):
+            # the read selects are one-hot, so the mux is an AND-OR
+            # tree rather than a priority chain
+            terms = ["({%d{%s_rd_sel}} & %s)" % (self.data_size, r.name, r.name) for r in self.registers]
+            if (self.interrupts):
+                terms.append ("({%d{~doe}} & int_vec)" % self.data_size)
+            sments.append ("doe = %s;" % ' | '.join (rd_sel_list))
+            sments.append ("%s = %s;" % (rd_data, ' |\n      '.join (terms)))
+        else:
+            sments.append ("case (1'b1)")
+            for r in self.registers:
+                sments.append ("  %s_rd_sel : %s = %s;" % (r.name, rd_data, r.name))
+            if (self.interrupts):
+                sments.append ("  default : %s = int_vec;" % rd_data)
+            else: sments.append ("  default : %s = %d'bx;" % (rd_data, self.data_size))
+            sments.append ("endcase")
 
-        sments.append ("doe = %s;" % string.join (rd_sel_list, ' | '))
+            sments.append ("doe = %s;" % ' | '.join (rd_sel_list))
+
+        emit_block (out, 'always @*\n', sments)
+        if self.read_reg:
+            emit_block (out, 'always @(posedge clk)\n', ["rd_data <= rd_data_c;"])
+        return out
+
+    # Estimated depth of the read path in 2-input gate levels: block
+    # select compare, register select, then the data mux.  Returns
+    # (levels before rd_data, levels before the read register, extra
+    # cycles of read latency).
+    def read_depth (self, decode=None, read_reg=None, shared_select=None):
+        self.post()
+        if (decode == None): decode = self.decode
+        if (read_reg == None): read_reg = self.read_reg
+        read_reg = read_reg or self.frontend.registered_read
+        if (shared_select == None): shared_select = self.shared_select
+        sources = len (self.registers) + (self.interrupts and 1)
+        if shared_select:
+            select = 0
+        else:
+            select = int (log2 (self.addr_size - self.local_width + 1)) + 1
+        if (self.local_width > 0):
+            select += int (log2 (self.local_width + 2))
+        if (decode == 'parallel'):
+            mux = 1 + int (log2 (max (sources, 2)))
+        else:
+            mux = sources
+        if read_reg:
+            return (0, select + mux, 1)
+        return (select + mux, 0, 0)
+
+    # report read path depth for each decode option
+    def depth_report (self):
+        lines = ["%s: %d registers, current decode %s%s%s" %
+                 (self.name, len (self.registers), self.decode,
+                  self.read_reg and ", registered read" or "",
+                  self.shared_select and ", shared select" or "")]
+        lines.append ("  %-28s %8s %10s %8s" % ("option", "levels", "reg input", "latency"))
+        for decode in ('priority', 'parallel'):
+            for shared in (0, 1):
+                for read_reg in (self.frontend.registered_read and (1,) or (0, 1)):
+                    name = decode + (shared and "+shared" or "") + (read_reg and "+registered" or "")
+                    (levels, reg_in, latency) = self.read_depth (decode, read_reg, shared)
+                    lines.append ("  %-28s %8d %10s %8d" % (name, levels, reg_in or "-", latency))
+        return '\n'.join (lines) + '\n'
 
-        return comb_block (sments)
-                
-        
     def verilog (self):
+        return ''.join (self.emit ([]))
+
+    # write the module to an open file
+    def write (self, fh):
+        fh.writelines (self.emit ([]))
+
+    # append the module text to out, as a list of strings
+    def emit (self, out):
         self.post()
-        
-        result = 'module ' + self.name + ' (\n'
-        result += string.join (map (lambda x: x.name, self.ports), ',')
-        result += ');\n'
+
+        out.append ('module ' + self.name + ' (\n')
+        out.append (','.join ([x.name for x in self.ports]))
+        out.append (');\n')
 
         # print port list
         for p in self.ports:
-            result += p.declaration() + '\n'
+            out.append (p.declaration() + '\n')
 
         # print net list
         for n in self.nets:
-            result += n.declaration() + '\n'
+            out.append (n.declaration() + '\n')
+
+        # create bus frontend and global logic
+        self.frontend.emit_logic (out)
+        self.emit_global_logic (out)
+        self.emit_read_mux (out)
+        if (self.interrupts > 0): self.emit_int_logic (out)
 
-        # create global logic
-        result += self.global_logic()
-        result += self.read_mux()
-        if (self.interrupts > 0): result += self.int_logic()
-        
         # print function blocks
         for r in self.registers:
-            result += r.verilog_body()
-            
-        result += 'endmodule\n'
-        return result
+            out.append (r.verilog_body())
+
+        out.append ('endmodule\n')
+        return out
+
+    # Python model of the group.  The generated class keeps every port
+    # and net as an attribute of the same name, with x held as None.
+    # eval() settles the combinational logic for the current inputs
+    # and state; clock() applies a rising edge of clk and settles
+    # again.  read() and write() perform a single clock bus access
+    # through the group's frontend.
+    def python (self):
+        return ''.join (self.emit_python ([]))
+
+    def emit_python (self, out):
+        self.post()
+        fe = self.frontend
+        lw = self.local_width
+        inputs = [p.name for p in self.ports if (p.direction == 'input') and (p.name != 'clk')]
+        outputs = [p.name for p in self.ports if p.direction == 'output']
+        def method (header, lines):
+            out.append ('\n    %s:\n' % header)
+            for l in lines:
+                out.append ('        ' + l + '\n')
+
+        out.append ('# Python model of %s generated by reglib\n' % self.name)
+        out.append ('class %s:\n' % self.name)
+        out.append ('    inputs = %r\n' % inputs)
+        out.append ('    outputs = %r\n' % outputs)
+
+        state = list (fe.py_state())
+        next = list (fe.py_next())
+        for r in self.registers:
+            state.extend (r.py_state())
+            next.extend (r.py_next())
+        if self.read_reg:
+            state.append (('rd_data', None))
+            next.append (('rd_data', 'self.rd_data_c'))
+        idle = fe.py_idle()
+        lines = ["self.%s = %r" % (name, idle.get (name, 0)) for name in inputs]
+        lines.extend (["self.%s = %r" % s for s in state])
+        lines.append ("self.eval()")
+        method ("def __init__ (self)", lines)
+
+        # combinational logic
+        lines = list (fe.py_comb())
+        addr = "((self.addr >> %d) & %d) == %d" % (lw, (1 << (self.addr_size - lw)) - 1,
+                                                  self.base_addr >> lw)
+        if not self.shared_select:
+            lines.append ("self.block_select = int (%s)" %
+                          ' and '.join (["(%s)" % addr] + fe.py_select_terms()))
+        for r in self.registers:
+            sel = "self.block_select and (self.addr & %d) == %d" % ((1 << lw) - 1, r.offset)
+            lines.append ("self.%s_rd_sel = int (%s and not self.rd_n)" % (r.name, sel))
+            if r.write_cap():
+                lines.append ("self.%s_wr_sel = int (%s and not self.wr_n)" % (r.name, sel))
+        int_regs = [r for r in self.registers if r.interrupt]
+        if int_regs:
+            for (i, r) in enumerate (int_regs):
+                lines.append ("%s self.%s_int: self.int_vec = %d" %
+                              (i and "elif" or "if", r.name, r.int_value & ((1 << self.data_size) - 1)))
+            lines.append ("else: self.int_vec = None")
+            lines.append ("self.int_n = int (not (%s))" %
+                          ' or '.join (["self.%s_int" % r.name for r in int_regs]))
+        lines.append ("self.doe = int (%s)" %
+                      ' or '.join (["self.%s_rd_sel" % r.name for r in self.registers]))
+        if self.read_reg: rd_data = 'rd_data_c'
+        else: rd_data = 'rd_data'
+        for (i, r) in enumerate (self.registers):
+            lines.append ("%s self.%s_rd_sel: self.%s = %s" %
+                          (i and "elif" or "if", r.name, rd_data, r.py_value()))
+        if self.interrupts: default = "self.int_vec"
+        elif (self.decode == 'parallel'): default = "0"
+        else: default = "None"
+        lines.append ("else: self.%s = %s" % (rd_data, default))
+        method ("def eval (self)", lines)
+
+        # clock edge: all next values are taken from the current state
+        lines = ["n%d = %s" % (i, n[1]) for (i, n) in enumerate (next)]
+        lines.extend (["self.%s = n%d" % (n[0], i) for (i, n) in enumerate (next)])
+        lines.append ("self.eval()")
+        method ("def clock (self)", lines)
+
+        select = []
+        if self.shared_select:
+            select = ["self.block_select = int (%s)" % addr.replace ("self.addr", "addr")]
+        release = fe.py_release()
+        if self.shared_select:
+            release = release + ["self.block_select = 0"]
+        lines = fe.py_request (1) + select + ["self.eval()", "self.clock()"] + release + ["self.eval()"]
+        method ("def write (self, addr, data)", lines)
+
+        lines = fe.py_request (0) + select + ["self.eval()"]
+        if fe.registered_read or self.read_reg:
+            lines.extend (["self.clock()", "data = self.%s" % fe.read_pin])
+        else:
+            lines.extend (["data = self.%s" % fe.read_pin, "self.clock()"])
+        lines.extend (release + ["self.eval()", "return data"])
+        method ("def read (self, addr)", lines)
+        return out
+
+    # compile the Python model and return its class
+    def model (self):
+        scope = {}
+        exec self.python() in scope
+        return scope[self.name]
 
     def add_register (self, type, params):
     #def add_register (self, name, type, width):
@@ -233,12 +593,30 @@ class register_group:
         self.registers.append (reg)
         self.ports.extend (reg.io())
         self.nets.extend (reg.nets())
-        self.local_width = int(math.ceil (log2 (len (self.registers))))
-        rnum = 0
-        for r in self.registers:
-            r.offset = rnum
-            rnum += 1
         
+# Module that decodes the block selects of several register groups
+# once, for groups generated with shared_select.
+def select_decoder (name, groups):
+    addr_size = max ([g.addr_size for g in groups])
+    ports = [port ('input', 'addr', addr_size)]
+    for g in groups:
+        g.post()
+        for p in g.frontend.select_inputs():
+            if p.name not in [x.name for x in ports]: ports.append (p)
+    ports.extend ([port ('output', g.name + '_select') for g in groups])
+
+    out = ['module ' + name + ' (\n']
+    out.append (','.join ([p.name for p in ports]))
+    out.append (');\n')
+    for p in ports:
+        out.append (p.declaration() + '\n')
+    for g in groups:
+        out.append (net ('reg', g.name + '_select').declaration() + '\n')
+    statements = ["%s_select = %s;" % (g.name, g.select_logic()) for g in groups]
+    emit_block (out, 'always @*\n', statements)
+    out.append ('endmodule\n')
+    return ''.join (out)
+
 class basic_register:
     def __init__ (self, name='', width=0):
         self.offset = 0
@@ -258,6 +636,20 @@ class basic_register:
     def write_cap (self):
         return 0
 
+    def mask (self):
+        return (1 << self.width) - 1
+
+    # Python model: state as (name, reset value), next state at the
+    # clock edge as (name, expression), and the value read back
+    def py_state (self):
+        return []
+
+    def py_next (self):
+        return []
+
+    def py_value (self):
+        return "self." + self.name
+
     def id_comment (self):
         return "// register: %s\n" % self.name
 
@@ -274,6 +666,9 @@ class status_reg (basic_register):
     def nets (self):
         return [ net('reg', self.name + '_rd_sel')]
 
+    def py_value (self):
+        return "(self.%s & %d)" % (self.name, self.mask())
+
 class config_reg (basic_register):
     def __init__ (self, name='', width=0, default=0):
         basic_register.__init__(self, name, width)
@@ -285,6 +680,13 @@ class config_reg (basic_register):
                       ]
         return self.id_comment() + seq_block ('clk', statements)
 
+    def py_state (self):
+        return [(self.name, self.default & self.mask())]
+
+    def py_next (self):
+        return [(self.name, "%d if self.reset else self.wr_data & %d if self.%s_wr_sel else self.%s" %
+                 (self.default & self.mask(), self.mask(), self.name, self.name))]
+
     def io (self):
         return [ port('output',self.name, self.width) ]
 
@@ -312,6 +714,15 @@ class int_fixed_reg (basic_register):
                       ]
         return self.id_comment() + seq_block ('clk', statements)
 
+    def py_state (self):
+        return [(self.name, 0), (self.name + '_int', 0)]
+
+    def py_next (self):
+        n = self.name
+        return [(n, "0 if self.reset else (self.%s_set | self.%s) & ~(self.wr_data if self.%s_wr_sel else 0) & %d" %
+                 (n, n, n, self.mask())),
+                (n + '_int', "0 if self.reset else int ((self.%s & ~self.%s) != 0)" % (n, self.mask_reg.name))]
+
     def io (self):
         return [ port('input',self.name+"_set", self.width) ]
 
@@ -337,6 +748,14 @@ class soft_set_reg (basic_register):
                       ]
         return self.id_comment() + seq_block ('clk', statements)
 
+    def py_state (self):
+        return [(self.name, self.default & self.mask())]
+
+    def py_next (self):
+        n = self.name
+        return [(n, "%d if self.reset else ((self.wr_data if self.%s_wr_sel else 0) | self.%s) & ~self.%s_clr & %d" %
+                 (self.default & self.mask(), n, n, n, self.mask()))]
+
     def io (self):
         return [ port('output',self.name, self.width),
                  port ('input',self.name+"_clr", self.width)]
@@ -362,6 +781,13 @@ class write_stb_reg (config_reg):
                       ]
         return seq_block ('clk', statements)
 
+    def py_state (self):
+        return config_reg.py_state (self) + [(self.name + '_stb', 0)]
+
+    def py_next (self):
+        return config_reg.py_next (self) + \
+               [(self.name + '_stb', "0 if self.reset else self.%s_wr_sel" % self.name)]
+
     def io (self):
         io_list = config_reg.io (self)
         io_list.append ( port('output',self.name+"_stb") )
@@ -384,6 +810,12 @@ class read_stb_reg (status_reg):
                       ]
         return self.id_comment() + seq_block ('clk', statements)
 
+    def py_state (self):
+        return [(self.name + '_stb', 0)]
+
+    def py_next (self):
+        return [(self.name + '_stb', "0 if self.reset else self.%s_rd_sel" % self.name)]
+
     def io (self):
         io_list = status_reg.io (self)
         io_list.append (port('output',self.name+"_stb"))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Generation-time benchmark for reglib: builds register groups of
+# increasing size from a repeating mix of register types and times
+# post() and Verilog emission.  The time per register should stay
+# flat as the group grows.
+
+import sys, time, getopt
+import reglib
+
+reg_mix = [('config',    { 'width' : 8, 'default' : 0 }),
+           ('status',    { 'width' : 8 }),
+           ('int_fixed', { 'width' : 4, 'default' : 0, 'int_value' : "8'hcf" }),
+           ('soft_set',  { 'width' : 1, 'default' : 0 }),
+           ('read_stb',  { 'width' : 8 }),
+           ('write_stb', { 'width' : 8, 'default' : 0 })]
+
+# a register group with count registers
+def synthetic_group (count):
+    rg = reglib.register_group()
+    rg.name = "bench_regs_%d" % count
+    rg.addr_size = 16
+    rg.base_addr = 0
+    n = 0
+    while (len (rg.registers) < count):
+        (type, params) = reg_mix[n % len (reg_mix)]
+        params = dict (params)
+        params['name'] = "r%d" % n
+        rg.add_register (type, params)
+        n += 1
+    return rg
+
+# (registers, build secs, emit secs, output bytes) for one size
+def measure (count):
+    start = time.time()
+    rg = synthetic_group (count)
+    built = time.time()
+    text = rg.verilog()
+    done = time.time()
+    return (len (rg.registers), built - start, done - built, len (text))
+
+def print_help ():
+    print "Usage: reglib_bench.py [-h] [sizes...]"
+    print "  sizes : register counts to generate (default 100 1000 10000)"
+    print "  -h    : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "h")
+    if options:
+        print_help()
+    sizes = [int (a) for a in args] or [100, 1000, 10000]
+
+    print "%8s %10s %10s %12s %10s" % ("regs", "build s", "emit s", "us/reg", "bytes")
+    for size in sizes:
+        (regs, build, emit, size) = measure (size)
+        print "%8d %10.3f %10.3f %12.1f %10d" % (regs, build, emit,
+                                                 1e6 * (build + emit) / regs, size)
+
+if __name__ == '__main__':
+    cmdline()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Cache of regression results, keyed on a hash of everything that can
+# change the outcome of a simulation: the program image, the design
+# and environment sources, the simulator and its command line.  Each
+# entry is a directory holding the simulation log and a result file
+# with the verdict and runtime.  When the cache grows past max_size
+# bytes the least recently used entries are removed.
+
+import os, shutil
+import simlib
+
+class result_cache:
+    def __init__ (self, path="build/cache", max_size=64*1024*1024):
+        self.path = path
+        self.max_size = max_size
+
+    # files are hashed with their paths, images by content only, so
+    # the same image built in different directories shares an entry
+    def key (self, files, extra='', images=[]):
+        return simlib.hash_files (files, extra, images)
+
+    def entry (self, key):
+        return os.path.join (self.path, key)
+
+    # return (status, runtime) for a cached result, restoring its log
+    # to logfile, or None on a miss
+    def lookup (self, key, logfile=None):
+        try:
+            fh = open (os.path.join (self.entry (key), "result"), "r")
+            (status, runtime) = fh.read().split()
+            fh.close()
+        except (IOError, ValueError):
+            return None
+        os.utime (self.entry (key), None)
+        if logfile:
+            shutil.copyfile (os.path.join (self.entry (key), "log"), logfile)
+        return (status, float (runtime))
+
+    def store (self, key, status, runtime, logfile):
+        edir = self.entry (key)
+        if not os.path.isdir (edir):
+            os.makedirs (edir)
+        shutil.copyfile (logfile, os.path.join (edir, "log"))
+        fh = open (os.path.join (edir, "result"), "w")
+        fh.write ("%s %.2f\n" % (status, runtime))
+        fh.close()
+
+    # remove least recently used entries until the cache fits in
+    # max_size bytes
+    def evict (self):
+        if not os.path.isdir (self.path): return
+        entries = []
+        total = 0
+        for key in os.listdir (self.path):
+            edir = self.entry (key)
+            size = 0
+            for f in os.listdir (edir):
+                size += os.path.getsize (os.path.join (edir, f))
+            entries.append ((os.path.getmtime (edir), size, edir))
+            total += size
+        entries.sort()
+        while (total > self.max_size) and entries:
+            (mtime, size, edir) = entries.pop (0)
+            shutil.rmtree (edir)
+            total -= size
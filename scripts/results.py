@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Regression result handling: parse simulation logs into structured
+# results, write them as JSON or JUnit XML, and keep a history of
+# per-test cycle counts and runtimes.
+
+import os, re, sys, time, getopt, json
+from xml.sax.saxutils import quoteattr, escape
+
+# clock period of tb_top, in simulation time units
+clock_period = 10
+history_file = "logs/history"
+
+time_re       = re.compile (r"^\s*(\d+):")
+passed_re     = re.compile (r"TEST PASSED")
+failed_re     = re.compile (r"TEST FAILED")
+error_re      = re.compile (r"ERROR\s*:\s*(.*)")
+timeout_re    = re.compile (r"Reached timeout")
+program_re    = re.compile (r"PROGRAM\s*:\s?(.*)")
+supervisor_re = re.compile (r"^SUPERVISOR : status (\S+), wall time ([\d.]+)s")
+
+class test_result:
+    def __init__ (self, name):
+        self.name     = name
+        self.status   = "no log file"
+        self.sim_time = 0
+        self.cycles   = 0
+        self.timeouts = 0
+        self.errors   = []
+        self.messages = []
+        self.wall     = 0.0
+
+    def as_dict (self):
+        return { "name" : self.name, "status" : self.status,
+                 "sim_time" : self.sim_time, "cycles" : self.cycles,
+                 "timeouts" : self.timeouts, "errors" : self.errors,
+                 "messages" : self.messages, "wall" : self.wall }
+
+# Parse one simulation log.  The verdict comes from the TEST PASSED /
+# TEST FAILED lines, or from the supervisor line when the run was
+# killed before reaching one.
+def parse_log (logfile, name=None):
+    if name == None:
+        name = os.path.basename (logfile).rsplit ('.', 1)[0]
+    result = test_result (name)
+    try:
+        fh = open (logfile, "r")
+    except IOError:
+        return result
+
+    result.status = "crashed"
+    for line in fh:
+        mobj = time_re.match (line)
+        if (mobj):
+            result.sim_time = int (mobj.group(1))
+            pobj = program_re.search (line)
+            if (pobj):
+                result.messages.append (pobj.group(1).rstrip())
+            elif passed_re.search (line):
+                result.status = "passed"
+            elif failed_re.search (line):
+                result.status = "failed"
+            else:
+                eobj = error_re.search (line)
+                if (eobj):
+                    result.errors.append (eobj.group(1).rstrip())
+                    if timeout_re.search (line):
+                        result.timeouts += 1
+            continue
+        mobj = supervisor_re.match (line)
+        if (mobj):
+            result.wall = float (mobj.group(2))
+            if result.status not in ("passed", "failed"):
+                result.status = mobj.group(1)
+    fh.close()
+
+    result.cycles = result.sim_time / clock_period
+    return result
+
+def write_json (results, filename):
+    fh = open (filename, "w")
+    json.dump ([r.as_dict() for r in results], fh, indent=1)
+    fh.close()
+
+def write_junit (results, filename, suite="tv80"):
+    failures = len ([r for r in results if r.status == "failed"])
+    errors = len ([r for r in results if r.status not in ("passed", "failed")])
+    wall = sum ([r.wall for r in results])
+    fh = open (filename, "w")
+    fh.write ('<?xml version="1.0" encoding="UTF-8"?>\n')
+    fh.write ('<testsuite name=%s tests="%d" failures="%d" errors="%d" time="%.2f">\n' %
+              (quoteattr (suite), len(results), failures, errors, wall))
+    for r in results:
+        fh.write ('  <testcase classname=%s name=%s time="%.2f">\n' %
+                  (quoteattr (suite), quoteattr (r.name), r.wall))
+        if (r.status == "failed"):
+            fh.write ('    <failure message=%s/>\n' % quoteattr ("; ".join (r.errors) or "TEST FAILED"))
+        elif (r.status != "passed"):
+            fh.write ('    <error message=%s/>\n' % quoteattr (r.status))
+        fh.write ('    <system-out>%s</system-out>\n' % escape ("\n".join (r.messages)))
+        fh.write ('  </testcase>\n')
+    fh.write ('</testsuite>\n')
+    fh.close()
+
+# The history holds one line per test run:
+#   <unix time> <test> <status> <cycles> <wall seconds>
+def append_history (results, filename=history_file):
+    now = int (time.time())
+    fh = open (filename, "a")
+    for r in results:
+        fh.write ("%d %s %s %d %.2f\n" % (now, r.name, r.status, r.cycles, r.wall))
+    fh.close()
+
+# return { test : [(time, status, cycles, wall), ...] }, oldest first
+def load_history (filename=history_file):
+    history = {}
+    try:
+        fh = open (filename, "r")
+    except IOError:
+        return history
+    for line in fh:
+        f = line.split()
+        if len(f) != 5: continue
+        history.setdefault (f[1], []).append ((int(f[0]), f[2], int(f[3]), float(f[4])))
+    fh.close()
+    return history
+
+def median (values):
+    values = sorted (values)
+    return values[len(values) / 2]
+
+# Compare the latest passing run of each test against the median of
+# its earlier passing runs, and flag tests whose cycle count or wall
+# time grew by more than threshold (a fraction).
+def history_report (history, runs=10, threshold=0.1):
+    print "%-20s %5s %10s %10s %8s %8s" % ("Test", "Runs", "Cycles", "Median", "Wall", "Median")
+    flagged = 0
+    for test_name in sorted (history.keys()):
+        passed = [h for h in history[test_name] if h[1] == "passed"][-runs:]
+        if len(passed) == 0: continue
+        last = passed[-1]
+        prev = passed[:-1] or passed
+        mcycles = median ([h[2] for h in prev])
+        mwall = median ([h[3] for h in prev])
+        note = ""
+        if (last[2] > mcycles * (1 + threshold)):
+            note += " cycles up %d%%" % ((last[2] - mcycles) * 100 / max (mcycles, 1))
+        if (last[3] > mwall * (1 + threshold)) and (last[3] - mwall > 1.0):
+            note += " wall up %d%%" % ((last[3] - mwall) * 100 / max (mwall, 0.01))
+        if note: flagged += 1
+        print "%-20s %5d %10d %10d %8.1f %8.1f%s" % (test_name, len(passed), last[2], mcycles, last[3], mwall, note)
+    return flagged
+
+def print_help ():
+    print "Usage: results.py [-h] [-n runs] [-t threshold] [history file]"
+    print "  -n : number of recent passing runs to compare (default 10)"
+    print "  -t : allowed growth before a test is flagged (default 0.1)"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hn:t:")
+    runs = 10
+    threshold = 0.1
+    for option in options:
+        if option[0] == "-n":
+            runs = int (option[1])
+        elif option[0] == "-t":
+            threshold = float (option[1])
+        else:
+            print_help()
+    if len(args) > 0:
+        history = load_history (args[0])
+    else:
+        history = load_history()
+    if history_report (history, runs, threshold):
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
@@ -21,36 +21,56 @@
 
 # This script generates I/O mapped control and status registers based
 # on an XML configuration file.
+#
+# Any number of files may be given.  They are parsed with iterparse,
+# so each tv_registers block is generated and dropped as soon as its
+# end tag is read, and with -j several files are processed in
+# parallel.  A block's Verilog file is only rewritten when its content
+# changes, so unchanged blocks do not retrigger downstream builds.
+# With -d a make dependency manifest is written, listing each
+# generated file against its spec and the generator scripts.
+#
+# Optional tv_registers attributes select the read path: decode=
+# "priority" or "parallel", read_reg="1" for a registered read, and
+# select="shared" to take block_select from a decoder generated for
+# all such blocks of the file as <spec>_select.v.  -r reports the
+# estimated read path depth of each option.
+#
+# bus= picks the bus frontend: "tv80" (the default) for the TV80 pins
+# or "wishbone" for a pipelined Wishbone B4 slave.  mem_mapped="1"
+# decodes memory rather than I/O cycles.
+#
+# With -p a Python model of each block is written next to its Verilog
+# as <name>.py (see register_group.python in reglib).
 
 import reglib
-import xml.dom.minidom
-import sys, os, re
+import xml.etree.cElementTree as ElementTree
+import sys, os, getopt, hashlib, multiprocessing
 
-def node_info (node):
-    print "Methods:",dir(node)
-    print "Child Nodes:",node.childNodes
+# generator sources every output depends on
+generator_files = [os.path.abspath (__file__).replace (".pyc", ".py"),
+                   os.path.abspath (reglib.__file__).replace (".pyc", ".py")]
 
 def create_reg_group (node):
-    rg = reglib.register_group()
+    rg = reglib.register_group (int (node.get ("mem_mapped", "0")))
 
-    rg.name = node.getAttribute ("name")
-    rg.addr_size = reglib.number(node.getAttribute ("addr_sz"))
-    rg.base_addr = reglib.number(node.getAttribute ("base_addr"))
+    rg.name = node.get ("name", "")
+    rg.addr_size = reglib.number(node.get ("addr_sz", ""))
+    rg.base_addr = reglib.number(node.get ("base_addr", ""))
+    rg.decode = node.get ("decode", "priority")
+    rg.read_reg = int (node.get ("read_reg", "0"))
+    rg.shared_select = (node.get ("select", "local") == "shared")
+    rg.bus = node.get ("bus", "tv80")
 
     return rg
 
 def create_register (rg, node):
     params = {}
-    params['name'] = node.getAttribute ("name")
-    type = node.getAttribute ("type")
-    params['width'] = int(node.getAttribute ("width"))
-    params['default'] = node.getAttribute ("default")
-    params['int_value'] = node.getAttribute ("int_value")
-
-    # May switch to this code later for a more general implementation
-    #for anode in node.childNodes:
-    #    if anode.nodeType = anode.ATTRIBUTE_NODE:
-    #        params[anode.nodeName] = anode.nodeValue
+    params['name'] = node.get ("name", "")
+    type = node.get ("type", "")
+    params['width'] = int(node.get ("width", ""))
+    params['default'] = node.get ("default", "")
+    params['int_value'] = node.get ("int_value", "")
 
     if type == '': type = 'config'
     if params['default'] == '': params['default'] = 0
@@ -61,28 +81,118 @@ def create_register (rg, node):
 def create_verilog (top_node):
     rg = create_reg_group (top_node)
 
-    # get list of register nodes
-    reg_nodes = top_node.getElementsByTagName ("register")
-
-    for r in reg_nodes:
+    for r in top_node.iter ("register"):
         create_register (rg, r)
 
-    fname = rg.name + ".v"
+    return rg
+
+# Write text to fname unless the file already holds the same content.
+# Returns 1 if the file was written.
+def write_if_changed (fname, text):
+    if os.path.exists (fname):
+        old = hashlib.sha1 (open (fname, "rb").read()).hexdigest()
+        if (old == hashlib.sha1 (text).hexdigest()):
+            return 0
     fh = open (fname, 'w')
-    fh.write (rg.verilog())
+    fh.write (text)
     fh.close()
-
-def parse_file (filename):
-    rdoc = xml.dom.minidom.parse (filename)
-    blk_list = rdoc.getElementsByTagName ("tv_registers")
-
-    for blk in blk_list:
-        create_verilog (blk)
-    
-    rdoc.unlink()
-
-if (len (sys.argv) > 1):
-    parse_file (sys.argv[1])
-else:
-    print "Usage: %s <filename>" % os.path.basename (sys.argv[0])
-
+    return 1
+
+# Generate every tv_registers block of one file into outdir.  Returns
+# (filename, [(output file, written)], depth report).
+def parse_file (filename, outdir=".", report=0, model=0):
+    outputs = []
+    shared = []
+    reports = []
+    for (event, elem) in ElementTree.iterparse (filename):
+        if (elem.tag == "tv_registers"):
+            rg = create_verilog (elem)
+            fname = os.path.join (outdir, rg.name + ".v")
+            outputs.append ((fname, write_if_changed (fname, rg.verilog())))
+            if model:
+                fname = os.path.join (outdir, rg.name + ".py")
+                outputs.append ((fname, write_if_changed (fname, rg.python())))
+            if rg.shared_select:
+                shared.append (rg)
+            if report:
+                reports.append (rg.depth_report())
+            elem.clear()
+    if shared:
+        name = os.path.splitext (os.path.basename (filename))[0] + "_select"
+        fname = os.path.join (outdir, name + ".v")
+        outputs.append ((fname, write_if_changed (fname, reglib.select_decoder (name, shared))))
+    return (filename, outputs, ''.join (reports))
+
+def parse_worker (args):
+    try:
+        return parse_file (*args)
+    except (ElementTree.ParseError, IOError), msg:
+        return (args[0], str (msg), '')
+
+# make rules: each generated file depends on its spec and the generator
+def write_manifest (fname, results):
+    lines = []
+    for (spec, outputs, report) in results:
+        for (vfile, written) in outputs:
+            lines.append ("%s: %s %s\n" % (vfile, spec, " ".join (generator_files)))
+    write_if_changed (fname, "".join (lines))
+
+def print_help ():
+    print "Usage: %s [-hrp] [-j N] [-o dir] [-d manifest] <filename>..." % os.path.basename (sys.argv[0])
+    print "  -j : process N files in parallel"
+    print "  -o : write generated Verilog to dir (default .)"
+    print "  -d : write make dependencies of the generated files to manifest"
+    print "  -r : report the estimated read path depth of each decode option"
+    print "  -p : also write a Python model of each block"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hrpj:o:d:")
+    jobs = 1
+    outdir = "."
+    manifest = None
+    report = 0
+    model = 0
+    for option in options:
+        if option[0] == "-j":
+            jobs = int (option[1])
+        elif option[0] == "-o":
+            outdir = option[1]
+        elif option[0] == "-d":
+            manifest = option[1]
+        elif option[0] == "-r":
+            report = 1
+        elif option[0] == "-p":
+            model = 1
+        else:
+            print_help()
+    if len(args) == 0:
+        print_help()
+    if not os.path.isdir (outdir):
+        os.makedirs (outdir)
+
+    work = [(f, outdir, report, model) for f in args]
+    if (jobs > 1) and (len (work) > 1):
+        pool = multiprocessing.Pool (min (jobs, len (work)))
+        results = pool.map (parse_worker, work)
+        pool.close()
+        pool.join()
+    else:
+        results = map (parse_worker, work)
+
+    errors = [r for r in results if isinstance (r[1], str)]
+    for (spec, msg, report) in errors:
+        print "ERROR: %s: %s" % (spec, msg)
+    results = [r for r in results if not isinstance (r[1], str)]
+    for (spec, outputs, report) in results:
+        for (vfile, written) in outputs:
+            if written: print "%s: wrote %s" % (spec, vfile)
+        sys.stdout.write (report)
+    if manifest:
+        write_manifest (manifest, results)
+    if errors:
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
@@ -19,18 +19,71 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+# Split an Intel Hex image into one vmem file per memory region.
+# By default the ROM/RAM layout of the test environment is used
+# (doc/env_io_map.txt); other layouts can be given as a region file
+# (-c) or as individual regions (-r name:start:stop).  All region
+# files are written in a single pass over the image.  Data above the
+# highest region (or the 64K Z80 address space, if that is higher) is
+# rejected unless a larger limit is given with -l.
+
 import mem_image
-import sys
+import sys, getopt
+
+def print_help ():
+    print "Usage: s80_convert.py [-hd] [-w width] [-l limit] [-c regionfile] [-r name:start:stop] [<ihx file> [<basename>]]"
+    print "  -c : read region map from file (lines of: name start stop)"
+    print "  -r : add region, addresses in hex (may be repeated)"
+    print "  -d : dense vmem, one address directive per contiguous block"
+    print "  -w : dense vmem packed into 16, 32 or 64 bit words"
+    print "  -l : reject data at or above this address, in hex"
+    print "       (default: end of the highest region, at least %x)" % mem_image.default_limit
+    print "  -h : option help (this list)"
+    print "Region files are written as <basename>_<name>.vmem"
+    sys.exit(0)
 
-ram_start = 0x8000
-ram_end   = 0xffff
-rom_start = 0x0000
-rom_end   = 0x7fff
 src_file  = "tests/tvs80.ihx"
-rom_file  = "tests/tvs80_rom.vmem"
-ram_file  = "tests/tvs80_ram.vmem"
+basename  = "tests/tvs80"
+regions   = []
+format    = 'byte'
+width     = 8
+limit     = None
+
+(options, args) = getopt.getopt (sys.argv[1:], "hdc:r:w:l:")
+for option in options:
+    if option[0] == "-c":
+        regions.extend (mem_image.load_regions (option[1]))
+    elif option[0] == "-r":
+        regions.append (mem_image.parse_region (option[1]))
+    elif option[0] == "-d":
+        format = 'dense'
+    elif option[0] == "-w":
+        format = 'dense'
+        width = int(option[1])
+        if width not in (8, 16, 32, 64):
+            print "ERROR: unsupported word width", width
+            sys.exit(1)
+    elif option[0] == "-l":
+        limit = int(option[1], 16)
+    else:
+        print_help()
+
+if len(args) > 0:
+    src_file = args[0]
+    basename = src_file.rsplit ('.', 1)[0]
+if len(args) > 1:
+    basename = args[1]
+if len(regions) == 0:
+    regions = mem_image.default_regions
+
+if (limit == None):
+    limit = max ([mem_image.default_limit] + [stop + 1 for (name, start, stop) in regions])
 
-conv = mem_image.mem_image()
-conv.load_ihex (src_file)
-conv.save_vmem (rom_file, rom_start, rom_end)
-conv.save_vmem (ram_file, ram_start, ram_end)
+conv = mem_image.mem_image(limit=limit)
+try:
+    conv.load_ihex (src_file)
+except mem_image.ihex_error, msg:
+    print "ERROR:", msg
+    sys.exit(1)
+conv.save_regions ([(start, stop, "%s_%s.vmem" % (basename, name))
+                    for (name, start, stop) in regions], format, width)
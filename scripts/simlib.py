@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Common code for the simulation scripts (run, regression).  All paths
+# are relative to the top of the source tree.
+
+import os, re, string, time, signal, shutil, hashlib, subprocess
+import threading, collections
+
+simulator = "cver"
+filelist = "env/tb.vf"
+incdir = "env"
+
+# return the list of source files named in a Verilog file list
+def read_filelist (vf=filelist):
+    text = open (vf, 'r').read()
+    text = re.sub (r"(?s)/\*.*?\*/", "", text)
+    files = []
+    for line in text.split ('\n'):
+        line = line.split ('//')[0].strip()
+        if (line != ''): files.append (line)
+    return files
+
+# return every file the testbench is built from: the file list plus
+# any files it pulls in with `include
+def design_files (vf=filelist):
+    files = read_filelist (vf)
+    for f in files[:]:
+        for inc in re.findall (r'`include\s+"([^"]+)"', open (f, 'r').read()):
+            path = os.path.join (incdir, inc)
+            if os.path.exists (path) and path not in files:
+                files.append (path)
+    return files
+
+# build the memory image for a test, in the tests directory or in a
+# separate build directory
+def build_image (testname, builddir="tests", stdout=None):
+    command = ["make", "-C", builddir]
+    if builddir != "tests":
+        srcdir = os.path.abspath ("tests")
+        if not os.path.isdir (builddir):
+            os.makedirs (builddir)
+        command.extend (["-f", srcdir + "/Makefile", "SRCDIR=" + srcdir])
+    command.append (testname + ".vmem")
+    return subprocess.call (command, stdout=stdout, stderr=stdout)
+
+# run-time arguments for a simulation of testname with the given
+# program image, and optionally a RAM image
+def plusargs (testname, program, trace=0, dump_start=None, ram=None):
+    args = ["+PROGRAM_FILE=" + program,
+            "+DUMPFILE_NAME=logs/%s.dump" % testname]
+    if ram:
+        args.append ("+RAM_FILE=" + ram)
+    if trace:
+        args.append ("+TRACE")
+    if dump_start != None:
+        args.append ("+DUMP_START=%s" % dump_start)
+    return args
+
+# hash the paths and contents of a list of files, plus an optional
+# string; the files in contents are hashed without their paths
+def hash_files (files, extra='', contents=[]):
+    h = hashlib.sha1 (extra)
+    for f in files:
+        h.update (f + '\0')
+        fh = open (f, 'rb')
+        h.update (fh.read())
+        fh.close()
+    for f in contents:
+        fh = open (f, 'rb')
+        h.update (hashlib.sha1 (fh.read()).digest())
+        fh.close()
+    return h.hexdigest()
+
+# Outcome of a supervised simulation run
+class sim_result:
+    def __init__ (self):
+        self.status = "crashed"
+        self.errors = 0
+        self.lines  = 0
+        self.bytes  = 0
+        self.wall   = 0.0
+        self.rc     = None
+        self.tail   = collections.deque ([], 20)
+
+# The verdict lines, and ERROR lines in the "<time>: ERROR   :"
+# severity format of the environment; text a program prints through
+# the message port follows "PROGRAM :" and is not counted.
+verdict_re = re.compile (r"TEST PASSED|TEST FAILED|^\s*\d+: ERROR\b")
+
+# seconds a simulator is given to reach $finish after the verdict
+finish_grace = 10
+
+# Run a simulator, streaming its output into logfile (and to stdout,
+# if given) as it arrives.  Once the test passes or fails the
+# simulator is left to finish (flushing its log and any dump) for up
+# to finish_grace seconds before it is killed.  It is also killed when
+# it has run for wall_limit seconds, or when it has written more than
+# output_limit bytes.  A SUPERVISOR line with the outcome is appended
+# to the log.
+def supervise (command, logfile, stdout=None, wall_limit=0, output_limit=0):
+    result = sim_result()
+    lfh = open (logfile, 'w')
+    start = time.time()
+    # the simulator runs in its own process group, so that killing it
+    # also stops any processes it has started
+    proc = subprocess.Popen (command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             preexec_fn=os.setsid)
+
+    def kill ():
+        try:
+            os.killpg (proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+    def watchdog ():
+        if (proc.poll() == None):
+            if (result.status == "crashed"):
+                result.status = "timeout"
+            kill()
+
+    timer = None
+    if (wall_limit > 0):
+        timer = threading.Timer (wall_limit, watchdog)
+        timer.start()
+
+    grace = None
+    for line in iter (proc.stdout.readline, ''):
+        lfh.write (line)
+        if stdout: stdout.write (line)
+        result.lines += 1
+        result.bytes += len(line)
+        result.tail.append (line)
+
+        mobj = verdict_re.search (line)
+        if (mobj):
+            if (mobj.group() in ("TEST PASSED", "TEST FAILED")):
+                if (grace == None):
+                    result.status = (mobj.group() == "TEST PASSED") and "passed" or "failed"
+                    grace = threading.Timer (finish_grace, kill)
+                    grace.start()
+            else:
+                result.errors += 1
+        if (output_limit > 0) and (result.bytes > output_limit):
+            if (grace == None):
+                result.status = "overflow"
+            break
+
+    if timer: timer.cancel()
+    if grace: grace.cancel()
+    kill()
+    result.rc = proc.wait()
+    result.wall = time.time() - start
+
+    lfh.write ("SUPERVISOR : status %s, wall time %.2fs, %d errors\n" % (result.status, result.wall, result.errors))
+    lfh.close()
+    return result
+
+# Simulator backends.  The testbench is compiled once for each hash of
+# the design sources and the compiled model is kept under
+# build/sim/<simulator>-<hash>; tests then only pass their program
+# image and options to the model as plusargs.
+class sim_backend:
+    name = ''
+
+    def __init__ (self, builddir="build/sim"):
+        self.builddir = builddir
+
+    def model_dir (self):
+        return os.path.join (self.builddir, "%s-%s" % (self.name, hash_files (design_files(), self.name)[:16]))
+
+    def compile_command (self, mdir):
+        return None
+
+    def compile (self):
+        mdir = self.model_dir()
+        command = self.compile_command (mdir + ".tmp")
+        if (command == None) or os.path.isdir (mdir):
+            return 0
+
+        # build in a scratch directory, so that an interrupted or
+        # concurrent compile never leaves a half-built model behind
+        if os.path.isdir (mdir + ".tmp"):
+            shutil.rmtree (mdir + ".tmp")
+        os.makedirs (mdir + ".tmp")
+        print "compile:", string.join (command)
+        rc = subprocess.call (command)
+        if (rc == 0):
+            os.rename (mdir + ".tmp", mdir)
+        return rc
+
+    def run_command (self, mdir, args):
+        return []
+
+    def run (self, logfile, args, stdout=None, wall_limit=0, output_limit=0):
+        if (self.compile() != 0):
+            result = sim_result()
+            result.status = "compile failed"
+            return result
+        command = self.run_command (self.model_dir(), args)
+        print "command:", string.join (command)
+        return supervise (command, logfile, stdout, wall_limit, output_limit)
+
+# GPL Cver is an interpreter, so there is nothing to compile
+class cver_backend (sim_backend):
+    name = "cver"
+
+    # the supervisor writes the log, so cver's own log is discarded
+    def run_command (self, mdir, args):
+        return ["cver", "-f", filelist, "+incdir+" + incdir, "-l", "/dev/null"] + args
+
+class icarus_backend (sim_backend):
+    name = "icarus"
+
+    def compile_command (self, mdir):
+        return ["iverilog", "-o", os.path.join (mdir, "tb_top.vvp"),
+                "-I", incdir, "-s", "tb_top"] + read_filelist()
+
+    def run_command (self, mdir, args):
+        return ["vvp", os.path.join (mdir, "tb_top.vvp")] + args
+
+class verilator_backend (sim_backend):
+    name = "verilator"
+
+    def compile_command (self, mdir):
+        return ["verilator", "--binary", "--timing", "-Wno-fatal",
+                "-I" + incdir, "--top-module", "tb_top",
+                "-Mdir", mdir, "-o", "Vtb_top"] + read_filelist()
+
+    def run_command (self, mdir, args):
+        return [os.path.join (mdir, "Vtb_top")] + args
+
+backends = { "cver" : cver_backend,
+             "icarus" : icarus_backend,
+             "verilator" : verilator_backend }
+
+def backend (name=simulator):
+    return backends[name]()
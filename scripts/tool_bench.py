@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Speed and memory benchmark of the Python toolchain.
+#
+# Synthetic inputs are generated from a fixed seed into the work
+# directory: a full 64K Intel Hex image, a sparse one, and register
+# specs of 10 to 10000 registers.  Each benchmark runs in a process of
+# its own, so its peak memory is the maxrss the kernel reports for
+# that process.  Command line tools (ihex2mem.py, s80_convert.py,
+# rgen.py) are timed as a whole, start-up included, since that is how
+# the flow runs them; library calls (mem_image, reglib) are timed
+# around the call only, repeated for at least min_time.  The best of
+# several runs is kept.
+#
+# Results can be saved as the baseline (-s).  A later run compares
+# against the baseline and fails when any benchmark takes more than
+# the threshold (-t) longer.  Baselines only compare on the host they
+# were taken on.
+
+import sys, os, time, getopt, json, random, fnmatch, subprocess
+import mem_image, reglib_bench
+
+work_dir = "build/bench"
+baseline_file = "logs/bench_baseline.json"
+seed = 1
+reg_counts = [10, 100, 1000, 10000]
+
+# name, kind, arguments, units processed, unit name.  cli arguments
+# are a command line, lib arguments the name of a library benchmark
+# and its parameter.  {dir} is replaced by the work directory.
+benchmarks = [
+    ("ihex2mem_full",    "cli", ["scripts/ihex2mem.py", "{dir}/full.ihx", "{dir}/full.vmem"], 0x10000, "B"),
+    ("ihex2mem_sparse",  "cli", ["scripts/ihex2mem.py", "{dir}/sparse.ihx", "{dir}/sparse.vmem"], 0x1000, "B"),
+    ("ihex2mem_dense32", "cli", ["scripts/ihex2mem.py", "-w", "32", "{dir}/full.ihx", "{dir}/full32.vmem"], 0x10000, "B"),
+    ("load_ihex_full",   "lib", ["load_ihex", "full"], 0x10000, "B"),
+    ("load_ihex_sparse", "lib", ["load_ihex", "sparse"], 0x1000, "B"),
+    ("save_vmem_full",   "lib", ["save_vmem", "full"], 0x10000, "B"),
+    ("save_vmem_sparse", "lib", ["save_vmem", "sparse"], 0x1000, "B"),
+    ("s80_convert_full", "cli", ["scripts/s80_convert.py", "{dir}/full.ihx", "{dir}/s80"], 0x10000, "B"),
+    ]
+for n in reg_counts:
+    benchmarks.append (("rgen_%d" % n, "cli", ["scripts/rgen.py", "-o", "{dir}", "{dir}/regs_%d.xml" % n], n, "reg"))
+for n in reg_counts:
+    benchmarks.append (("reglib_%d" % n, "lib", ["reglib", str (n)], n, "reg"))
+
+#----------------------------------------------------------------------
+# synthetic inputs
+#----------------------------------------------------------------------
+
+# 64K of random data
+def full_image (rng):
+    image = mem_image.mem_image()
+    image.write (0, bytearray (rng.getrandbits (8) for i in xrange (0x10000)))
+    return image
+
+# 4K of random data in 128 blocks of 32 bytes, scattered over 64K
+def sparse_image (rng):
+    image = mem_image.mem_image()
+    for block in sorted (rng.sample (xrange (0x800), 128)):
+        image.write (block * 32, bytearray (rng.getrandbits (8) for i in xrange (32)))
+    return image
+
+# a tv_registers spec of count registers of the reglib_bench mix
+def register_spec (count):
+    lines = ['<tv_registers name="bench_regs_%d" addr_sz="16" base_addr="0">\n' % count]
+    mix = reglib_bench.reg_mix
+    for n in xrange (count):
+        (type, params) = mix[n % len (mix)]
+        attrs = ' '.join (['%s="%s"' % (k, params[k]) for k in sorted (params.keys())])
+        lines.append ('  <register name="r%d" type="%s" %s/>\n' % (n, type, attrs))
+    lines.append ('</tv_registers>\n')
+    return ''.join (lines)
+
+def make_inputs (dirname):
+    if not os.path.isdir (dirname):
+        os.makedirs (dirname)
+    rng = random.Random (seed)
+    full_image (rng).save_ihex (os.path.join (dirname, "full.ihx"))
+    sparse_image (rng).save_ihex (os.path.join (dirname, "sparse.ihx"))
+    for n in reg_counts:
+        fh = open (os.path.join (dirname, "regs_%d.xml" % n), "w")
+        fh.write (register_spec (n))
+        fh.close()
+
+#----------------------------------------------------------------------
+# running
+#----------------------------------------------------------------------
+
+# seconds a library benchmark is repeated for, so that short calls
+# are not lost in the timer resolution
+min_time = 0.2
+
+# changes smaller than this many seconds are never counted as slower
+min_change = 0.005
+
+# Run a library benchmark in this process and return the mean seconds
+# the call took
+def run_lib (dirname, name, param):
+    total = 0.0
+    calls = 0
+    while (total < min_time):
+        if (name == "reglib"):
+            (regs, build, emit, size) = reglib_bench.measure (int (param))
+            total += build + emit
+        else:
+            infile = os.path.join (dirname, param + ".ihx")
+            image = mem_image.mem_image()
+            if (name == "save_vmem"):
+                image.load_ihex (infile)
+                outfile = os.path.join (dirname, param + "_lib.vmem")
+                start = time.time()
+                image.save_vmem (outfile, 0)
+            else:
+                start = time.time()
+                image.load_ihex (infile)
+            total += time.time() - start
+        calls += 1
+    return total / calls
+
+# Run one benchmark in a child process.  Returns (seconds, peak KB),
+# or None if the child failed.
+def run_one (bench, dirname):
+    (name, kind, args, units, unit) = bench
+    if (kind == "cli"):
+        command = [sys.executable] + [a.replace ("{dir}", dirname) for a in args]
+    else:
+        command = [sys.executable, os.path.abspath (__file__), "-o", dirname, "-x", name]
+    start = time.time()
+    child = subprocess.Popen (command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    out = child.stdout.read()
+    (pid, status, usage) = os.wait4 (child.pid, 0)
+    secs = time.time() - start
+    child.returncode = status
+    if status:
+        sys.stdout.write (out)
+        return None
+    if (kind == "lib"):
+        secs = float (out.split()[-1])
+    return (secs, usage.ru_maxrss)
+
+def load_baseline (filename):
+    try:
+        fh = open (filename)
+    except IOError:
+        return {}
+    baseline = json.load (fh)
+    fh.close()
+    return baseline
+
+def save_baseline (filename, baseline):
+    dirname = os.path.dirname (filename)
+    if dirname and not os.path.isdir (dirname):
+        os.makedirs (dirname)
+    fh = open (filename, "w")
+    json.dump (baseline, fh, indent=1, sort_keys=True)
+    fh.close()
+
+def rate (units, unit, secs):
+    r = units / max (secs, 1e-9)
+    for (scale, prefix) in ((1e6, "M"), (1e3, "k")):
+        if (r >= scale):
+            return "%.2f %s%s/s" % (r / scale, prefix, unit)
+    return "%.0f %s/s" % (r, unit)
+
+# Run the selected benchmarks, best of repeats.  Returns the results,
+# { name : { "secs", "peak_kb" } }, and the names of the benchmarks
+# that failed or were slower than baseline by more than threshold.
+def run_benchmarks (selected, dirname, repeats, baseline, threshold):
+    results = {}
+    bad = []
+    print "%-18s %10s %16s %10s %10s %8s" % ("benchmark", "secs", "throughput", "peak KB", "baseline", "change")
+    for bench in selected:
+        (name, kind, args, units, unit) = bench
+        runs = [run_one (bench, dirname) for i in range (repeats)]
+        if None in runs:
+            print "%-18s FAILED" % name
+            bad.append (name)
+            continue
+        secs = min ([r[0] for r in runs])
+        peak = max ([r[1] for r in runs])
+        results[name] = { "secs" : secs, "peak_kb" : peak }
+        line = "%-18s %10.4f %16s %10d" % (name, secs, rate (units, unit, secs), peak)
+        if baseline.has_key (name):
+            old = baseline[name]["secs"]
+            change = 100.0 * (secs - old) / old
+            line += " %10.4f %+7.1f%%" % (old, change)
+            if (change > threshold) and (secs - old > min_change):
+                line += "  SLOWER"
+                bad.append (name)
+        print line
+    return (results, bad)
+
+def print_help ():
+    print "Usage: tool_bench.py [-hls] [-o dir] [-r N] [-b file] [-t percent] [pattern...]"
+    print "  -o : work directory for inputs and outputs (default %s)" % work_dir
+    print "  -r : runs of each benchmark, the best is kept (default 3)"
+    print "  -b : baseline file (default %s)" % baseline_file
+    print "  -s : save the results to the baseline file"
+    print "  -t : fail when a benchmark is this many percent slower than"
+    print "       its baseline, and %.0fms or more (default 20)" % (min_change * 1000)
+    print "  -l : list the benchmarks"
+    print "  -h : option help (this list)"
+    print "Patterns (shell style) select benchmarks by name; all run by default."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hlso:r:b:t:x:")
+    dirname = work_dir
+    repeats = 3
+    filename = baseline_file
+    save = 0
+    threshold = 20.0
+    child = None
+    for option in options:
+        if option[0] == "-o":
+            dirname = option[1]
+        elif option[0] == "-r":
+            repeats = int (option[1])
+        elif option[0] == "-b":
+            filename = option[1]
+        elif option[0] == "-s":
+            save = 1
+        elif option[0] == "-t":
+            threshold = float (option[1])
+        elif option[0] == "-x":
+            child = option[1]
+        elif option[0] == "-l":
+            for (name, kind, a, units, unit) in benchmarks:
+                print "%-18s %s, %d %s" % (name, kind, units, unit)
+            sys.exit (0)
+        else:
+            print_help()
+
+    # -x runs one library benchmark for the parent process
+    if child:
+        bench = [b for b in benchmarks if (b[0] == child)][0]
+        print "%.6f" % run_lib (dirname, *bench[2])
+        return
+
+    selected = [b for b in benchmarks
+                if not args or [p for p in args if fnmatch.fnmatch (b[0], p)]]
+    if not selected:
+        print "ERROR: no benchmark matches", " ".join (args)
+        sys.exit (1)
+    make_inputs (dirname)
+    baseline = load_baseline (filename)
+    (results, bad) = run_benchmarks (selected, dirname, repeats, baseline, threshold)
+    if save:
+        baseline.update (results)
+        save_baseline (filename, baseline)
+        print "Baseline saved to %s" % filename
+    if bad:
+        print "%d benchmarks failed or slower than the %.0f%% threshold: %s" % (len (bad), threshold, " ".join (bad))
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
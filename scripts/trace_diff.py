@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Compare the instruction decode trace of a simulation (the OPCODE
+# lines printed by env/op_decode.v under run -t) against a reference:
+# either a recorded golden log, or the instruction stream of the
+# z80sim ISS running the same image.  Both sides are read one line at
+# a time and only a window of recent instructions is kept, so traces
+# of any length are checked in constant memory.  The comparison stops
+# at the first divergence and reports the surrounding context.
+
+import sys, os, re, getopt, itertools
+from collections import deque
+import op_table, z80sim
+
+opcode_re = re.compile (r"^\s*(\d+): OPCODE  : (.*)$")
+
+# Mnemonics the hand-written op_decode.v printed before it was
+# generated from env/z80_opcodes.txt, and how they are spelled now.
+# With -o, logs recorded with the old decoder are read through this
+# map.  Opcodes the old decoder got wrong (CB 18-1F as RL, FD 96/9E as
+# IX, DD/FD 76 as LD (IX+index),byte) or did not decode ("Unknown
+# opcode") print text that is also right for another opcode, so they
+# cannot be mapped and still show as divergences.
+legacy_names = { "HLT" : "HALT",
+                 "RST   0" : "RST   00H",
+                 "RST   8" : "RST   08H",
+                 "JM    M,address" : "JP    M,address",
+                 "RLC   (IX+index)" : "CB    (IX+index)",
+                 "RLC   (IY+index)" : "CB    (IY+index)" }
+for r in ("B", "C", "D", "E", "H", "L", "(HL)", "A", "byte", "(IX+index)"):
+    legacy_names["SBC   " + r] = "SBC   A," + r
+
+# (time, mnemonic) for each OPCODE line of a log file, or each record
+# of a packed trace file.  With legacy set, old decoder mnemonics are
+# mapped to the current ones.
+def log_stream (filename, legacy=0):
+    if legacy:
+        for (time, text) in log_stream (filename):
+            yield (time, legacy_names.get (text, text))
+        return
+    if filename.endswith (".trc"):
+        import trace_file
+        for record in trace_file.trace_reader (filename).records():
+            yield record[1:]
+        return
+    if (filename == "-"):
+        fh = sys.stdin
+    else:
+        fh = open (filename)
+    for line in fh:
+        m = opcode_re.match (line)
+        if m:
+            yield (int (m.group(1)), m.group(2).rstrip())
+
+# (time, mnemonic) for each instruction executed by the ISS, as the
+# decode trace of tb_top would print it.  Interrupt acknowledge cycles
+# are not printed by the RTL trace and are skipped here as well.
+def iss_stream (image, table_file=op_table.table_file, max_cycles=10000000):
+    table = op_table.load (table_file)
+    (cpu, env) = z80sim.load_system (image, out=open (os.devnull, "w"))
+    pending = []
+    def trace (cpu):
+        if cpu.halted:
+            ops = [0]
+        else:
+            ops = z80sim.m1_opcodes (cpu.mem, cpu.pc)
+        for text in table.decode (ops):
+            pending.append ((env.time, text))
+    cpu.trace = trace
+
+    env.clock (20)
+    while (env.status == None) and (cpu.cycles < max_cycles):
+        z80sim.tick (cpu, env)
+        for entry in pending:
+            yield entry
+        del pending[:]
+
+def format_entry (index, entry, mark):
+    if (entry == None):
+        return "%s %8d  %20s  <end of trace>" % (mark, index, "")
+    return "%s %8d  %20d  %s" % (mark, index, entry[0], entry[1])
+
+# Walk both streams in step.  Returns None when they match, or the
+# report lines for the first divergence.
+def compare (ref, rtl, context=5):
+    window = deque (maxlen=context)
+    index = 0
+    for (r, t) in itertools.izip_longest (ref, rtl):
+        if (r != None) and (t != None) and (r[1] == t[1]):
+            window.append ((index, r, t))
+            index += 1
+            continue
+
+        report = ["first divergence at instruction %d" % index,
+                  "  %8s  %20s  %s" % ("instr", "time", "mnemonic")]
+        for (i, a, b) in window:
+            report.append (format_entry (i, b, " "))
+        report.append (format_entry (index, r, "-"))
+        report.append (format_entry (index, t, "+"))
+        for (i, (a, b)) in enumerate (itertools.islice (itertools.izip_longest (ref, rtl), context)):
+            if (a == b == None):
+                break
+            if (a != None) and (b != None) and (a[1] == b[1]):
+                report.append (format_entry (index + i + 1, b, " "))
+            else:
+                report.append (format_entry (index + i + 1, a, "-"))
+                report.append (format_entry (index + i + 1, b, "+"))
+        return report
+    return None
+
+def print_help ():
+    print "Usage: trace_diff.py [-ho] [-c lines] [-n cycles] [-f table] (-i image | golden.log) <rtl.log>"
+    print "  -i : reference is the ISS running image (.ihx or .vmem)"
+    print "  -c : lines of context around the divergence (default 5)"
+    print "  -n : stop the ISS after this many clocks (default 10000000)"
+    print "  -f : opcode table (default %s)" % op_table.table_file
+    print "  -o : logs were recorded with the decoder from before the opcode"
+    print "       table; map its mnemonics to the current spelling"
+    print "  -h : option help (this list)"
+    print "Lines marked - come from the reference, + from the RTL log."
+    print "An RTL log of - is read from standard input."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hoi:c:n:f:")
+    image = None
+    context = 5
+    max_cycles = 10000000
+    table_file = op_table.table_file
+    legacy = 0
+    for option in options:
+        if option[0] == "-o":
+            legacy = 1
+        elif option[0] == "-i":
+            image = option[1]
+        elif option[0] == "-c":
+            context = int (option[1])
+        elif option[0] == "-n":
+            max_cycles = int (option[1])
+        elif option[0] == "-f":
+            table_file = option[1]
+        else:
+            print_help()
+
+    if image:
+        if len(args) != 1: print_help()
+        ref = iss_stream (image, table_file, max_cycles)
+    else:
+        if len(args) != 2: print_help()
+        ref = log_stream (args[0], legacy)
+    rtl = log_stream (args[-1], legacy)
+
+    report = compare (ref, rtl, context)
+    if report:
+        for line in report:
+            print line
+        sys.exit (1)
+    print "traces match"
+
+if __name__ == '__main__':
+    cmdline()
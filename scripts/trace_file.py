@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Compact binary form of the instruction decode trace.
+#
+# The OPCODE lines of a run -t log are packed into blocks of
+# block_size instructions.  Each block stores its columns one after
+# the other: time deltas (LEB128 varints), prefix bytes, opcode bytes
+# and mnemonic numbers (little-endian 16 bit).  After the blocks come
+# the interned mnemonic table and the block index.  Each index entry
+# has the block's first and last time, its offset, and a bitmap of the
+# (prefix, opcode) pairs it contains.  Time-range and opcode queries
+# therefore only decode the blocks that can match.
+#
+# The text trace carries no program counter, so there is no PC index.
+# Prefix and opcode bytes are recovered from the mnemonic with the
+# opcode table.  Mnemonics that do not appear there are kept with
+# prefix and opcode ff.
+
+import sys, struct, bisect, getopt
+from array import array
+import op_table
+
+magic = "TV80TRC1"
+header_fmt = "<8sIIIQQ"
+index_fmt = "<QQQII"
+block_size = 4096
+
+prefixes = [0x00, 0xcb, 0xdd, 0xed, 0xfd]
+bitmap_bytes = len (prefixes) * 256 / 8
+
+def pack_varints (values):
+    out = bytearray()
+    for v in values:
+        while (v > 0x7f):
+            out.append ((v & 0x7f) | 0x80)
+            v >>= 7
+        out.append (v)
+    return out
+
+def unpack_varints (buf):
+    values = array ('L')
+    v = 0
+    shift = 0
+    for b in buf:
+        v |= (b & 0x7f) << shift
+        if (b & 0x80):
+            shift += 7
+        else:
+            values.append (v)
+            v = 0
+            shift = 0
+    return values
+
+def bitmap_key (prefix, opcode):
+    if (prefix not in prefixes):
+        return None
+    return prefixes.index (prefix) * 256 + opcode
+
+# map each mnemonic of the opcode table to the first (prefix, opcode) that
+# prints it
+def opcode_map (table_file=op_table.table_file):
+    table = op_table.load (table_file)
+    ops = {}
+    for prefix in prefixes:
+        for op in range (256):
+            (text, state) = table.lookup (prefix, op)
+            if (text != None) and not ops.has_key (text):
+                ops[text] = (prefix, op)
+    return ops
+
+class trace_writer:
+    def __init__ (self, filename, table_file=op_table.table_file):
+        self.fh = open (filename, "wb")
+        self.fh.write (struct.pack (header_fmt, magic, 1, block_size, 0, 0, 0))
+        self.ops = opcode_map (table_file)
+        self.mnemonics = []
+        self.mnemonic_ids = {}
+        self.index = []
+        self.count = 0
+        self.last_time = 0
+        self.new_block()
+
+    def new_block (self):
+        self.times = []
+        self.prefix = bytearray()
+        self.opcode = bytearray()
+        self.ids = array ('H')
+        self.bitmap = bytearray (bitmap_bytes)
+
+    def add (self, time, text):
+        id = self.mnemonic_ids.get (text)
+        if (id == None):
+            id = len (self.mnemonics)
+            self.mnemonics.append (text)
+            self.mnemonic_ids[text] = id
+        (prefix, op) = self.ops.get (text, (0xff, 0xff))
+        key = bitmap_key (prefix, op)
+        if (key != None):
+            self.bitmap[key >> 3] |= 1 << (key & 7)
+        self.times.append (time)
+        self.prefix.append (prefix)
+        self.opcode.append (op)
+        self.ids.append (id)
+        self.count += 1
+        if (len (self.times) == block_size):
+            self.flush()
+
+    def flush (self):
+        if not self.times:
+            return
+        deltas = []
+        last = self.times[0]
+        for t in self.times:
+            deltas.append (t - last)
+            last = t
+        deltas = pack_varints (deltas)
+        offset = self.fh.tell()
+        self.fh.write (deltas)
+        self.fh.write (self.prefix)
+        self.fh.write (self.opcode)
+        if (sys.byteorder != "little"):
+            self.ids.byteswap()
+        self.fh.write (self.ids.tostring())
+        self.index.append ((self.times[0], self.times[-1], offset,
+                            len (self.times), len (deltas), str (self.bitmap)))
+        self.new_block()
+
+    def close (self):
+        self.flush()
+        mnem_offset = self.fh.tell()
+        self.fh.write (struct.pack ("<I", len (self.mnemonics)))
+        for text in self.mnemonics:
+            self.fh.write (struct.pack ("<B", len (text)) + text)
+        index_offset = self.fh.tell()
+        for entry in self.index:
+            self.fh.write (struct.pack (index_fmt, *entry[:5]) + entry[5])
+        self.fh.seek (0)
+        self.fh.write (struct.pack (header_fmt, magic, 1, block_size, self.count,
+                                    mnem_offset, index_offset))
+        self.fh.close()
+
+class trace_block:
+    def __init__ (self, times, prefix, opcode, ids):
+        self.times = times
+        self.prefix = prefix
+        self.opcode = opcode
+        self.ids = ids
+
+class trace_reader:
+    def __init__ (self, filename):
+        self.fh = open (filename, "rb")
+        header = self.fh.read (struct.calcsize (header_fmt))
+        (tag, version, self.block_size, self.count, mnem_offset, index_offset) = \
+            struct.unpack (header_fmt, header)
+        if (tag != magic):
+            raise IOError, "%s: not a trace file" % filename
+
+        self.fh.seek (mnem_offset)
+        (n,) = struct.unpack ("<I", self.fh.read (4))
+        self.mnemonics = []
+        for i in range (n):
+            (length,) = struct.unpack ("<B", self.fh.read (1))
+            self.mnemonics.append (self.fh.read (length))
+
+        self.fh.seek (index_offset)
+        entry_size = struct.calcsize (index_fmt)
+        self.index = []
+        self.first_times = []
+        blocks = (self.count + self.block_size - 1) / self.block_size
+        for i in range (blocks):
+            buf = self.fh.read (entry_size + bitmap_bytes)
+            entry = struct.unpack (index_fmt, buf[:entry_size]) + (bytearray (buf[entry_size:]),)
+            self.index.append (entry)
+            self.first_times.append (entry[0])
+        self.cached = (None, None)
+
+    def __len__ (self):
+        return self.count
+
+    def block (self, n):
+        if (self.cached[0] == n):
+            return self.cached[1]
+        (first, last, offset, count, delta_len, bitmap) = self.index[n]
+        self.fh.seek (offset)
+        buf = self.fh.read (delta_len + count * 4)
+        times = unpack_varints (bytearray (buf[:delta_len]))
+        t = first
+        for i in xrange (count):
+            t += times[i]
+            times[i] = t
+        pos = delta_len
+        prefix = bytearray (buf[pos:pos+count])
+        opcode = bytearray (buf[pos+count:pos+count*2])
+        ids = array ('H')
+        ids.fromstring (buf[pos+count*2:pos+count*4])
+        if (sys.byteorder != "little"):
+            ids.byteswap()
+        blk = trace_block (times, prefix, opcode, ids)
+        self.cached = (n, blk)
+        return blk
+
+    def record (self, blk, i):
+        return (blk.times[i], self.mnemonics[blk.ids[i]])
+
+    # (index, time, mnemonic) for instructions start <= index < stop
+    def records (self, start=0, stop=None):
+        if (stop == None) or (stop > self.count):
+            stop = self.count
+        while (start < stop):
+            n = start / self.block_size
+            blk = self.block (n)
+            base = n * self.block_size
+            end = min (stop - base, len (blk.times))
+            for i in xrange (start - base, end):
+                yield (base + i,) + self.record (blk, i)
+            start = base + end
+
+    # (index, time, mnemonic) for instructions with t1 <= time <= t2
+    def between (self, t1, t2):
+        n = max (bisect.bisect_right (self.first_times, t1) - 1, 0)
+        while (n < len (self.index)) and (self.index[n][0] <= t2):
+            if (self.index[n][1] >= t1):
+                blk = self.block (n)
+                lo = bisect.bisect_left (blk.times, t1)
+                hi = bisect.bisect_right (blk.times, t2)
+                for i in xrange (lo, hi):
+                    yield (n * self.block_size + i,) + self.record (blk, i)
+            n += 1
+
+    # (index, time, mnemonic) for each execution of prefix/opcode; the
+    # prefix is 0 for the unprefixed page
+    def find (self, prefix, opcode):
+        key = bitmap_key (prefix, opcode)
+        for n in range (len (self.index)):
+            if (key != None):
+                bitmap = self.index[n][5]
+                if not (bitmap[key >> 3] & (1 << (key & 7))):
+                    continue
+            blk = self.block (n)
+            start = 0
+            while 1:
+                i = blk.opcode.find (chr (opcode), start)
+                if (i < 0):
+                    break
+                if (blk.prefix[i] == prefix):
+                    yield (n * self.block_size + i,) + self.record (blk, i)
+                start = i + 1
+
+# convert the OPCODE lines of a log into a trace file
+def convert (logfile, outfile, table_file=op_table.table_file):
+    import trace_diff
+    writer = trace_writer (outfile, table_file)
+    for (time, text) in trace_diff.log_stream (logfile):
+        writer.add (time, text)
+    writer.close()
+    return writer.count
+
+def print_record (record):
+    print "%20d: OPCODE  : %s" % record[1:]
+
+def parse_range (arg):
+    (lo, hi) = arg.split (":")
+    return (int (lo or 0), hi and int (hi) or None)
+
+def print_help ():
+    print "Usage: trace_file.py -c [-f table] <log> <trace>"
+    print "       trace_file.py [-t t1:t2] [-n i1:i2] [-o [pp:]oo] <trace>"
+    print "  -c : convert the OPCODE lines of log into trace"
+    print "  -f : opcode table used to recover opcodes (default %s)" % op_table.table_file
+    print "  -t : instructions with t1 <= time <= t2"
+    print "  -n : instructions number i1 up to (not including) i2"
+    print "  -o : executions of an opcode, e.g. ed:b0 or 76 (hex)"
+    print "  -h : option help (this list)"
+    print "With no query option the whole trace is printed in log format."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hcf:t:n:o:")
+    mode = "all"
+    table_file = op_table.table_file
+    for option in options:
+        if option[0] == "-c":
+            mode = "convert"
+        elif option[0] == "-f":
+            table_file = option[1]
+        elif option[0] == "-t":
+            mode = "time"
+            (t1, t2) = parse_range (option[1])
+        elif option[0] == "-n":
+            mode = "index"
+            (i1, i2) = parse_range (option[1])
+        elif option[0] == "-o":
+            mode = "opcode"
+            fields = option[1].split (":")
+            if len (fields) == 1: fields.insert (0, "0")
+            (prefix, opcode) = [int (f, 16) for f in fields]
+        else:
+            print_help()
+
+    if (mode == "convert"):
+        if len(args) != 2: print_help()
+        count = convert (args[0], args[1], table_file)
+        print "%d instructions written to %s" % (count, args[1])
+        return
+
+    if len(args) != 1: print_help()
+    reader = trace_reader (args[0])
+    if (mode == "time"):
+        if (t2 == None): t2 = sys.maxint
+        records = reader.between (t1, t2)
+    elif (mode == "index"):
+        records = reader.records (i1, i2)
+    elif (mode == "opcode"):
+        records = reader.find (prefix, opcode)
+    else:
+        records = reader.records()
+    for record in records:
+        print_record (record)
+
+if __name__ == '__main__':
+    cmdline()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Streaming VCD reader for the dumps written to logs/<test>.dump.
+#
+# The first pass over a dump reads the signal definitions and records
+# a checkpoint about every checkpoint_bytes of value changes: the time,
+# the file offset of its #time line, and the value of every signal at
+# that point.  The index is kept next to the dump as <dump>.idx and is
+# rebuilt when the dump changes.  Extracting signals over a time window
+# then seeks to the last checkpoint before the window and reads only
+# as far as the end of the window.
+
+import sys, os, bisect, fnmatch, getopt, json
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+checkpoint_bytes = 8 * 1024 * 1024
+
+class vcd_error (Exception):
+    pass
+
+class signal:
+    def __init__ (self, name, id, width):
+        self.name = name
+        self.id = id
+        self.width = width
+
+class vcd_index:
+    def __init__ (self, filename):
+        self.filename = filename
+        self.signals = []
+        self.checkpoints = []
+        self.times = []
+        self.data_offset = 0
+
+    def index_file (self):
+        return self.filename + ".idx"
+
+    def stamp (self):
+        st = os.stat (self.filename)
+        return [st.st_size, int (st.st_mtime)]
+
+    # load the sidecar index, or build it if it is missing or stale
+    def open (self, rebuild=0, interval=checkpoint_bytes):
+        if not rebuild and os.path.exists (self.index_file()):
+            data = json.load (open (self.index_file()))
+            if (data["stamp"] == self.stamp()):
+                self.signals = [signal (*s) for s in data["signals"]]
+                self.checkpoints = data["checkpoints"]
+                self.data_offset = data["data_offset"]
+                self.times = [cp[0] for cp in self.checkpoints]
+                return self
+        self.build (interval)
+        data = { "stamp" : self.stamp(),
+                 "signals" : [(s.name, s.id, s.width) for s in self.signals],
+                 "checkpoints" : self.checkpoints,
+                 "data_offset" : self.data_offset }
+        json.dump (data, open (self.index_file(), "w"))
+        return self
+
+    # read the header up to $enddefinitions; returns the file offset
+    # of the first line after it
+    def read_header (self, fh):
+        scope = []
+        offset = 0
+        tokens = []
+        for line in fh:
+            offset += len (line)
+            tokens.extend (line.split())
+            if not tokens or (tokens[-1] != "$end"):
+                continue
+            if (tokens[0] == "$scope"):
+                scope.append (tokens[2])
+            elif (tokens[0] == "$upscope"):
+                scope.pop()
+            elif (tokens[0] == "$var"):
+                name = ".".join (scope + [tokens[4]])
+                self.signals.append (signal (name, tokens[3], int (tokens[2])))
+            elif (tokens[0] == "$enddefinitions"):
+                return offset
+            tokens = []
+        raise vcd_error, "%s: no $enddefinitions" % self.filename
+
+    def build (self, interval):
+        self.signals = []
+        fh = open (self.filename, "rb")
+        offset = self.read_header (fh)
+        self.data_offset = offset
+        values = {}
+        self.checkpoints = []
+        next_checkpoint = offset
+        for line in fh:
+            c = line[0]
+            if (c == "#"):
+                if (offset >= next_checkpoint):
+                    self.checkpoints.append ((int (line[1:]), offset, dict (values)))
+                    next_checkpoint = offset + interval
+            elif (c in "01xXzZ"):
+                values[line[1:].rstrip()] = c
+            elif (c in "bBrR"):
+                (v, id) = line[1:].split()
+                values[id] = v
+            offset += len (line)
+        self.times = [cp[0] for cp in self.checkpoints]
+
+    # signals whose names match any of the glob patterns
+    def select (self, patterns):
+        out = []
+        for s in self.signals:
+            for p in patterns:
+                if fnmatch.fnmatchcase (s.name, p):
+                    out.append (s)
+                    break
+        return out
+
+    # Yield (time, values) for t1 <= time <= t2: first the values at
+    # t1, then one row for each time at which a selected signal changes.
+    # Values are the strings of the dump (binary digits for vectors).
+    def extract (self, sigs, t1=0, t2=None):
+        wanted = {}
+        for s in sigs:
+            wanted[s.id] = 1
+        fh = open (self.filename, "rb")
+        n = bisect.bisect_right (self.times, t1) - 1
+        if (n < 0):
+            fh.seek (self.data_offset)
+            state = {}
+            cur = 0
+        else:
+            (cur, offset, values) = self.checkpoints[n]
+            fh.seek (offset)
+            state = dict ([(id, values.get (id, "x")) for id in wanted.keys()])
+
+        started = 0
+        dirty = 0
+        for line in fh:
+            c = line[0]
+            if (c == "#"):
+                t = int (line[1:])
+                if not started:
+                    if (t < t1):
+                        cur = t
+                        continue
+                    started = 1
+                    if (t > t1):
+                        yield (t1, [state.get (s.id, "x") for s in sigs])
+                        dirty = 0
+                    else:
+                        dirty = 1
+                elif dirty:
+                    yield (cur, [state.get (s.id, "x") for s in sigs])
+                    dirty = 0
+                if (t2 != None) and (t > t2):
+                    return
+                cur = t
+            elif (c in "01xXzZ"):
+                id = line[1:].rstrip()
+                if wanted.has_key (id):
+                    state[id] = c
+                    dirty = 1
+            elif (c in "bBrR"):
+                (v, id) = line[1:].split()
+                if wanted.has_key (id):
+                    state[id] = v
+                    dirty = 1
+        if started and dirty:
+            yield (cur, [state.get (s.id, "x") for s in sigs])
+
+# vector values as hex where they have no x or z bits
+def format_value (value, width):
+    if (width == 1) or ("x" in value) or ("z" in value) or \
+       ("X" in value) or ("Z" in value) or ("." in value):
+        return value
+    return "%x" % int (value, 2)
+
+def write_csv (rows, sigs, fh):
+    fh.write (",".join (["time"] + [s.name for s in sigs]) + "\n")
+    for (t, values) in rows:
+        fields = [str (t)]
+        for (s, v) in zip (sigs, values):
+            fields.append (format_value (v, s.width))
+        fh.write (",".join (fields) + "\n")
+
+# Save a .npz file with a "time" array and one array per signal.
+# Values with x or z bits are stored as -1.
+def write_npz (rows, sigs, outfile):
+    if (numpy == None):
+        raise vcd_error, "numpy is needed for .npz output"
+    times = []
+    columns = [[] for s in sigs]
+    for (t, values) in rows:
+        times.append (t)
+        for (col, v) in zip (columns, values):
+            try:
+                col.append (int (v, 2))
+            except ValueError:
+                col.append (-1)
+    arrays = { "time" : numpy.array (times, dtype=numpy.int64) }
+    for (s, col) in zip (sigs, columns):
+        if (s.width < 64):
+            arrays[s.name] = numpy.array (col, dtype=numpy.int64)
+        else:
+            arrays[s.name] = numpy.array (col, dtype=object)
+    numpy.savez (outfile, **arrays)
+
+def parse_window (arg):
+    (lo, hi) = arg.split (":")
+    return (int (lo or 0), hi and int (hi) or None)
+
+def print_help ():
+    print "Usage: vcd_index.py [-hlr] [-k MB] [-s pattern]... [-t t1:t2] [-o file] <dump>"
+    print "  -l : list the signals in the dump"
+    print "  -r : rebuild the index"
+    print "  -k : checkpoint interval in megabytes (default %d)" % (checkpoint_bytes / (1024 * 1024))
+    print "  -s : extract signals matching pattern, e.g. 'tb_top.tv80s_inst.*'"
+    print "  -t : time window t1:t2 (either side may be left out)"
+    print "  -o : write to file.csv or file.npz instead of standard output"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hlrk:s:t:o:")
+    if len(args) != 1:
+        print_help()
+
+    list_signals = 0
+    rebuild = 0
+    interval = checkpoint_bytes
+    patterns = []
+    (t1, t2) = (0, None)
+    outfile = None
+    for option in options:
+        if option[0] == "-l":
+            list_signals = 1
+        elif option[0] == "-r":
+            rebuild = 1
+        elif option[0] == "-k":
+            interval = int (float (option[1]) * 1024 * 1024)
+        elif option[0] == "-s":
+            patterns.append (option[1])
+        elif option[0] == "-t":
+            (t1, t2) = parse_window (option[1])
+        elif option[0] == "-o":
+            outfile = option[1]
+        else:
+            print_help()
+
+    try:
+        index = vcd_index (args[0]).open (rebuild, interval)
+        if list_signals:
+            for s in index.signals:
+                print "%-6s %4d %s" % (s.id, s.width, s.name)
+        if not patterns:
+            return
+        sigs = index.select (patterns)
+        if not sigs:
+            raise vcd_error, "no signals match %s" % " ".join (patterns)
+        rows = index.extract (sigs, t1, t2)
+        if (outfile == None):
+            write_csv (rows, sigs, sys.stdout)
+        elif outfile.endswith (".npz"):
+            write_npz (rows, sigs, outfile)
+        else:
+            write_csv (rows, sigs, open (outfile, "w"))
+    except vcd_error, msg:
+        print "ERROR:", msg
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Disassembler for test images (.ihx or .vmem).  Decoding uses the
+# 256-entry page tables of op_table, with the operand formatting of
+# each opcode worked out once when the tables are loaded.
+
+import sys, os, re, getopt
+import op_table, mem_image
+
+placeholder_re = re.compile (r"\+index\)|index|byte|word|address")
+
+class disassembler:
+    def __init__ (self, table, symbols=None):
+        self.table = table
+        self.symbols = symbols
+        self.pages = {}
+        for (page, ops) in table.pages.items():
+            self.pages[page] = [op and self.prepare (op) for op in ops]
+
+    # (opcode, format string, operand kinds) for one table entry
+    def prepare (self, op):
+        if (op.prefix != None):
+            return (op, None, None)
+        template = placeholder_re.sub (lambda m: (m.group(0) == "+index)") and "%s)" or "%s",
+                                       op.text.replace ("%", "%%"))
+        return (op, template, op.kinds())
+
+    def label (self, addr):
+        if self.symbols:
+            n = self.symbols.find (addr)
+            if (n >= 0) and (self.symbols.addrs[n] == addr):
+                return self.symbols.names[n]
+        return "0x%04x" % addr
+
+    # Decode the instruction at addr.  Returns (length, text); bytes
+    # that do not start a known instruction come back as DB.
+    def decode (self, mem, addr):
+        entry = self.pages[0][mem[addr]]
+        operand = addr + 1
+        op = entry[0]
+        if (op.prefix != None):
+            page = op.prefix
+            entry = self.pages[page][mem[(addr + 1) & 0xffff]]
+            operand = addr + 2
+            if entry and (entry[0].prefix != None):
+                # DD CB index opcode
+                entry = self.pages[entry[0].prefix][mem[(addr + 3) & 0xffff]]
+            if (entry == None):
+                return (1, "DB    0x%02x" % mem[addr])
+        (op, template, kinds) = entry
+
+        args = []
+        for kind in kinds:
+            if (kind == "byte"):
+                args.append ("0x%02x" % mem[operand & 0xffff])
+                operand += 1
+            elif (kind == "word"):
+                args.append (self.label (mem[operand & 0xffff] | (mem[(operand + 1) & 0xffff] << 8)))
+                operand += 2
+            else:
+                d = mem[operand & 0xffff]
+                if (d & 0x80): d -= 256
+                operand += 1
+                if (kind == "rel"):
+                    args.append (self.label ((addr + op.length + d) & 0xffff))
+                else:
+                    args.append ("%+d" % d)
+        return (op.length, template % tuple (args))
+
+    # yield (addr, bytes, text) for the instructions in start..stop
+    def run (self, mem, start, stop):
+        addr = start
+        while (addr <= stop):
+            (length, text) = self.decode (mem, addr)
+            yield (addr, mem[addr:addr+length], text)
+            addr += length
+
+def disassemble (image, ranges, fh=sys.stdout, table_file=op_table.table_file, symbols=None):
+    dis = disassembler (op_table.load (table_file), symbols)
+    mem = image.data
+    if (len (mem) < 0x10003):
+        mem = mem + bytearray (0x10003 - len (mem))
+    for (start, stop) in ranges:
+        for (addr, code, text) in dis.run (mem, start, stop):
+            if symbols:
+                n = symbols.find (addr)
+                if (n >= 0) and (symbols.addrs[n] == addr):
+                    fh.write ("%s:\n" % symbols.names[n])
+            hexbytes = " ".join (["%02x" % b for b in code])
+            fh.write ("%04x  %-12s  %s\n" % (addr, hexbytes, text))
+
+def print_help ():
+    print "Usage: z80dis.py [-h] [-r start:stop] [-s symbols] [-f table] <image>"
+    print "  -r : disassemble the address range start..stop (hex), default all"
+    print "       populated memory of the image"
+    print "  -s : symbol file (.noi or .map); default is the one next to image"
+    print "  -f : opcode table (default %s)" % op_table.table_file
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hr:s:f:")
+    ranges = []
+    symfile = None
+    table_file = op_table.table_file
+    for option in options:
+        if option[0] == "-r":
+            (start, stop) = option[1].split (":")
+            ranges.append ((int (start, 16), int (stop, 16)))
+        elif option[0] == "-s":
+            symfile = option[1]
+        elif option[0] == "-f":
+            table_file = option[1]
+        else:
+            print_help()
+    if len(args) != 1:
+        print_help()
+
+    import z80prof
+    image = mem_image.mem_image()
+    if args[0].endswith (".ihx") or args[0].endswith (".hex"):
+        image.load_ihex (args[0])
+    else:
+        image.load_vmem (args[0])
+    if not ranges:
+        ranges = [(s, e - 1) for (s, e) in image.extents()]
+    if (symfile == None):
+        symfile = z80prof.find_symbols (args[0])
+    symbols = None
+    if symfile:
+        symbols = z80prof.symbol_table().load (symfile)
+    disassemble (image, ranges, sys.stdout, table_file, symbols)
+
+if __name__ == '__main__':
+    cmdline()
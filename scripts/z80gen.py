@@ -0,0 +1,562 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Constrained-random instruction stream generator.
+#
+# Each seed gives a self-checking test program, written as .ihx and
+# .vmem through mem_image without an assembler or compiler.  The body
+# of the program is a list of units: one random instruction, preceded
+# by the loads that keep it inside the constraints.  Memory operands
+# point into the data region, pushes and pops are counted so the stack
+# stays inside the stack region, and I/O goes to the test ports 91-93.
+# Branches only jump forward, over units that leave the stack depth
+# alone, so every program runs to its end.
+#
+# The init code fills the data region from a table in ROM and loads
+# random values into all registers.  After the body, the signature
+# code pushes the main and alternate registers, IX and IY, and folds
+# the stack, the data region and the checksum port into a 16-bit
+# Fletcher sum.  That is compared with the sum the z80sim ISS gets for
+# the same body; a match writes 01 (passed) to port 80, a mismatch
+# 02 (failed).  Flag bits 3 and 5 are not defined for every
+# instruction, so they are masked out of F before the fold, and the
+# flags after a block I/O instruction are redefined by an AND A.
+#
+# Opcode classes and prefix pages are picked with weights (-c, -p).
+# Undocumented opcodes are only used with -x.
+
+import sys, os, getopt, random, bisect, binascii, time, multiprocessing
+import op_table, mem_image, z80sim
+from z80sim import A, F, B, C, D, E, H, L
+
+# default regions (inclusive), inside the RAM window 8000-FFFF
+data_region = (0x9000, 0x90ff)
+stack_region = (0xfe00, 0xfeff)
+max_data = 0x200
+max_stack = 0x100
+
+read_ports = [0x91, 0x93]
+write_ports = [0x91, 0x92, 0x93]
+
+class_weights = { "load" : 4, "alu" : 4, "rotate" : 2, "bit" : 2, "stack" : 1,
+                  "block" : 1, "io" : 1, "exchange" : 1, "branch" : 1, "misc" : 1 }
+page_weights = { "base" : 6, "cb" : 2, "ed" : 1, "dd" : 1, "fd" : 1,
+                 "ddcb" : 1, "fdcb" : 1 }
+
+mnemonic_class = {}
+for (cls, names) in (("load", "LD"),
+                     ("alu", "ADD ADC SUB SBC AND OR XOR CP INC DEC NEG DAA CPL SCF CCF"),
+                     ("rotate", "RLCA RRCA RLA RRA RLC RRC RL RR SLA SRA SLL SRL RLD RRD"),
+                     ("bit", "BIT SET RES"),
+                     ("stack", "PUSH POP"),
+                     ("block", "LDI LDD LDIR LDDR CPI CPD CPIR CPDR"),
+                     ("io", "IN OUT INI IND INIR INDR OUTI OUTD OTIR OTDR"),
+                     ("exchange", "EX EXX"),
+                     ("branch", "JP JR DJNZ"),
+                     ("misc", "NOP")):
+    for m in names.split():
+        mnemonic_class[m] = cls
+
+# max units a branch jumps over
+max_skip = 3
+
+# words the signature code pushes
+sig_words = 10
+
+# clocks the init code and body may take: the timeout is set to ffff,
+# and restarted by the signature code
+max_clocks = 60000
+
+class generator_error (Exception):
+    pass
+
+def word (v):
+    return [v & 0xff, (v >> 8) & 0xff]
+
+def random_bytes (rng, n):
+    return bytearray (binascii.unhexlify ("%0*x" % (n * 2, rng.getrandbits (n * 8))))
+
+def fletcher (buf, d=0, e=0):
+    for b in buf:
+        d = (d + b) & 0xff
+        e = (e + d) & 0xff
+    return (d, e)
+
+# class of an opcode, or None for opcodes that leave the program's
+# control (calls, returns, jumps through registers, HALT, interrupt
+# control), move SP, or give results the environment cannot predict
+# (LD A,R, PUSH AF)
+def op_class (op):
+    m = op.mnemonic
+    ops = op.operands
+    if (m == "JP") and ops.startswith ("("): return None
+    if (m == "LD") and (ops.startswith ("SP,") or ops in ("A,R", "R,A")): return None
+    if (m in ("INC", "DEC")) and (ops == "SP"): return None
+    if (m == "PUSH") and (ops == "AF"): return None
+    if (m == "EX") and ops.startswith ("(SP)"): return "stack"
+    return mnemonic_class.get (m)
+
+def undocumented (op):
+    if (op.mnemonic == "SLL"): return 1
+    if (op.mnemonic, op.operands) in (("IN", "F,(C)"), ("OUT", "(C),0")): return 1
+    for r in ("IXH", "IXL", "IYH", "IYL"):
+        if r in op.operands: return 1
+    return 0
+
+# change of the stack depth, and whether the stack must hold a word
+def stack_effect (op):
+    if (op.mnemonic == "PUSH"): return (1, 0)
+    if (op.mnemonic == "POP"): return (-1, 1)
+    if (op.mnemonic == "EX") and op.operands.startswith ("(SP)"): return (0, 1)
+    return (0, 0)
+
+# The loads an opcode needs in front of it to keep its operands inside
+# the regions and on the test ports, by name.  Block operations get
+# their pointers and a count, block I/O also a port in C.
+def fixup_kind (op):
+    m = op.mnemonic
+    ops = op.operands
+    io = (m == "IN") and "in" or "out"
+    if (mnemonic_class[m] == "block"): return "block_" + m[:2].lower()
+    if (m[:2] in ("IN", "OU", "OT")) and not ops: return "block_" + io
+    if ("(HL)" in ops) or (m in ("RLD", "RRD")): return "hl"
+    if ("(BC)" in ops): return "bc"
+    if ("(DE)" in ops): return "de"
+    if ("+index)" in ops): return "index"
+    if ops in ("(word),A", "A,(word)"): return "byte_addr"
+    if ("(word)" in ops): return "word_addr"
+    if ("(C)" in ops): return "port_c_" + io
+    if ("(byte)" in ops): return "port_" + io
+    return None
+
+# Opcode bytes of op, and the kinds of the operands that follow them.
+# The displacement of DDCB and FDCB comes before the opcode byte, and
+# is filled in by encode.
+def opcode_bytes (op):
+    page = op.page
+    if (page > 0xff):
+        return ([page >> 8, 0xcb, None, op.code], [k for k in op.kinds() if (k != "disp")])
+    if page:
+        return ([page, op.code], op.kinds())
+    return ([op.code], op.kinds())
+
+# opcode bytes followed by the operands, taken from values by kind
+def encode (head, kinds, values):
+    out = list (head)
+    if (len (out) == 4):
+        out[2] = values["disp"]
+    for kind in kinds:
+        if (kind == "word"):
+            out.extend (word (values["word"]))
+        else:
+            out.append (values[kind] & 0xff)
+    return out
+
+# weighted choice among items
+class weighted:
+    def __init__ (self, choices):
+        self.items = []
+        self.cumulative = []
+        total = 0
+        for (weight, item) in choices:
+            if (weight > 0):
+                total += weight
+                self.cumulative.append (total)
+                self.items.append (item)
+        self.total = total
+
+    def pick (self, rng):
+        return self.items[bisect.bisect_right (self.cumulative, rng.random() * self.total)]
+
+# a unit of the body: fixup loads and one random instruction.  For a
+# branch, branch is the kind of its target operand (rel or word).
+class unit:
+    def __init__ (self, code, depth=0, branch=None):
+        self.code = code
+        self.depth = depth
+        self.branch = branch
+
+class generator:
+    def __init__ (self, table, classes=class_weights, pages=page_weights, undoc=0,
+                  data=data_region, stack=stack_region):
+        for (name, (lo, hi), limit) in (("data", data, max_data), ("stack", stack, max_stack)):
+            if (lo < 0x8000) or (hi > 0xffff) or (hi < lo) or (hi - lo + 1 > limit):
+                raise generator_error, "%s region %04x-%04x is not inside RAM or larger than %x" % (name, lo, hi, limit)
+        if (data[0] <= stack[1]) and (stack[0] <= data[1]):
+            raise generator_error, "data and stack regions overlap"
+        if ((stack[1] + 1 - stack[0]) & 1):
+            raise generator_error, "stack region is not a whole number of words"
+        self.data = data
+        self.stack = stack
+        self.max_depth = (stack[1] + 1 - stack[0]) / 2 - sig_words
+        if (self.max_depth < 0):
+            raise generator_error, "stack region is smaller than %d words" % sig_words
+
+        # one weighted choice over all opcodes, with the weight of each
+        # class shared among its pages and the weight of each page
+        # among its opcodes
+        pools = {}
+        for name in sorted (op_table.page_codes.keys()):
+            for op in table.pages[op_table.page_codes[name]]:
+                if (op == None) or (op.prefix != None): continue
+                cls = op_class (op)
+                if (cls == None) or (undocumented (op) and not undoc): continue
+                pools.setdefault (cls, {}).setdefault (name, []).append (op)
+        choices = []
+        for cls in sorted (pools.keys()):
+            page_total = sum ([pages.get (p, 0) for p in pools[cls].keys()])
+            if not (page_total and classes.get (cls, 0)): continue
+            for p in sorted (pools[cls].keys()):
+                ops = pools[cls][p]
+                w = float (classes[cls]) * pages.get (p, 0) / page_total / len (ops)
+                for op in ops:
+                    choices.append ((w, (op, fixup_kind (op)) + stack_effect (op) +
+                                     (cls == "branch",) + opcode_bytes (op)))
+        self.choices = weighted (choices)
+        if not self.choices.total:
+            raise generator_error, "no opcodes left by the class and prefix weights"
+
+        self.cpu = z80sim.z80()
+        self.blank = bytearray (stack[1] + 1 - stack[0])
+        self.devnull = open (os.devnull, "w")
+        self.sig_size = len (signature (0, data, (0, 0)))
+
+    # address of n bytes inside the data region; the last of them for a
+    # block operation that counts down
+    def pointer (self, n=1, down=0):
+        addr = self.data[0] + int (self.rng.random() * (self.data[1] + 2 - n - self.data[0]))
+        if down: addr += n - 1
+        return addr
+
+    def unit (self, slot):
+        (op, fixup, depth, need, branch, head, kinds) = slot
+        rng = self.rng
+        code = []
+        values = { "byte" : rng.getrandbits (8), "word" : rng.getrandbits (16), "rel" : 0 }
+        if (fixup == None):
+            pass
+        elif fixup.startswith ("block_"):
+            down = "D" in op.mnemonic[2:]
+            if fixup in ("block_ld", "block_cp"):
+                n = rng.randint (1, 16)
+                code.extend ([0x21] + word (self.pointer (n, down)))
+                if (fixup == "block_ld"):
+                    code.extend ([0x11] + word (self.pointer (n, down)))
+                code.extend ([0x01] + word (n))
+            else:
+                n = rng.randint (1, 8)
+                port = rng.choice ((fixup == "block_in") and read_ports or write_ports)
+                code.extend ([0x21] + word (self.pointer (n, down)) + [0x01, port, n])
+        elif (fixup == "hl"):
+            code.extend ([0x21] + word (self.pointer()))
+        elif (fixup == "bc"):
+            code.extend ([0x01] + word (self.pointer()))
+        elif (fixup == "de"):
+            code.extend ([0x11] + word (self.pointer()))
+        elif (fixup == "index"):
+            d = rng.randint (-128, 127)
+            values["disp"] = d & 0xff
+            prefix = (op.page > 0xff) and (op.page >> 8) or op.page
+            code.extend ([prefix, 0x21] + word (self.pointer() - d))
+        elif (fixup == "byte_addr"):
+            values["word"] = self.pointer()
+        elif (fixup == "word_addr"):
+            values["word"] = self.pointer (2)
+        elif (fixup == "port_c_in"):
+            code.extend ([0x0e, rng.choice (read_ports)])
+        elif (fixup == "port_c_out"):
+            code.extend ([0x0e, rng.choice (write_ports)])
+        elif (fixup == "port_in"):
+            values["byte"] = rng.choice (read_ports)
+        elif (fixup == "port_out"):
+            values["byte"] = rng.choice (write_ports)
+
+        code.extend (encode (head, kinds, values))
+        if (fixup in ("block_in", "block_out")):
+            code.append (0xa7)
+        return unit (bytearray (code), depth, branch and kinds[0])
+
+    # Generate the program for a seed.  Returns the image, and the
+    # number of instructions the ISS ran for the body.
+    def generate (self, seed, count=64):
+        rng = random.Random (seed)
+        self.rng = rng
+        (d0, d1) = self.data
+        top = self.stack[1] + 1
+
+        units = []
+        depth = 0
+        while (len (units) < count):
+            slot = self.choices.pick (rng)
+            (change, need) = slot[2:4]
+            if (need and not depth) or (depth + change > self.max_depth):
+                continue
+            units.append (self.unit (slot))
+            depth += change
+
+        # lay out the body and point each branch at one of the next
+        # few units, skipping only units that leave the stack alone
+        regs = random_bytes (rng, 21)
+        table = random_bytes (rng, d1 + 1 - d0)
+        setup = setup_code (self.stack, self.data, 0)
+        addrs = [len (setup) + len (register_code (regs))]
+        for u in units:
+            addrs.append (addrs[-1] + len (u.code))
+        sig_addr = addrs[-1]
+        table_addr = sig_addr + self.sig_size
+        if (table_addr + len (table) > 0x8000):
+            raise generator_error, "program does not fit in ROM"
+        for (i, u) in enumerate (units):
+            if not u.branch: continue
+            k = 0
+            while (k < max_skip) and (i + 1 + k < len (units)) and (units[i + 1 + k].depth == 0):
+                k += 1
+            target = addrs[i + 1 + rng.randint (0, k)]
+            if (u.branch == "word"):
+                u.code[-2:] = bytearray (word (target))
+            else:
+                rel = target - (addrs[i] + len (u.code))
+                if (rel > 127):
+                    raise generator_error, "branch out of range"
+                u.code[-1] = rel
+
+        rom = setup_code (self.stack, self.data, table_addr) + register_code (regs)
+        for u in units:
+            rom.extend (u.code)
+
+        # run the body in the ISS, from the register loads of the init
+        # code with the stack pointer set and the data region filled
+        cpu = self.cpu
+        env = z80sim.env_io (self.devnull)
+        cpu.mem[0:len (rom)] = rom
+        cpu.mem[d0:d1+1] = table
+        cpu.mem[self.stack[0]:top] = self.blank
+        cpu.reset()
+        cpu.io = env
+        cpu.pc = len (setup)
+        cpu.sp = top & 0xffff
+        limit = count * 32 + 64
+        clocks = (d1 + 1 - d0) * 21 + 80
+        while (cpu.pc != sig_addr):
+            clocks += cpu.step()
+            if (cpu.instructions > limit) or (env.status != None):
+                raise generator_error, "seed %d: body did not reach the signature" % seed
+        if (clocks > max_clocks):
+            raise generator_error, "seed %d: body takes %d clocks, more than the timeout allows" % (seed, clocks)
+        if (cpu.sp != (top - depth * 2) & 0xffff):
+            raise generator_error, "seed %d: stack pointer %04x, expected %04x" % (seed, cpu.sp, top - depth * 2)
+
+        r = cpu.r
+        alt = cpu.alt
+        saved = bytearray ([alt[F] & 0xd7, alt[A], alt[L], alt[H], alt[E], alt[D], alt[C], alt[B],
+                            cpu.iy & 0xff, cpu.iy >> 8, cpu.ix & 0xff, cpu.ix >> 8,
+                            r[L], r[H], r[E], r[D], r[C], r[B], r[F] & 0xd7, r[A]])
+        expected = fletcher (saved + cpu.mem[top - depth * 2:top] + cpu.mem[d0:d1+1] +
+                             bytearray ([env.checksum]))
+
+        rom.extend (signature (depth, self.data, expected))
+        rom.extend (table)
+        image = mem_image.mem_image()
+        image.write (0, rom)
+        return (image, cpu.instructions)
+
+# Init code, first part: set SP and the longest timeout, and fill the
+# data region from the table
+def setup_code (stack, data, table_addr):
+    (d0, d1) = data
+    code = [0x31] + word ((stack[1] + 1) & 0xffff)
+    code.extend ([0x3e, 0xff, 0xd3, 0x83, 0xd3, 0x84])
+    code.extend ([0x21] + word (table_addr) + [0x11] + word (d0) + [0x01] + word (d1 + 1 - d0) + [0xed, 0xb0])
+    return bytearray (code)
+
+# Init code, second part: load I, AF', BC', DE', HL', AF, BC, DE, HL,
+# IX and IY from the 21 bytes of regs
+def register_code (regs):
+    regs = list (regs)
+    code = []
+    code.extend ([0x3e, regs[20], 0xed, 0x47])                     # ld a,n ; ld i,a
+    code.extend ([0x01] + regs[0:2] + [0xc5, 0xf1, 0x08, 0xd9])    # af'
+    for (i, opc) in ((2, 0x01), (4, 0x11), (6, 0x21)):             # bc' de' hl'
+        code.extend ([opc] + regs[i:i+2])
+    code.extend ([0xd9, 0x01] + regs[8:10] + [0xc5, 0xf1])         # af
+    for (i, opc) in ((10, [0x01]), (12, [0x11]), (14, [0x21]), (16, [0xdd, 0x21]), (18, [0xfd, 0x21])):
+        code.extend (opc + regs[i:i+2])
+    return bytearray (code)
+
+# Push the main and alternate registers, IX and IY, restart the
+# timeout counter, mask flag bits 3 and 5 of both F, fold the stack, the data region and the checksum
+# port into DE and compare DE with the expected (d, e).
+def signature (depth, data, expected):
+    (d0, d1) = data
+    fold = [0x7e, 0x82, 0x57, 0x83, 0x5f,       # ld a,(hl) ; add a,d ; ld d,a ; add a,e ; ld e,a
+            0x23, 0x0b, 0x78, 0xb1, 0x20, 0xf5] # inc hl ; dec bc ; ld a,b ; or c ; jr nz,loop
+    code = [0xf5, 0xc5, 0xd5, 0xe5, 0xdd, 0xe5, 0xfd, 0xe5,
+            0xd9, 0xc5, 0xd5, 0xe5, 0xd9, 0x08, 0xf5, 0x08]
+    code.extend ([0x3e, 0x03, 0xd3, 0x82, 0x3e, 0x01, 0xd3, 0x82])
+    code.extend ([0xdd, 0x21, 0, 0, 0xdd, 0x39])
+    for n in (0, 18):
+        code.extend ([0xdd, 0x7e, n, 0xe6, 0xd7, 0xdd, 0x77, n])
+    code.extend ([0x11, 0, 0, 0x21, 0, 0, 0x39, 0x01] + word ((sig_words + depth) * 2) + fold)
+    code.extend ([0x21] + word (d0) + [0x01] + word (d1 + 1 - d0) + fold)
+    code.extend ([0xdb, 0x91, 0x82, 0x57, 0x83, 0x5f])
+    code.extend ([0x7a, 0xfe, expected[0], 0x20, 10, 0x7b, 0xfe, expected[1], 0x20, 5])
+    code.extend ([0x3e, 0x01, 0xd3, 0x80, 0x76])
+    code.extend ([0x3e, 0x02, 0xd3, 0x80, 0x76])
+    return bytearray (code)
+
+# run an image in the ISS from reset
+def verify (filename, max_cycles=1000000):
+    (cpu, env) = z80sim.load_system (filename, out=open (os.devnull, "w"))
+    return z80sim.run (cpu, env, max_cycles)
+
+# generator of the current process, for sweeps over several jobs
+worker = {}
+
+def start_worker (gen_args):
+    worker["gen"] = generator (op_table.load(), *gen_args)
+
+# Generate, write and optionally run the program of one seed.
+# Returns (seed, ISS status), the status None when not run.
+def make_one (args):
+    (seed, units, outdir, write, listing, check) = args
+    gen = worker["gen"]
+    (image, instructions) = gen.generate (seed, units)
+    if not write:
+        return (seed, None)
+    name = os.path.join (outdir, "rand%d" % seed)
+    image.save_ihex (name + ".ihx")
+    image.save_vmem (name + ".vmem", 0)
+    if listing:
+        import z80dis
+        fh = open (name + ".lst", "w")
+        z80dis.disassemble (image, [(0, image.max - (gen.data[1] + 1 - gen.data[0]))], fh)
+        fh.close()
+    if check:
+        return (seed, verify (name + ".ihx"))
+    return (seed, None)
+
+def parse_weights (arg, weights, names):
+    weights = dict (weights)
+    for field in arg.split (","):
+        (name, w) = field.split ("=")
+        if not names.has_key (name):
+            raise generator_error, "unknown name %s" % name
+        weights[name] = int (w)
+    return weights
+
+def parse_range (arg):
+    (lo, hi) = arg.split (":")
+    return (int (lo, 16), int (hi, 16))
+
+def print_help ():
+    print "Usage: z80gen.py [-s seed] [-n count] [-i units] [-c class=w,...] [-p page=w,...]"
+    print "                 [-d start:stop] [-k start:stop] [-o dir] [-j N] [-xvlq]"
+    print "  -s : first seed (default 1)"
+    print "  -n : number of programs, one per seed (default 1)"
+    print "  -i : random instructions per program (default 64)"
+    print "  -c : class weights, classes %s" % ", ".join (sorted (class_weights.keys()))
+    print "  -p : prefix page weights, pages %s" % ", ".join (sorted (page_weights.keys()))
+    print "  -d : data region, hex (default %04x:%04x)" % data_region
+    print "  -k : stack region, hex (default %04x:%04x)" % stack_region
+    print "  -o : output directory (default build/z80gen)"
+    print "  -j : generate with N processes"
+    print "  -x : use undocumented opcodes"
+    print "  -v : run each image in the ISS and check that it passes"
+    print "  -l : write a disassembly listing of each program"
+    print "  -q : generate only, write no files"
+    print "  -h : option help (this list)"
+    print "Programs are written as <dir>/rand<seed>.ihx and .vmem."
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hs:n:i:c:p:d:k:o:j:xvlq")
+    seed = 1
+    count = 1
+    units = 64
+    classes = class_weights
+    pages = page_weights
+    data = data_region
+    stack = stack_region
+    outdir = "build/z80gen"
+    undoc = 0
+    check = 0
+    listing = 0
+    write = 1
+    parallel = 1
+    for option in options:
+        if option[0] == "-s":
+            seed = int (option[1])
+        elif option[0] == "-n":
+            count = int (option[1])
+        elif option[0] == "-i":
+            units = int (option[1])
+        elif option[0] == "-c":
+            classes = parse_weights (option[1], classes, class_weights)
+        elif option[0] == "-p":
+            pages = parse_weights (option[1], pages, page_weights)
+        elif option[0] == "-d":
+            data = parse_range (option[1])
+        elif option[0] == "-k":
+            stack = parse_range (option[1])
+        elif option[0] == "-o":
+            outdir = option[1]
+        elif option[0] == "-j":
+            parallel = int (option[1])
+        elif option[0] == "-x":
+            undoc = 1
+        elif option[0] == "-v":
+            check = 1
+        elif option[0] == "-l":
+            listing = 1
+        elif option[0] == "-q":
+            write = 0
+        else:
+            print_help()
+    if args: print_help()
+
+    if write and not os.path.isdir (outdir):
+        os.makedirs (outdir)
+    gen_args = (classes, pages, undoc, data, stack)
+    jobs = [(s, units, outdir, write, listing, check) for s in range (seed, seed + count)]
+    failed = 0
+    start = time.time()
+    if (parallel > 1):
+        pool = multiprocessing.Pool (parallel, start_worker, (gen_args,))
+        results = pool.imap (make_one, jobs, 64)
+    else:
+        start_worker (gen_args)
+        results = (make_one (job) for job in jobs)
+    for (s, status) in results:
+        if check and write:
+            print "rand%d: %s" % (s, status)
+            if (status != "passed"): failed += 1
+    if (parallel > 1):
+        pool.close()
+        pool.join()
+    elapsed = time.time() - start
+    print "%d programs in %.2fs (%.0f/s)" % (count, elapsed, count / max (elapsed, 1e-6))
+    if failed:
+        print "%d programs failed" % failed
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()
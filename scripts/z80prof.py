@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+# Cycle profiler for test firmware.
+#
+# Samples of (pc, cycles) come either from the z80sim ISS running an
+# image, or from a VCD dump of the bus, where each opcode fetch (m1_n
+# and mreq_n low) gives the PC and the time to the next fetch gives
+# its cycles.  The samples build per-PC histograms, which are resolved
+# to functions through the SDCC symbol files (.noi or .map) of the
+# image.  A shadow call stack, pushed when execution enters a function
+# at its start address and popped when it comes back to a caller,
+# gives call counts and collapsed stacks for flame graphs.
+#
+# The instruction decode trace has no PC, so it cannot be profiled by
+# address; use the ISS or a dump of the address bus instead.
+
+import sys, os, re, bisect, getopt
+from array import array
+import results
+
+noi_re = re.compile (r"^DEF\s+(\S+)\s+(?:0x)?([0-9a-fA-F]+)\s*$")
+map_re = re.compile (r"^\s+(?:([0-9a-fA-F]{4,8})\s+([A-Za-z_.$][\w.$]*)|([A-Za-z_.$][\w.$]*)\s+([0-9a-fA-F]{4,8}))\s*$")
+
+class symbol_table:
+    def __init__ (self):
+        self.addrs = []
+        self.names = []
+
+    # Read symbols from a NoICE (.noi) or linker map (.map) file.  Area
+    # start and length symbols (s__CODE, l__DATA, ...) are left out.
+    def load (self, filename):
+        symbols = {}
+        for line in open (filename):
+            m = noi_re.match (line)
+            if m:
+                (name, addr) = m.groups()
+            else:
+                m = map_re.match (line)
+                if not m: continue
+                if m.group(1): (addr, name) = m.group(1, 2)
+                else: (name, addr) = m.group(3, 4)
+            if name.startswith ("s__") or name.startswith ("l__"):
+                continue
+            addr = int (addr, 16)
+            if (addr < 0x10000) and not symbols.has_key (addr):
+                symbols[addr] = name.lstrip ("_")
+        for addr in sorted (symbols.keys()):
+            self.addrs.append (addr)
+            self.names.append (symbols[addr])
+        return self
+
+    # index of the symbol covering addr, or -1 below the first symbol
+    def find (self, addr):
+        return bisect.bisect_right (self.addrs, addr) - 1
+
+    def name (self, n):
+        if (n < 0): return "?"
+        return self.names[n]
+
+    # address of a symbol, with or without its leading underscore
+    def address (self, name):
+        name = name.lstrip ("_")
+        if name in self.names:
+            return self.addrs[self.names.index (name)]
+        return None
+
+    def label (self, addr):
+        n = self.find (addr)
+        if (n < 0): return "%04x" % addr
+        if (addr == self.addrs[n]): return self.names[n]
+        return "%s+%x" % (self.names[n], addr - self.addrs[n])
+
+# symbol file that goes with an image: foo.ihx -> foo.noi or foo.map
+def find_symbols (image):
+    base = os.path.splitext (image)[0]
+    for ext in (".noi", ".map"):
+        if os.path.exists (base + ext):
+            return base + ext
+    return None
+
+class profile:
+    def __init__ (self, symbols):
+        self.symbols = symbols
+        self.pc_cycles = array ('L', [0]) * 65536
+        self.pc_count = array ('L', [0]) * 65536
+        self.calls = {}
+        self.stacks = {}
+        self.stack = []
+        self.stack_key = ""
+        self.func_of = {}
+        self.total = 0
+
+    def function (self, pc):
+        f = self.func_of.get (pc)
+        if (f == None):
+            f = self.symbols.find (pc)
+            self.func_of[pc] = f
+        return f
+
+    def add (self, pc, cycles):
+        self.pc_cycles[pc] += cycles
+        self.pc_count[pc] += 1
+        self.total += cycles
+
+        f = self.function (pc)
+        stack = self.stack
+        if not stack or (stack[-1] != f):
+            if (f in stack):
+                # return to a caller
+                del stack[stack.index (f) + 1:]
+            elif (f >= 0) and (pc == self.symbols.addrs[f]):
+                stack.append (f)
+                self.calls[f] = self.calls.get (f, 0) + 1
+            elif stack:
+                # jump into the middle of another function
+                stack[-1] = f
+            else:
+                stack.append (f)
+            self.stack_key = ";".join ([self.symbols.name (n) for n in stack])
+        self.stacks[self.stack_key] = self.stacks.get (self.stack_key, 0) + cycles
+
+    # (name, cycles, executions, calls) for each function, most cycles first
+    def flat (self):
+        funcs = {}
+        for pc in xrange (65536):
+            if not self.pc_count[pc]: continue
+            f = self.function (pc)
+            (cycles, count) = funcs.get (f, (0, 0))
+            funcs[f] = (cycles + self.pc_cycles[pc], count + self.pc_count[pc])
+        rows = [(self.symbols.name (f), c, n, self.calls.get (f, 0)) for (f, (c, n)) in funcs.items()]
+        rows.sort (key=lambda r: -r[1])
+        return rows
+
+    # (pc, cycles, executions) for the busiest addresses
+    def hot (self, count=20):
+        pcs = [pc for pc in xrange (65536) if self.pc_count[pc]]
+        pcs.sort (key=lambda pc: -self.pc_cycles[pc])
+        return [(pc, self.pc_cycles[pc], self.pc_count[pc]) for pc in pcs[:count]]
+
+    def write_flat (self, fh, hot=20):
+        total = max (self.total, 1)
+        fh.write ("%7s %12s %10s %8s  %s\n" % ("%", "cycles", "execs", "calls", "function"))
+        for (name, cycles, count, calls) in self.flat():
+            fh.write ("%6.2f%% %12d %10d %8d  %s\n" % (100.0 * cycles / total, cycles, count, calls, name))
+        if hot:
+            fh.write ("\n%7s %12s %10s  %-6s %s\n" % ("%", "cycles", "execs", "pc", "location"))
+            for (pc, cycles, count) in self.hot (hot):
+                fh.write ("%6.2f%% %12d %10d  %04x   %s\n" % (100.0 * cycles / total, cycles, count,
+                                                            pc, self.symbols.label (pc)))
+
+    # one "caller;callee cycles" line per stack, the input format of
+    # flamegraph.pl
+    def write_collapsed (self, fh):
+        for key in sorted (self.stacks.keys()):
+            fh.write ("%s %d\n" % (key, self.stacks[key]))
+
+# (pc, cycles) for each instruction the ISS executes
+def iss_samples (image, max_cycles=10000000):
+    import z80sim
+    (cpu, env) = z80sim.load_system (image, out=open (os.devnull, "w"))
+    env.clock (20)
+    while (env.status == None) and (cpu.cycles < max_cycles):
+        pc = cpu.pc
+        start = cpu.cycles
+        z80sim.tick (cpu, env)
+        yield (pc, cpu.cycles - start)
+
+# (pc, cycles) for each opcode fetch in a VCD dump of tb_top
+def vcd_samples (dump, scope="tb_top"):
+    import vcd_index
+    index = vcd_index.vcd_index (dump).open()
+    names = [scope + "." + s for s in ("A", "m1_n", "mreq_n")]
+    sigs = []
+    for name in names:
+        sig = index.select ([name])
+        if not sig:
+            raise vcd_index.vcd_error, "%s: no signal %s" % (dump, name)
+        sigs.append (sig[0])
+    last = None
+    fetching = 0
+    for (t, (a, m1_n, mreq_n)) in index.extract (sigs):
+        f = (m1_n == "0") and (mreq_n == "0")
+        if f and not fetching:
+            try:
+                pc = int (a, 2)
+            except ValueError:
+                continue
+            if (last != None):
+                yield (last[0], (t - last[1]) / results.clock_period)
+            last = (pc, t)
+        fetching = f
+
+def print_help ():
+    print "Usage: z80prof.py [-h] [-s symbols] [-d dump] [-n count] [-f file] [-c cycles] [image]"
+    print "  -s : symbol file (.noi or .map); default is the one next to image"
+    print "  -d : profile opcode fetches in a VCD dump instead of running the ISS"
+    print "  -n : number of hot addresses to list (default 20)"
+    print "  -f : write collapsed stacks for flamegraph.pl to file"
+    print "  -c : stop the ISS after this many clocks (default 10000000)"
+    print "  -h : option help (this list)"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "hs:d:n:f:c:")
+    symfile = None
+    dump = None
+    hot = 20
+    collapsed = None
+    max_cycles = 10000000
+    for option in options:
+        if option[0] == "-s":
+            symfile = option[1]
+        elif option[0] == "-d":
+            dump = option[1]
+        elif option[0] == "-n":
+            hot = int (option[1])
+        elif option[0] == "-f":
+            collapsed = option[1]
+        elif option[0] == "-c":
+            max_cycles = int (option[1])
+        else:
+            print_help()
+    if (len(args) != 1) and not (dump and len(args) == 0):
+        print_help()
+
+    if (symfile == None) and args:
+        symfile = find_symbols (args[0])
+    symbols = symbol_table()
+    if symfile:
+        symbols.load (symfile)
+
+    prof = profile (symbols)
+    if dump:
+        samples = vcd_samples (dump)
+    else:
+        samples = iss_samples (args[0], max_cycles)
+    for (pc, cycles) in samples:
+        prof.add (pc, cycles)
+
+    prof.write_flat (sys.stdout, hot)
+    if collapsed:
+        prof.write_collapsed (open (collapsed, "w"))
+
+if __name__ == '__main__':
+    cmdline()
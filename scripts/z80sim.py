@@ -0,0 +1,1190 @@
+#!/usr/bin/env python
+# Copyright (c) 2004 Guy Hutchison (ghutchis@opencores.org)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a
+# copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,
+# and/or sell copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Z80 instruction set simulator and model of the test environment.
+#
+# The CPU decodes through 256-entry handler tables, one per opcode page
+# (base, CB, ED, DD/FD and DDCB/FDCB).  Each handler executes one
+# instruction and returns its length in T-states, which is also the
+# number of clocks the environment is advanced by.
+#
+# The environment follows env/tb_top.v and env/env_io.v: ROM at
+# 0000-7FFF (writes ignored), RAM at 8000-FFFF (cleared at start) and
+# the control ports described in doc/env_io_map.txt.
+
+import sys, getopt, random
+import mem_image
+
+S_FLAG = 0x80
+Z_FLAG = 0x40
+Y_FLAG = 0x20
+H_FLAG = 0x10
+X_FLAG = 0x08
+P_FLAG = 0x04
+N_FLAG = 0x02
+C_FLAG = 0x01
+
+# register numbers, as encoded in the r[] fields of instructions
+B = 0
+C = 1
+D = 2
+E = 3
+H = 4
+L = 5
+F = 6      # (HL) in instruction encodings
+A = 7
+
+# flag tables indexed by an 8-bit result
+sz_table  = [(v & (S_FLAG | Y_FLAG | X_FLAG)) | ((v == 0) and Z_FLAG) for v in range (256)]
+szp_table = []
+for v in range (256):
+    parity = 1
+    for bit in range (8):
+        parity ^= (v >> bit) & 1
+    szp_table.append (sz_table[v] | (parity and P_FLAG))
+
+class z80:
+    def __init__ (self, io=None):
+        self.mem = bytearray (65536)
+        self.rom_top = 0x8000
+        self.io = io
+        self.r = [0] * 8
+        self.alt = [0] * 8
+        self.reset()
+        self.trace = None
+
+        self.base = self.build_base()
+        self.cb = self.build_cb()
+        self.ed = self.build_ed()
+        self.dd = self.build_index ('ix')
+        self.fd = self.build_index ('iy')
+
+    def reset (self):
+        self.r[A] = 0xff
+        self.r[F] = 0xff
+        self.pc = 0
+        self.sp = 0xffff
+        self.ix = 0xffff
+        self.iy = 0xffff
+        self.i = 0
+        self.rr = 0
+        self.iff1 = 0
+        self.iff2 = 0
+        self.im = 0
+        self.halted = 0
+        self.ei_delay = 0
+        self.int_line = 0
+        self.cycles = 0
+        self.instructions = 0
+
+    def load (self, image, base=0):
+        for (addr, chunk) in image.chunks():
+            self.mem[base+addr:base+addr+len(chunk)] = chunk
+
+    #----------------------------------------------------------------------
+    # memory, I/O and register access
+    #----------------------------------------------------------------------
+
+    def write (self, addr, val):
+        if (addr >= self.rom_top):
+            self.mem[addr] = val
+
+    def read16 (self, addr):
+        return self.mem[addr] | (self.mem[(addr + 1) & 0xffff] << 8)
+
+    def write16 (self, addr, val):
+        self.write (addr, val & 0xff)
+        self.write ((addr + 1) & 0xffff, val >> 8)
+
+    def fetch (self):
+        v = self.mem[self.pc]
+        self.pc = (self.pc + 1) & 0xffff
+        return v
+
+    def fetch16 (self):
+        v = self.mem[self.pc] | (self.mem[(self.pc + 1) & 0xffff] << 8)
+        self.pc = (self.pc + 2) & 0xffff
+        return v
+
+    def fetch_disp (self):
+        d = self.fetch()
+        if (d & 0x80): d -= 256
+        return d
+
+    def push (self, val):
+        self.sp = (self.sp - 2) & 0xffff
+        self.write16 (self.sp, val)
+
+    def pop (self):
+        v = self.read16 (self.sp)
+        self.sp = (self.sp + 2) & 0xffff
+        return v
+
+    def port_in (self, port):
+        if self.io: return self.io.io_read (port)
+        return 0xff
+
+    def port_out (self, port, val):
+        if self.io: self.io.io_write (port, val)
+
+    def get_hl (self):
+        return (self.r[H] << 8) | self.r[L]
+
+    def set_hl (self, v):
+        self.r[H] = v >> 8
+        self.r[L] = v & 0xff
+
+    # register pairs: rp (BC, DE, HL, SP) and rp2 (BC, DE, HL, AF)
+    def get_rp (self, p):
+        if (p == 3): return self.sp
+        return (self.r[p*2] << 8) | self.r[p*2+1]
+
+    def set_rp (self, p, v):
+        if (p == 3):
+            self.sp = v
+        else:
+            self.r[p*2] = v >> 8
+            self.r[p*2+1] = v & 0xff
+
+    def get_rp2 (self, p):
+        if (p == 3): return (self.r[A] << 8) | self.r[F]
+        return (self.r[p*2] << 8) | self.r[p*2+1]
+
+    def set_rp2 (self, p, v):
+        if (p == 3):
+            self.r[A] = v >> 8
+            self.r[F] = v & 0xff
+        else:
+            self.r[p*2] = v >> 8
+            self.r[p*2+1] = v & 0xff
+
+    # 8-bit operand r[z]; index 6 is the byte at (HL)
+    def get_reg (self, z):
+        if (z == 6): return self.mem[self.get_hl()]
+        return self.r[z]
+
+    def set_reg (self, z, v):
+        if (z == 6): self.write (self.get_hl(), v)
+        else: self.r[z] = v
+
+    def condition (self, y):
+        f = self.r[F]
+        if (y == 0): return not (f & Z_FLAG)
+        if (y == 1): return f & Z_FLAG
+        if (y == 2): return not (f & C_FLAG)
+        if (y == 3): return f & C_FLAG
+        if (y == 4): return not (f & P_FLAG)
+        if (y == 5): return f & P_FLAG
+        if (y == 6): return not (f & S_FLAG)
+        return f & S_FLAG
+
+    #----------------------------------------------------------------------
+    # ALU
+    #----------------------------------------------------------------------
+
+    def add8 (self, v, carry=0):
+        a = self.r[A]
+        res = a + v + carry
+        self.r[F] = sz_table[res & 0xff] | ((res >> 8) & C_FLAG) | ((a ^ v ^ res) & H_FLAG) | \
+                    ((((a ^ ~v) & (a ^ res)) & 0x80) >> 5)
+        self.r[A] = res & 0xff
+
+    def sub8 (self, v, carry=0, store=1):
+        a = self.r[A]
+        res = a - v - carry
+        f = sz_table[res & 0xff] | N_FLAG | ((res >> 8) & C_FLAG) | ((a ^ v ^ res) & H_FLAG) | \
+            ((((a ^ v) & (a ^ res)) & 0x80) >> 5)
+        if (store):
+            self.r[A] = res & 0xff
+            self.r[F] = f
+        else:
+            # CP takes the undocumented flags from the operand
+            self.r[F] = (f & ~(X_FLAG | Y_FLAG)) | (v & (X_FLAG | Y_FLAG))
+
+    def alu (self, y, v):
+        if (y == 0): self.add8 (v)
+        elif (y == 1): self.add8 (v, self.r[F] & C_FLAG)
+        elif (y == 2): self.sub8 (v)
+        elif (y == 3): self.sub8 (v, self.r[F] & C_FLAG)
+        elif (y == 4):
+            self.r[A] &= v
+            self.r[F] = szp_table[self.r[A]] | H_FLAG
+        elif (y == 5):
+            self.r[A] ^= v
+            self.r[F] = szp_table[self.r[A]]
+        elif (y == 6):
+            self.r[A] |= v
+            self.r[F] = szp_table[self.r[A]]
+        else: self.sub8 (v, 0, 0)
+
+    def inc8 (self, v):
+        res = (v + 1) & 0xff
+        self.r[F] = (self.r[F] & C_FLAG) | sz_table[res] | \
+                    (((v & 0x0f) == 0x0f) and H_FLAG) | ((v == 0x7f) and P_FLAG)
+        return res
+
+    def dec8 (self, v):
+        res = (v - 1) & 0xff
+        self.r[F] = (self.r[F] & C_FLAG) | N_FLAG | sz_table[res] | \
+                    (((v & 0x0f) == 0) and H_FLAG) | ((v == 0x80) and P_FLAG)
+        return res
+
+    def add16 (self, a, b):
+        res = a + b
+        self.r[F] = (self.r[F] & (S_FLAG | Z_FLAG | P_FLAG)) | ((res >> 16) & C_FLAG) | \
+                    (((a ^ b ^ res) >> 8) & H_FLAG) | ((res >> 8) & (X_FLAG | Y_FLAG))
+        return res & 0xffff
+
+    def adc16 (self, a, b):
+        res = a + b + (self.r[F] & C_FLAG)
+        self.r[F] = ((res >> 8) & (S_FLAG | X_FLAG | Y_FLAG)) | (((res & 0xffff) == 0) and Z_FLAG) | \
+                    (((a ^ b ^ res) >> 8) & H_FLAG) | ((((a ^ ~b) & (a ^ res)) & 0x8000) >> 13) | \
+                    ((res >> 16) & C_FLAG)
+        return res & 0xffff
+
+    def sbc16 (self, a, b):
+        res = a - b - (self.r[F] & C_FLAG)
+        self.r[F] = N_FLAG | ((res >> 8) & (S_FLAG | X_FLAG | Y_FLAG)) | (((res & 0xffff) == 0) and Z_FLAG) | \
+                    (((a ^ b ^ res) >> 8) & H_FLAG) | ((((a ^ b) & (a ^ res)) & 0x8000) >> 13) | \
+                    ((res >> 16) & C_FLAG)
+        return res & 0xffff
+
+    # CB-page rotates and shifts: RLC RRC RL RR SLA SRA SLL SRL
+    def rot (self, y, v):
+        c = self.r[F] & C_FLAG
+        if (y == 0):
+            res = ((v << 1) | (v >> 7)) & 0xff
+            c = v >> 7
+        elif (y == 1):
+            res = ((v >> 1) | (v << 7)) & 0xff
+            c = v & 1
+        elif (y == 2):
+            res = ((v << 1) | c) & 0xff
+            c = v >> 7
+        elif (y == 3):
+            res = (v >> 1) | (c << 7)
+            c = v & 1
+        elif (y == 4):
+            res = (v << 1) & 0xff
+            c = v >> 7
+        elif (y == 5):
+            res = (v >> 1) | (v & 0x80)
+            c = v & 1
+        elif (y == 6):
+            res = ((v << 1) | 1) & 0xff
+            c = v >> 7
+        else:
+            res = v >> 1
+            c = v & 1
+        self.r[F] = szp_table[res] | c
+        return res
+
+    def bit (self, y, v):
+        f = (self.r[F] & C_FLAG) | H_FLAG | (v & (X_FLAG | Y_FLAG))
+        if not (v & (1 << y)):
+            f |= Z_FLAG | P_FLAG
+        elif (y == 7):
+            f |= S_FLAG
+        self.r[F] = f
+
+    def daa (self):
+        a = self.r[A]
+        f = self.r[F]
+        diff = 0
+        carry = f & C_FLAG
+        if (f & H_FLAG) or ((a & 0x0f) > 9):
+            diff = 0x06
+        if carry or (a > 0x99):
+            diff |= 0x60
+            carry = C_FLAG
+        if (f & N_FLAG):
+            half = (f & H_FLAG) and ((a & 0x0f) < 6)
+            res = (a - diff) & 0xff
+        else:
+            half = (a & 0x0f) > 9
+            res = (a + diff) & 0xff
+        self.r[A] = res
+        self.r[F] = szp_table[res] | carry | (f & N_FLAG) | (half and H_FLAG)
+
+    # accumulator rotates and flag operations: RLCA RRCA RLA RRA DAA CPL SCF CCF
+    def acc_op (self, y):
+        a = self.r[A]
+        f = self.r[F]
+        keep = f & (S_FLAG | Z_FLAG | P_FLAG)
+        if (y == 0):
+            a = ((a << 1) | (a >> 7)) & 0xff
+            self.r[F] = keep | (a & (X_FLAG | Y_FLAG)) | (a & C_FLAG)
+        elif (y == 1):
+            self.r[F] = keep | (a & C_FLAG)
+            a = ((a >> 1) | (a << 7)) & 0xff
+            self.r[F] |= a & (X_FLAG | Y_FLAG)
+        elif (y == 2):
+            res = ((a << 1) | (f & C_FLAG)) & 0xff
+            self.r[F] = keep | (res & (X_FLAG | Y_FLAG)) | (a >> 7)
+            a = res
+        elif (y == 3):
+            res = (a >> 1) | ((f & C_FLAG) << 7)
+            self.r[F] = keep | (res & (X_FLAG | Y_FLAG)) | (a & C_FLAG)
+            a = res
+        elif (y == 4):
+            self.daa()
+            return
+        elif (y == 5):
+            a ^= 0xff
+            self.r[F] = (f & (S_FLAG | Z_FLAG | P_FLAG | C_FLAG)) | H_FLAG | N_FLAG | (a & (X_FLAG | Y_FLAG))
+        elif (y == 6):
+            self.r[F] = keep | C_FLAG | (a & (X_FLAG | Y_FLAG))
+        else:
+            self.r[F] = keep | ((f & C_FLAG) and H_FLAG) | (a & (X_FLAG | Y_FLAG)) | ((f & C_FLAG) ^ C_FLAG)
+        self.r[A] = a
+
+    #----------------------------------------------------------------------
+    # base opcode page
+    #----------------------------------------------------------------------
+
+    def build_base (self):
+        table = [None] * 256
+        for op in range (256):
+            table[op] = self.base_op (op >> 6, (op >> 3) & 7, op & 7)
+        return table
+
+    def base_op (self, x, y, z):
+        p = y >> 1
+        q = y & 1
+        cpu = self
+        r = self.r
+
+        if (x == 0):
+            if (z == 0):
+                if (y == 0):
+                    return lambda: 4
+                if (y == 1):
+                    def ex_af ():
+                        (r[A], r[F], cpu.alt[A], cpu.alt[F]) = (cpu.alt[A], cpu.alt[F], r[A], r[F])
+                        return 4
+                    return ex_af
+                if (y == 2):
+                    def djnz ():
+                        d = cpu.fetch_disp()
+                        r[B] = (r[B] - 1) & 0xff
+                        if (r[B]):
+                            cpu.pc = (cpu.pc + d) & 0xffff
+                            return 13
+                        return 8
+                    return djnz
+                if (y == 3):
+                    def jr ():
+                        d = cpu.fetch_disp()
+                        cpu.pc = (cpu.pc + d) & 0xffff
+                        return 12
+                    return jr
+                def jr_cc ():
+                    d = cpu.fetch_disp()
+                    if cpu.condition (y - 4):
+                        cpu.pc = (cpu.pc + d) & 0xffff
+                        return 12
+                    return 7
+                return jr_cc
+            if (z == 1):
+                if (q == 0):
+                    def ld_rp_nn ():
+                        cpu.set_rp (p, cpu.fetch16())
+                        return 10
+                    return ld_rp_nn
+                def add_hl ():
+                    cpu.set_hl (cpu.add16 (cpu.get_hl(), cpu.get_rp (p)))
+                    return 11
+                return add_hl
+            if (z == 2):
+                if (y == 0):
+                    def ld_bc_a ():
+                        cpu.write (cpu.get_rp (0), r[A])
+                        return 7
+                    return ld_bc_a
+                if (y == 1):
+                    def ld_a_bc ():
+                        r[A] = cpu.mem[cpu.get_rp (0)]
+                        return 7
+                    return ld_a_bc
+                if (y == 2):
+                    def ld_de_a ():
+                        cpu.write (cpu.get_rp (1), r[A])
+                        return 7
+                    return ld_de_a
+                if (y == 3):
+                    def ld_a_de ():
+                        r[A] = cpu.mem[cpu.get_rp (1)]
+                        return 7
+                    return ld_a_de
+                if (y == 4):
+                    def ld_nn_hl ():
+                        cpu.write16 (cpu.fetch16(), cpu.get_hl())
+                        return 16
+                    return ld_nn_hl
+                if (y == 5):
+                    def ld_hl_nn ():
+                        cpu.set_hl (cpu.read16 (cpu.fetch16()))
+                        return 16
+                    return ld_hl_nn
+                if (y == 6):
+                    def ld_nn_a ():
+                        cpu.write (cpu.fetch16(), r[A])
+                        return 13
+                    return ld_nn_a
+                def ld_a_nn ():
+                    r[A] = cpu.mem[cpu.fetch16()]
+                    return 13
+                return ld_a_nn
+            if (z == 3):
+                delta = (q == 0) and 1 or -1
+                def inc_rp ():
+                    cpu.set_rp (p, (cpu.get_rp (p) + delta) & 0xffff)
+                    return 6
+                return inc_rp
+            if (z == 4):
+                def inc_r ():
+                    cpu.set_reg (y, cpu.inc8 (cpu.get_reg (y)))
+                    return (y == 6) and 11 or 4
+                return inc_r
+            if (z == 5):
+                def dec_r ():
+                    cpu.set_reg (y, cpu.dec8 (cpu.get_reg (y)))
+                    return (y == 6) and 11 or 4
+                return dec_r
+            if (z == 6):
+                def ld_r_n ():
+                    cpu.set_reg (y, cpu.fetch())
+                    return (y == 6) and 10 or 7
+                return ld_r_n
+            def acc_op ():
+                cpu.acc_op (y)
+                return 4
+            return acc_op
+
+        if (x == 1):
+            if (y == 6) and (z == 6):
+                def halt ():
+                    cpu.halted = 1
+                    return 4
+                return halt
+            if (y == 6):
+                def ld_hl_r ():
+                    cpu.write (cpu.get_hl(), r[z])
+                    return 7
+                return ld_hl_r
+            if (z == 6):
+                def ld_r_hl ():
+                    r[y] = cpu.mem[cpu.get_hl()]
+                    return 7
+                return ld_r_hl
+            def ld_r_r ():
+                r[y] = r[z]
+                return 4
+            return ld_r_r
+
+        if (x == 2):
+            def alu_r ():
+                cpu.alu (y, cpu.get_reg (z))
+                return (z == 6) and 7 or 4
+            return alu_r
+
+        if (z == 0):
+            def ret_cc ():
+                if cpu.condition (y):
+                    cpu.pc = cpu.pop()
+                    return 11
+                return 5
+            return ret_cc
+        if (z == 1):
+            if (q == 0):
+                def pop ():
+                    cpu.set_rp2 (p, cpu.pop())
+                    return 10
+                return pop
+            if (p == 0):
+                def ret ():
+                    cpu.pc = cpu.pop()
+                    return 10
+                return ret
+            if (p == 1):
+                def exx ():
+                    for i in (B, C, D, E, H, L):
+                        (r[i], cpu.alt[i]) = (cpu.alt[i], r[i])
+                    return 4
+                return exx
+            if (p == 2):
+                def jp_hl ():
+                    cpu.pc = cpu.get_hl()
+                    return 4
+                return jp_hl
+            def ld_sp_hl ():
+                cpu.sp = cpu.get_hl()
+                return 6
+            return ld_sp_hl
+        if (z == 2):
+            def jp_cc ():
+                nn = cpu.fetch16()
+                if cpu.condition (y):
+                    cpu.pc = nn
+                return 10
+            return jp_cc
+        if (z == 3):
+            if (y == 0):
+                def jp ():
+                    cpu.pc = cpu.fetch16()
+                    return 10
+                return jp
+            if (y == 1):
+                def cb_prefix ():
+                    op = cpu.fetch()
+                    cpu.inc_r()
+                    return cpu.cb[op]()
+                return cb_prefix
+            if (y == 2):
+                def out_n_a ():
+                    cpu.port_out (cpu.fetch() | (r[A] << 8), r[A])
+                    return 11
+                return out_n_a
+            if (y == 3):
+                def in_a_n ():
+                    r[A] = cpu.port_in (cpu.fetch() | (r[A] << 8))
+                    return 11
+                return in_a_n
+            if (y == 4):
+                def ex_sp_hl ():
+                    v = cpu.read16 (cpu.sp)
+                    cpu.write16 (cpu.sp, cpu.get_hl())
+                    cpu.set_hl (v)
+                    return 19
+                return ex_sp_hl
+            if (y == 5):
+                def ex_de_hl ():
+                    (r[D], r[E], r[H], r[L]) = (r[H], r[L], r[D], r[E])
+                    return 4
+                return ex_de_hl
+            if (y == 6):
+                def di ():
+                    cpu.iff1 = cpu.iff2 = 0
+                    return 4
+                return di
+            def ei ():
+                cpu.iff1 = cpu.iff2 = 1
+                cpu.ei_delay = 1
+                return 4
+            return ei
+        if (z == 4):
+            def call_cc ():
+                nn = cpu.fetch16()
+                if cpu.condition (y):
+                    cpu.push (cpu.pc)
+                    cpu.pc = nn
+                    return 17
+                return 10
+            return call_cc
+        if (z == 5):
+            if (q == 0):
+                def push ():
+                    cpu.push (cpu.get_rp2 (p))
+                    return 11
+                return push
+            if (p == 0):
+                def call ():
+                    nn = cpu.fetch16()
+                    cpu.push (cpu.pc)
+                    cpu.pc = nn
+                    return 17
+                return call
+            if (p == 1):
+                def dd_prefix ():
+                    return cpu.index_prefix (cpu.dd)
+                return dd_prefix
+            if (p == 2):
+                def ed_prefix ():
+                    op = cpu.fetch()
+                    cpu.inc_r()
+                    return cpu.ed[op]()
+                return ed_prefix
+            def fd_prefix ():
+                return cpu.index_prefix (cpu.fd)
+            return fd_prefix
+        if (z == 6):
+            def alu_n ():
+                cpu.alu (y, cpu.fetch())
+                return 7
+            return alu_n
+        def rst ():
+            cpu.push (cpu.pc)
+            cpu.pc = y * 8
+            return 11
+        return rst
+
+    #----------------------------------------------------------------------
+    # CB page
+    #----------------------------------------------------------------------
+
+    def build_cb (self):
+        table = [None] * 256
+        for op in range (256):
+            table[op] = self.cb_op (op >> 6, (op >> 3) & 7, op & 7)
+        return table
+
+    def cb_op (self, x, y, z):
+        cpu = self
+        mem = (z == 6)
+        if (x == 0):
+            def rot ():
+                cpu.set_reg (z, cpu.rot (y, cpu.get_reg (z)))
+                return mem and 15 or 8
+            return rot
+        if (x == 1):
+            def bit ():
+                cpu.bit (y, cpu.get_reg (z))
+                return mem and 12 or 8
+            return bit
+        if (x == 2):
+            mask = ~(1 << y) & 0xff
+            def res ():
+                cpu.set_reg (z, cpu.get_reg (z) & mask)
+                return mem and 15 or 8
+            return res
+        mask = 1 << y
+        def set ():
+            cpu.set_reg (z, cpu.get_reg (z) | mask)
+            return mem and 15 or 8
+        return set
+
+    #----------------------------------------------------------------------
+    # ED page
+    #----------------------------------------------------------------------
+
+    def build_ed (self):
+        table = [None] * 256
+        for op in range (256):
+            table[op] = self.ed_op (op >> 6, (op >> 3) & 7, op & 7)
+        return table
+
+    def ed_op (self, x, y, z):
+        p = y >> 1
+        q = y & 1
+        cpu = self
+        r = self.r
+
+        if (x == 2) and (z <= 3) and (y >= 4):
+            return self.block_op (y, z)
+        if (x != 1):
+            return lambda: 8
+
+        if (z == 0):
+            def in_r_c ():
+                v = cpu.port_in (cpu.get_rp (0))
+                if (y != 6): r[y] = v
+                r[F] = (r[F] & C_FLAG) | szp_table[v]
+                return 12
+            return in_r_c
+        if (z == 1):
+            def out_c_r ():
+                if (y == 6): cpu.port_out (cpu.get_rp (0), 0)
+                else: cpu.port_out (cpu.get_rp (0), r[y])
+                return 12
+            return out_c_r
+        if (z == 2):
+            if (q == 0):
+                def sbc_hl ():
+                    cpu.set_hl (cpu.sbc16 (cpu.get_hl(), cpu.get_rp (p)))
+                    return 15
+                return sbc_hl
+            def adc_hl ():
+                cpu.set_hl (cpu.adc16 (cpu.get_hl(), cpu.get_rp (p)))
+                return 15
+            return adc_hl
+        if (z == 3):
+            if (q == 0):
+                def ld_nn_rp ():
+                    cpu.write16 (cpu.fetch16(), cpu.get_rp (p))
+                    return 20
+                return ld_nn_rp
+            def ld_rp_nn ():
+                cpu.set_rp (p, cpu.read16 (cpu.fetch16()))
+                return 20
+            return ld_rp_nn
+        if (z == 4):
+            def neg ():
+                v = r[A]
+                r[A] = 0
+                cpu.sub8 (v)
+                return 8
+            return neg
+        if (z == 5):
+            def retn ():
+                cpu.iff1 = cpu.iff2
+                cpu.pc = cpu.pop()
+                return 14
+            return retn
+        if (z == 6):
+            mode = [0, 0, 1, 2, 0, 0, 1, 2][y]
+            def im ():
+                cpu.im = mode
+                return 8
+            return im
+        if (y == 0):
+            def ld_i_a ():
+                cpu.i = r[A]
+                return 9
+            return ld_i_a
+        if (y == 1):
+            def ld_r_a ():
+                cpu.rr = r[A]
+                return 9
+            return ld_r_a
+        if (y == 2):
+            def ld_a_i ():
+                r[A] = cpu.i
+                r[F] = (r[F] & C_FLAG) | sz_table[r[A]] | (cpu.iff2 and P_FLAG)
+                return 9
+            return ld_a_i
+        if (y == 3):
+            def ld_a_r ():
+                r[A] = cpu.rr
+                r[F] = (r[F] & C_FLAG) | sz_table[r[A]] | (cpu.iff2 and P_FLAG)
+                return 9
+            return ld_a_r
+        if (y == 4):
+            def rrd ():
+                hl = cpu.get_hl()
+                v = cpu.mem[hl]
+                cpu.write (hl, ((r[A] << 4) | (v >> 4)) & 0xff)
+                r[A] = (r[A] & 0xf0) | (v & 0x0f)
+                r[F] = (r[F] & C_FLAG) | szp_table[r[A]]
+                return 18
+            return rrd
+        if (y == 5):
+            def rld ():
+                hl = cpu.get_hl()
+                v = cpu.mem[hl]
+                cpu.write (hl, ((v << 4) | (r[A] & 0x0f)) & 0xff)
+                r[A] = (r[A] & 0xf0) | (v >> 4)
+                r[F] = (r[F] & C_FLAG) | szp_table[r[A]]
+                return 18
+            return rld
+        return lambda: 8
+
+    # LDI/CPI/INI/OUTI and their decrementing and repeating forms
+    def block_op (self, y, z):
+        cpu = self
+        r = self.r
+        step = (y & 1) and -1 or 1
+        repeat = y >= 6
+
+        if (z == 0):
+            def ld_block ():
+                hl = cpu.get_hl()
+                de = cpu.get_rp (1)
+                v = cpu.mem[hl]
+                cpu.write (de, v)
+                cpu.set_hl ((hl + step) & 0xffff)
+                cpu.set_rp (1, (de + step) & 0xffff)
+                bc = (cpu.get_rp (0) - 1) & 0xffff
+                cpu.set_rp (0, bc)
+                n = v + r[A]
+                r[F] = (r[F] & (S_FLAG | Z_FLAG | C_FLAG)) | (bc and P_FLAG) | \
+                       (n & X_FLAG) | ((n << 4) & Y_FLAG)
+                if repeat and bc:
+                    cpu.pc = (cpu.pc - 2) & 0xffff
+                    return 21
+                return 16
+            return ld_block
+        if (z == 1):
+            def cp_block ():
+                hl = cpu.get_hl()
+                v = cpu.mem[hl]
+                res = (r[A] - v) & 0xff
+                half = (r[A] ^ v ^ res) & H_FLAG
+                cpu.set_hl ((hl + step) & 0xffff)
+                bc = (cpu.get_rp (0) - 1) & 0xffff
+                cpu.set_rp (0, bc)
+                n = res - (half and 1)
+                r[F] = (r[F] & C_FLAG) | N_FLAG | (sz_table[res] & ~(X_FLAG | Y_FLAG)) | half | \
+                       (bc and P_FLAG) | (n & X_FLAG) | ((n << 4) & Y_FLAG)
+                if repeat and bc and res:
+                    cpu.pc = (cpu.pc - 2) & 0xffff
+                    return 21
+                return 16
+            return cp_block
+        if (z == 2):
+            def in_block ():
+                hl = cpu.get_hl()
+                v = cpu.port_in (cpu.get_rp (0))
+                cpu.write (hl, v)
+                cpu.set_hl ((hl + step) & 0xffff)
+                r[B] = (r[B] - 1) & 0xff
+                r[F] = (r[F] & C_FLAG) | sz_table[r[B]] | ((v & 0x80) >> 6)
+                if repeat and r[B]:
+                    cpu.pc = (cpu.pc - 2) & 0xffff
+                    return 21
+                return 16
+            return in_block
+        def out_block ():
+            hl = cpu.get_hl()
+            v = cpu.mem[hl]
+            r[B] = (r[B] - 1) & 0xff
+            cpu.port_out (cpu.get_rp (0), v)
+            cpu.set_hl ((hl + step) & 0xffff)
+            r[F] = (r[F] & C_FLAG) | sz_table[r[B]] | ((v & 0x80) >> 6)
+            if repeat and r[B]:
+                cpu.pc = (cpu.pc - 2) & 0xffff
+                return 21
+            return 16
+        return out_block
+
+    #----------------------------------------------------------------------
+    # DD and FD pages
+    #----------------------------------------------------------------------
+
+    def index_prefix (self, table):
+        op = self.fetch()
+        self.inc_r()
+        return table[op]()
+
+    # Instructions that use (HL) as a memory operand get their own
+    # handlers using (IX+d).  Everything else runs the base handler
+    # with IX in place of HL, which also covers the undocumented IXH
+    # and IXL forms.  EX DE,HL, EXX and further prefixes are not
+    # affected by the index prefix.
+    def build_index (self, name):
+        table = [None] * 256
+        for op in range (256):
+            x = op >> 6
+            y = (op >> 3) & 7
+            z = op & 7
+            if (op == 0xcb):
+                table[op] = self.index_cb (name)
+            elif (op in (0x34, 0x35, 0x36)) or \
+                 ((x == 1) and ((y == 6) != (z == 6))) or \
+                 ((x == 2) and (z == 6)):
+                table[op] = self.index_mem_op (name, x, y, z)
+            elif (op in (0xdd, 0xed, 0xfd)):
+                table[op] = self.index_passthru (op)
+            elif (op in (0xd9, 0xeb)):
+                table[op] = self.index_plain (self.base[op])
+            else:
+                table[op] = self.index_swap (name, self.base[op])
+        return table
+
+    def index_addr (self, name):
+        return (getattr (self, name) + self.fetch_disp()) & 0xffff
+
+    def index_passthru (self, op):
+        cpu = self
+        def passthru ():
+            # the prefix acts as a NOP; execute the next prefix normally
+            return 4 + cpu.base[op]()
+        return passthru
+
+    def index_plain (self, handler):
+        def plain ():
+            return 4 + handler()
+        return plain
+
+    def index_swap (self, name, handler):
+        cpu = self
+        r = self.r
+        def swap ():
+            (h, l) = (r[H], r[L])
+            v = getattr (cpu, name)
+            r[H] = v >> 8
+            r[L] = v & 0xff
+            t = handler()
+            setattr (cpu, name, (r[H] << 8) | r[L])
+            (r[H], r[L]) = (h, l)
+            return t + 4
+        return swap
+
+    def index_mem_op (self, name, x, y, z):
+        cpu = self
+        r = self.r
+        if (x == 0):
+            if (z == 4):
+                def inc_ix ():
+                    addr = cpu.index_addr (name)
+                    cpu.write (addr, cpu.inc8 (cpu.mem[addr]))
+                    return 23
+                return inc_ix
+            if (z == 5):
+                def dec_ix ():
+                    addr = cpu.index_addr (name)
+                    cpu.write (addr, cpu.dec8 (cpu.mem[addr]))
+                    return 23
+                return dec_ix
+            def ld_ix_n ():
+                addr = cpu.index_addr (name)
+                cpu.write (addr, cpu.fetch())
+                return 19
+            return ld_ix_n
+        if (x == 1):
+            if (y == 6):
+                def ld_ix_r ():
+                    cpu.write (cpu.index_addr (name), r[z])
+                    return 19
+                return ld_ix_r
+            def ld_r_ix ():
+                r[y] = cpu.mem[cpu.index_addr (name)]
+                return 19
+            return ld_r_ix
+        def alu_ix ():
+            cpu.alu (y, cpu.mem[cpu.index_addr (name)])
+            return 19
+        return alu_ix
+
+    # DDCB/FDCB: the displacement comes before the final opcode byte.
+    # The undocumented forms with a register operand also copy the
+    # result into that register.
+    def index_cb (self, name):
+        cpu = self
+        r = self.r
+        def index_cb ():
+            addr = cpu.index_addr (name)
+            op = cpu.fetch()
+            x = op >> 6
+            y = (op >> 3) & 7
+            z = op & 7
+            v = cpu.mem[addr]
+            if (x == 1):
+                cpu.bit (y, v)
+                return 20
+            if (x == 0): v = cpu.rot (y, v)
+            elif (x == 2): v &= ~(1 << y) & 0xff
+            else: v |= 1 << y
+            cpu.write (addr, v)
+            if (z != 6): r[z] = v
+            return 23
+        return index_cb
+
+    #----------------------------------------------------------------------
+    # execution
+    #----------------------------------------------------------------------
+
+    def inc_r (self):
+        self.rr = (self.rr & 0x80) | ((self.rr + 1) & 0x7f)
+
+    def interrupt (self):
+        self.halted = 0
+        self.iff1 = self.iff2 = 0
+        self.push (self.pc)
+        if (self.im == 2):
+            # nothing drives the data bus during the acknowledge cycle,
+            # so the vector byte reads as ff; IM 0 likewise sees RST 38
+            self.pc = self.read16 ((self.i << 8) | 0xff)
+            return 19
+        self.pc = 0x38
+        return 13
+
+    # execute one instruction (or accept an interrupt) and return the
+    # number of T-states it took.  The trace hook is called before each
+    # instruction, and for each NOP cycle while halted.
+    def step (self):
+        if self.int_line and self.iff1 and not self.ei_delay:
+            return self.interrupt()
+        self.ei_delay = 0
+        if self.trace: self.trace (self)
+        if self.halted:
+            return 4
+        self.inc_r()
+        self.instructions += 1
+        return self.base[self.fetch()]()
+
+# Opcode bytes of the instruction at pc that are read in M1 cycles.
+# The displacement and final opcode of DDCB/FDCB are ordinary reads.
+def m1_opcodes (mem, pc):
+    out = []
+    while 1:
+        op = mem[pc]
+        pc = (pc + 1) & 0xffff
+        out.append (op)
+        if (op in (0xcb, 0xed)):
+            out.append (mem[pc])
+            return out
+        if (op not in (0xdd, 0xfd)):
+            return out
+        if (mem[pc] == 0xcb):
+            out.append (0xcb)
+            return out
+
+class env_io:
+    def __init__ (self, out=sys.stdout):
+        self.out = out
+        self.status = None
+        self.time = 0
+        self.msg = []
+        self.timeout_ctl = 1
+        self.cur_timeout = 0
+        self.max_timeout = 10000
+        self.int_countdown = 0
+        self.int_line = 0
+        self.checksum = 0
+        self.ior_value = 0
+        self.unmodelled = {}
+
+    def display (self, msg):
+        self.out.write ("%20d: %s\n" % (self.time, msg))
+
+    def io_read (self, port):
+        port &= 0xff
+        if (port == 0x82): return self.timeout_ctl
+        if (port == 0x83): return self.max_timeout & 0xff
+        if (port == 0x84): return self.max_timeout >> 8
+        if (port == 0x90): return self.int_countdown
+        if (port == 0x91): return self.checksum
+        if (port == 0x93): return self.ior_value
+        if (port == 0x94): return random.randrange (256)
+        self.unmodelled_port (port)
+        return 0xff
+
+    def io_write (self, port, val):
+        port &= 0xff
+        if (port == 0x80):
+            if (val == 1):
+                self.display ("--- TEST PASSED ---")
+                self.status = "passed"
+            elif (val == 2):
+                self.display ("!!! TEST FAILED !!!")
+                self.status = "failed"
+            elif (val not in (3, 4)):
+                self.display ("ERROR   : Unknown I/O command %02x" % val)
+        elif (port == 0x81):
+            self.msg.append (chr (val))
+            if (val == 0x0a):
+                self.out.write ("%20d: PROGRAM : %s" % (self.time, ''.join (self.msg)))
+                self.msg = []
+        elif (port == 0x82): self.timeout_ctl = val
+        elif (port == 0x83): self.max_timeout = (self.max_timeout & 0xff00) | val
+        elif (port == 0x84): self.max_timeout = (self.max_timeout & 0xff) | (val << 8)
+        elif (port == 0x90): self.int_countdown = val
+        elif (port == 0x91): self.checksum = val
+        elif (port == 0x92): self.checksum = (self.checksum + val) & 0xff
+        elif (port == 0x93): self.ior_value = val
+        else: self.unmodelled_port (port)
+
+    def unmodelled_port (self, port):
+        if not self.unmodelled.has_key (port):
+            self.display ("WARNING : access to unmodelled port %02x" % port)
+            self.unmodelled[port] = 1
+
+    # advance the environment by a number of clocks
+    def clock (self, clocks):
+        self.time += clocks * 10
+
+        if (self.timeout_ctl & 2):
+            self.cur_timeout = 0
+        elif (self.timeout_ctl & 1):
+            self.cur_timeout += clocks
+        if (self.cur_timeout >= self.max_timeout) and (self.status == None):
+            self.display ("ERROR   : Reached timeout %d cycles" % self.max_timeout)
+            self.display ("!!! TEST FAILED !!!")
+            self.status = "failed"
+
+        if (self.int_countdown > 1):
+            self.int_line = 0
+            run = min (clocks, self.int_countdown - 1)
+            self.int_countdown -= run
+            clocks -= run
+        if (self.int_countdown == 1) and (clocks > 0):
+            self.int_line = 1
+            self.int_countdown = 0
+
+# load a ROM image and optional RAM image (.ihx or .vmem) into a new
+# CPU and environment
+def load_system (rom_file, ram_file=None, out=sys.stdout):
+    env = env_io (out)
+    cpu = z80 (env)
+    for (fname, base) in ((rom_file, 0), (ram_file, 0x8000)):
+        if (fname == None): continue
+        image = mem_image.mem_image()
+        if fname.endswith (".ihx") or fname.endswith (".hex"):
+            image.load_ihex (fname)
+            base = 0
+        else:
+            image.load_vmem (fname)
+        cpu.load (image, base)
+    # tb_top clears RAM before the program is loaded, and
+    # $readmemh of PROGRAM_FILE only fills the ROM
+    if (ram_file == None):
+        cpu.mem[0x8000:] = bytearray (0x8000)
+    return (cpu, env)
+
+# Run until the test passes or fails, or max_cycles clocks have passed.
+# The environment holds the reset for 20 clocks before the CPU starts.
+def run (cpu, env, max_cycles=10000000):
+    env.clock (20)
+    while (env.status == None) and (cpu.cycles < max_cycles):
+        tick (cpu, env)
+    return env.status
+
+# execute one instruction and advance the environment to match
+def tick (cpu, env):
+    t = cpu.step()
+    cpu.cycles += t
+    env.clock (t)
+    cpu.int_line = env.int_line
+
+def print_trace (cpu):
+    r = cpu.r
+    if cpu.halted:
+        return
+    sys.stdout.write ("%04x  %02x  A=%02x F=%02x BC=%02x%02x DE=%02x%02x HL=%02x%02x IX=%04x IY=%04x SP=%04x\n" %
+                      (cpu.pc, cpu.mem[cpu.pc], r[A], r[F], r[B], r[C], r[D], r[E], r[H], r[L], cpu.ix, cpu.iy, cpu.sp))
+
+def print_help ():
+    print "Usage: z80sim.py [-ht] [-c cycles] <rom image> [<ram image>]"
+    print "  -t : print each instruction with the register state"
+    print "  -c : stop after this many clocks (default 10000000)"
+    print "  -h : option help (this list)"
+    print "Images are Intel Hex (.ihx) or vmem files"
+    sys.exit(0)
+
+def cmdline ():
+    (options, args) = getopt.getopt (sys.argv[1:], "htc:")
+    if len(args) == 0:
+        print_help()
+
+    trace = 0
+    max_cycles = 10000000
+    for option in options:
+        if option[0] == "-t":
+            trace = 1
+        elif option[0] == "-c":
+            max_cycles = int (option[1])
+        else:
+            print_help()
+
+    ram_file = None
+    if len(args) > 1: ram_file = args[1]
+    (cpu, env) = load_system (args[0], ram_file)
+    if trace: cpu.trace = print_trace
+
+    status = run (cpu, env, max_cycles)
+    if (status == None):
+        env.display ("ERROR   : Stopped after %d cycles" % cpu.cycles)
+    print "%d instructions, %d cycles" % (cpu.instructions, cpu.cycles)
+    if (status != "passed"):
+        sys.exit (1)
+
+if __name__ == '__main__':
+    cmdline()